@@ -0,0 +1,42 @@
+"""Composite PIT index on historical_snapshot.
+
+The backtest as-of lookup filters on (provider_endpoint, symbol, published_at <= t) and
+orders by published_at DESC LIMIT 1. One composite index serves that as a single backward
+index scan; the single-column endpoint and symbol indexes become redundant prefixes.
+
+Existing databases were created with ``Base.metadata.create_all``, so this revision is the
+first one and uses IF [NOT] EXISTS to be safe on schemas created from the current models.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLE = "historical_snapshot"
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_historical_snapshot_pit",
+        TABLE,
+        ["provider_endpoint", "symbol", sa.text("published_at DESC")],
+        if_not_exists=True,
+    )
+    op.drop_index("ix_historical_snapshot_provider_endpoint", table_name=TABLE, if_exists=True)
+    op.drop_index("ix_historical_snapshot_symbol", table_name=TABLE, if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_historical_snapshot_symbol", TABLE, ["symbol"], if_not_exists=True)
+    op.create_index("ix_historical_snapshot_provider_endpoint", TABLE, ["provider_endpoint"], if_not_exists=True)
+    op.drop_index("ix_historical_snapshot_pit", table_name=TABLE, if_exists=True)
@@ -0,0 +1,41 @@
+"""Unique (payload_hash, provider_endpoint, symbol) on historical_snapshot.
+
+Lets the harvester bulk-insert with ON CONFLICT DO NOTHING so repeated polls that return an
+unchanged payload are not stored again. Existing duplicates are removed first, keeping the
+earliest row. The single-column payload_hash index is covered by the constraint's index.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TABLE = "historical_snapshot"
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM historical_snapshot
+        WHERE id NOT IN (
+            SELECT min(id) FROM historical_snapshot GROUP BY payload_hash, provider_endpoint, symbol
+        )
+        """
+    )
+    with op.batch_alter_table(TABLE) as batch:
+        batch.create_unique_constraint("uq_historical_snapshot_payload", ["payload_hash", "provider_endpoint", "symbol"])
+    op.drop_index("ix_historical_snapshot_payload_hash", table_name=TABLE, if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_historical_snapshot_payload_hash", TABLE, ["payload_hash"], if_not_exists=True)
+    with op.batch_alter_table(TABLE) as batch:
+        batch.drop_constraint("uq_historical_snapshot_payload", type_="unique")
@@ -0,0 +1,27 @@
+"""historical_snapshot.blob_ref for payloads kept in the compressed blob store.
+
+Rows whose payload was moved to the content-addressed blob store keep an empty
+response_json and reference the blob (and its evidence_store row) by content hash.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("historical_snapshot", sa.Column("blob_ref", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("historical_snapshot", "blob_ref")
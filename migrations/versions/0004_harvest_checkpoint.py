@@ -0,0 +1,38 @@
+"""harvest_checkpoint table for resumable harvest runs.
+
+One row per completed (run_id, provider_endpoint, symbol); a re-run with the same run id
+skips those pairs.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "harvest_checkpoint",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("run_id", sa.String(64), nullable=False),
+        sa.Column("provider_endpoint", sa.String(128), nullable=False),
+        sa.Column("symbol", sa.String(16), nullable=True),
+        sa.Column("range_start", sa.DateTime, nullable=True),
+        sa.Column("range_end", sa.DateTime, nullable=True),
+        sa.Column("last_published_at", sa.DateTime, nullable=True),
+        sa.Column("completed_at", sa.DateTime, nullable=False),
+        sa.UniqueConstraint("run_id", "provider_endpoint", "symbol", name="uq_harvest_checkpoint_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("harvest_checkpoint")
@@ -0,0 +1,137 @@
+"""Partition historical_snapshot by month on published_at (Postgres).
+
+The table is rebuilt as ``PARTITION BY RANGE (published_at)`` with one partition per month
+of existing data, a DEFAULT partition as a safety net, and three months ahead. Postgres
+requires unique constraints on a partitioned table to include the partition key, so
+cross-poll dedup moves to the new ``historical_snapshot_key`` ledger (created and backfilled
+on every dialect). Other dialects keep the plain table.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from trading.db.partitions import MonthPartition, month_floor, months_between
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, run_id, provider, provider_endpoint, symbol, request_params_json, response_json, blob_ref, "
+    "event_timestamp, published_at, ingested_at, payload_hash, leakage_flag"
+)
+COLUMN_DDL = """
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY,
+    run_id VARCHAR(64) NOT NULL,
+    provider VARCHAR(64) NOT NULL,
+    provider_endpoint VARCHAR(128) NOT NULL,
+    symbol VARCHAR(16),
+    request_params_json JSON NOT NULL,
+    response_json TEXT NOT NULL,
+    blob_ref VARCHAR(64),
+    event_timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    published_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    ingested_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    payload_hash VARCHAR(128) NOT NULL,
+    leakage_flag BOOLEAN NOT NULL
+"""
+INDEXES = (
+    "CREATE INDEX ix_historical_snapshot_pit ON historical_snapshot (provider_endpoint, symbol, published_at DESC)",
+    "CREATE INDEX ix_historical_snapshot_run_id ON historical_snapshot (run_id)",
+    "CREATE INDEX ix_historical_snapshot_provider ON historical_snapshot (provider)",
+    "CREATE INDEX ix_historical_snapshot_event_timestamp ON historical_snapshot (event_timestamp)",
+    "CREATE INDEX ix_historical_snapshot_published_at ON historical_snapshot (published_at)",
+    "CREATE INDEX ix_historical_snapshot_ingested_at ON historical_snapshot (ingested_at)",
+)
+MONTHS_AHEAD = 3
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Copy historical_snapshot into a fresh table, partitioned or plain, with the same indexes."""
+    op.execute("ALTER TABLE historical_snapshot RENAME TO historical_snapshot_old")
+    op.execute("ALTER TABLE historical_snapshot_old RENAME CONSTRAINT historical_snapshot_pkey TO historical_snapshot_old_pkey")
+    op.execute("ALTER TABLE historical_snapshot_old RENAME CONSTRAINT uq_historical_snapshot_payload TO uq_historical_snapshot_payload_old")
+    op.execute("ALTER SEQUENCE IF EXISTS historical_snapshot_id_seq RENAME TO historical_snapshot_old_id_seq")
+    for statement in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {statement.split()[2]}")
+
+    if partitioned:
+        op.execute(
+            f"""
+            CREATE TABLE historical_snapshot ({COLUMN_DDL},
+                CONSTRAINT historical_snapshot_pkey PRIMARY KEY (id, published_at),
+                CONSTRAINT uq_historical_snapshot_payload UNIQUE (payload_hash, provider_endpoint, symbol, published_at)
+            ) PARTITION BY RANGE (published_at)
+            """
+        )
+        op.execute("CREATE TABLE historical_snapshot_default PARTITION OF historical_snapshot DEFAULT")
+        low = high = None
+        if not context.is_offline_mode():
+            low, high = op.get_bind().execute(
+                sa.text("SELECT min(published_at), max(published_at) FROM historical_snapshot_old")
+            ).one()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        months = set(months_between(low, high)) if low is not None else set()
+        current = MonthPartition(month_floor(now))
+        months.add(current)
+        for _ in range(MONTHS_AHEAD):
+            current = MonthPartition(current.end)
+            months.add(current)
+        for partition in sorted(months):
+            op.execute(partition.create_sql())
+    else:
+        op.execute(
+            f"""
+            CREATE TABLE historical_snapshot ({COLUMN_DDL},
+                CONSTRAINT historical_snapshot_pkey PRIMARY KEY (id),
+                CONSTRAINT uq_historical_snapshot_payload UNIQUE (payload_hash, provider_endpoint, symbol)
+            )
+            """
+        )
+
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute(f"INSERT INTO historical_snapshot ({COLUMNS}) OVERRIDING SYSTEM VALUE SELECT {COLUMNS} FROM historical_snapshot_old")
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('historical_snapshot', 'id'), "
+        "COALESCE((SELECT max(id) FROM historical_snapshot), 0) + 1, false)"
+    )
+    op.execute("DROP TABLE historical_snapshot_old")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "historical_snapshot_key",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("payload_hash", sa.String(128), nullable=False),
+        sa.Column("provider_endpoint", sa.String(128), nullable=False),
+        sa.Column("symbol", sa.String(16), nullable=True),
+        sa.UniqueConstraint("payload_hash", "provider_endpoint", "symbol", name="uq_historical_snapshot_key"),
+    )
+    op.execute(
+        "INSERT INTO historical_snapshot_key (payload_hash, provider_endpoint, symbol) "
+        "SELECT DISTINCT payload_hash, provider_endpoint, symbol FROM historical_snapshot"
+    )
+    if context.get_context().dialect.name == "postgresql":
+        _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if context.get_context().dialect.name == "postgresql":
+        # Archived (detached) partitions are not restored; only rows still in the table are kept.
+        op.execute(
+            "DELETE FROM historical_snapshot AS later USING historical_snapshot AS earlier "
+            "WHERE later.id > earlier.id AND later.payload_hash = earlier.payload_hash "
+            "AND later.provider_endpoint = earlier.provider_endpoint AND later.symbol = earlier.symbol"
+        )
+        _rebuild(partitioned=False)
+    op.drop_table("historical_snapshot_key")
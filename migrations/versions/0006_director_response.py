@@ -0,0 +1,33 @@
+"""director_response table for recorded Strategy Director responses.
+
+One row per distinct request payload hash; backtests in replay mode read from it instead
+of calling the model.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "director_response",
+        sa.Column("payload_hash", sa.String(64), primary_key=True),
+        sa.Column("model", sa.String(128), nullable=False),
+        sa.Column("response_json", sa.Text, nullable=False),
+        sa.Column("recorded_at", sa.DateTime, nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("director_response")
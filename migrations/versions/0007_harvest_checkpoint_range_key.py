@@ -0,0 +1,61 @@
+"""Key harvest_checkpoint on the requested time range as well.
+
+A run id re-run over a different range must fetch again rather than reuse checkpoints
+from the earlier range, so the range bounds join (run_id, provider_endpoint, symbol) in
+the unique key. NULLs never compare equal in a unique key, so an open bound is stored as
+datetime.min / datetime.max and both columns become NOT NULL.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TABLE = "harvest_checkpoint"
+OPEN_RANGE_START = datetime.min
+OPEN_RANGE_END = datetime.max
+
+checkpoint = sa.table(TABLE, sa.column("range_start", sa.DateTime), sa.column("range_end", sa.DateTime))
+
+
+def upgrade() -> None:
+    op.execute(checkpoint.update().where(checkpoint.c.range_start.is_(None)).values(range_start=OPEN_RANGE_START))
+    op.execute(checkpoint.update().where(checkpoint.c.range_end.is_(None)).values(range_end=OPEN_RANGE_END))
+    with op.batch_alter_table(TABLE) as batch:
+        batch.alter_column("range_start", existing_type=sa.DateTime, nullable=False)
+        batch.alter_column("range_end", existing_type=sa.DateTime, nullable=False)
+        batch.drop_constraint("uq_harvest_checkpoint_key", type_="unique")
+        batch.create_unique_constraint(
+            "uq_harvest_checkpoint_key", ["run_id", "provider_endpoint", "symbol", "range_start", "range_end"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table(TABLE) as batch:
+        batch.alter_column("range_start", existing_type=sa.DateTime, nullable=True)
+        batch.alter_column("range_end", existing_type=sa.DateTime, nullable=True)
+    op.execute(checkpoint.update().where(checkpoint.c.range_start == OPEN_RANGE_START).values(range_start=None))
+    op.execute(checkpoint.update().where(checkpoint.c.range_end == OPEN_RANGE_END).values(range_end=None))
+    # Keep the newest checkpoint per pair so the narrower key can be restored.
+    op.execute(
+        """
+        DELETE FROM harvest_checkpoint
+        WHERE id NOT IN (
+            SELECT max(id) FROM harvest_checkpoint GROUP BY run_id, provider_endpoint, symbol
+        )
+        """
+    )
+    with op.batch_alter_table(TABLE) as batch:
+        batch.drop_constraint("uq_harvest_checkpoint_key", type_="unique")
+        batch.create_unique_constraint("uq_harvest_checkpoint_key", ["run_id", "provider_endpoint", "symbol"])
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for CLI entry points and the MarketOracle data module.
+
+Each target runs in a fresh interpreter so import caches do not carry over.
+Run from the repository root: ``python scripts/bench_import_time.py --runs 15``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS = {
+    "trading --help": [sys.executable, "-c", "import sys; sys.argv=['trading','--help']; from trading.cli import app; app()"],
+    "trading plan": [sys.executable, "-c", "import sys; sys.argv=['trading','plan']; from trading.cli import app; app()"],
+    "import trading.data.mcp_server": [sys.executable, "-c", "import trading.data.mcp_server"],
+    "import trading.data.oracle_client": [sys.executable, "-c", "import trading.data.oracle_client"],
+}
+
+
+def time_command(cmd: list[str], runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'target':<36} {'median ms':>10} {'min ms':>10}")
+    for name, cmd in TARGETS.items():
+        samples = time_command(cmd, args.runs)
+        print(f"{name:<36} {statistics.median(samples) * 1000:>10.1f} {min(samples) * 1000:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Harvest persistence throughput: per-row ORM ``session.add`` versus the bulk dedup insert.
+
+Creates fresh ``historical_snapshot`` and ``historical_snapshot_key`` tables in
+``DATABASE_URL`` (default: a temporary SQLite file) for each mode and reports rows/sec.
+With ``postgresql+asyncpg`` the bulk path is COPY into a staging table. Half of the second
+pass repeats payloads so the dedup path is exercised:
+``python scripts/bench_persist.py --records 100000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from trading.backtest.harvester import HarvestRecord, HistoricalHarvester
+from trading.db.models import EvidenceStore, HistoricalSnapshot, HistoricalSnapshotKey
+
+START = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+
+
+def make_records(n: int, offset: int = 0) -> list[HarvestRecord]:
+    return [
+        HarvestRecord(
+            provider="FINNHUB",
+            provider_endpoint="finnhub_quote",
+            symbol=f"S{i % 500}",
+            request_params={"symbol": f"S{i % 500}"},
+            response_json=f'{{"c": {100 + (i + offset) * 0.01:.2f}, "t": {i + offset}}}',
+            event_timestamp=START + timedelta(seconds=i),
+            published_at=START + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+async def legacy_persist(factory: async_sessionmaker, records: list[HarvestRecord]) -> int:
+    async with factory() as session:
+        for rec in records:
+            session.add(
+                HistoricalSnapshot(
+                    run_id="bench",
+                    provider=rec.provider,
+                    provider_endpoint=rec.provider_endpoint,
+                    symbol=rec.symbol,
+                    request_params_json=rec.request_params,
+                    response_json=rec.response_json,
+                    event_timestamp=naive(rec.event_timestamp),
+                    published_at=naive(rec.published_at),
+                    ingested_at=naive(datetime.now(timezone.utc)),
+                    payload_hash=hashlib.sha256(rec.response_json.encode("utf-8")).hexdigest(),
+                )
+            )
+        await session.commit()
+    return len(records)
+
+
+def naive(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def reset(engine: AsyncEngine) -> None:
+    tables = [HistoricalSnapshot.__table__, HistoricalSnapshotKey.__table__, EvidenceStore.__table__]
+    async with engine.begin() as conn:
+        for table in tables:
+            await conn.run_sync(table.drop, checkfirst=True)
+            await conn.run_sync(table.create)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench_persist.db"
+    engine = create_async_engine(url)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    records = make_records(args.records)
+
+    await reset(engine)
+    started = time.perf_counter()
+    for i in range(0, len(records), args.chunk_size):
+        await legacy_persist(factory, records[i : i + args.chunk_size])
+    legacy = len(records) / (time.perf_counter() - started)
+    print(f"legacy ORM add      {legacy:>12,.0f} rows/s")
+
+    await reset(engine)
+    harvester = HistoricalHarvester(oracle_client=None, session_factory=factory)  # type: ignore[arg-type]
+    started = time.perf_counter()
+    for i in range(0, len(records), args.chunk_size):
+        await harvester.persist_records("bench", records[i : i + args.chunk_size])
+    bulk = len(records) / (time.perf_counter() - started)
+    print(f"bulk insert         {bulk:>12,.0f} rows/s   ({bulk / legacy:.1f}x)")
+
+    repoll = records[: args.records // 2] + make_records(args.records // 2, offset=args.records)
+    inserted = deduplicated = 0
+    started = time.perf_counter()
+    for i in range(0, len(repoll), args.chunk_size):
+        result = await harvester.persist_records("bench", repoll[i : i + args.chunk_size])
+        inserted += result.inserted
+        deduplicated += result.deduplicated
+    print(f"re-poll (50% dup)   {len(repoll) / (time.perf_counter() - started):>12,.0f} rows/s   inserted={inserted} deduplicated={deduplicated}")
+    await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    asyncio.run(main_async(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
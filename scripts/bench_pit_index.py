@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""PIT lookup latency on ``historical_snapshot`` before and after the composite index.
+
+Seeds synthetic snapshots into a scratch Postgres table with ``generate_series`` (fast and
+reproducible for a fixed ``--seed``), then times the exact ``OracleClient`` as-of query with
+the legacy single-column indexes and again with ``ix_historical_snapshot_pit``.
+
+Point ``DATABASE_URL`` at a local throwaway database, e.g.
+``DATABASE_URL=postgresql+asyncpg://localhost/trading_bench python scripts/bench_pit_index.py --rows 5000000``.
+The table is dropped and recreated on every run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import desc, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from trading.db.models import HistoricalSnapshot
+
+START = datetime(2025, 1, 6, 8, 0)
+LEGACY_INDEXES = (
+    "CREATE INDEX ix_historical_snapshot_provider_endpoint ON historical_snapshot (provider_endpoint)",
+    "CREATE INDEX ix_historical_snapshot_symbol ON historical_snapshot (symbol)",
+)
+COMPOSITE_INDEX = "CREATE INDEX ix_historical_snapshot_pit ON historical_snapshot (provider_endpoint, symbol, published_at DESC)"
+ENDPOINTS = ("get_price", "finnhub_quote", "twelve_data_series", "fmp_quote")
+
+
+async def seed(engine: AsyncEngine, rows: int, symbols: int, span_minutes: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(HistoricalSnapshot.__table__.drop, checkfirst=True)
+        await conn.run_sync(HistoricalSnapshot.__table__.create)
+        await conn.execute(text("DROP INDEX IF EXISTS ix_historical_snapshot_pit"))
+        endpoints = "ARRAY[" + ",".join(f"'{e}'" for e in ENDPOINTS) + "]"
+        await conn.execute(
+            text(
+                f"""
+                INSERT INTO historical_snapshot
+                    (run_id, provider, provider_endpoint, symbol, request_params_json, response_json,
+                     event_timestamp, published_at, ingested_at, payload_hash, leakage_flag)
+                SELECT 'bench', 'BENCH', ({endpoints})[1 + g % {len(ENDPOINTS)}],
+                       'S' || (g / {len(ENDPOINTS)}) % :symbols, '{{}}', '{{"c":1}}',
+                       ts, ts, ts, md5(g::text), false
+                FROM generate_series(1, :rows) AS g,
+                     LATERAL (SELECT CAST(:start AS timestamp) + make_interval(secs => (hashint4(g) & 2147483647) % (:span * 60)) AS ts) t
+                """
+            ),
+            {"rows": rows, "symbols": symbols, "start": START, "span": span_minutes},
+        )
+        for ddl in LEGACY_INDEXES:
+            await conn.execute(text(ddl))
+        await conn.execute(text("ANALYZE historical_snapshot"))
+
+
+async def time_lookups(engine: AsyncEngine, lookups: int, symbols: int, span_minutes: int, seed_value: int) -> list[float]:
+    rng = random.Random(seed_value)
+    samples = []
+    async with engine.connect() as conn:
+        for _ in range(lookups):
+            as_of = START + timedelta(minutes=rng.randrange(span_minutes))
+            statement = (
+                select(HistoricalSnapshot)
+                .where(HistoricalSnapshot.provider_endpoint == rng.choice(ENDPOINTS))
+                .where(HistoricalSnapshot.symbol == f"S{rng.randrange(symbols)}")
+                .where(HistoricalSnapshot.published_at <= as_of)
+                .order_by(desc(HistoricalSnapshot.published_at))
+                .limit(1)
+            )
+            started = time.perf_counter()
+            (await conn.execute(statement)).first()
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def explain(engine: AsyncEngine) -> str:
+    async with engine.connect() as conn:
+        plan = await conn.execute(
+            text(
+                "EXPLAIN SELECT * FROM historical_snapshot WHERE provider_endpoint = 'get_price' "
+                "AND symbol = 'S1' AND published_at <= :t ORDER BY published_at DESC LIMIT 1"
+            ),
+            {"t": START + timedelta(days=1)},
+        )
+        return "\n".join(f"    {row[0]}" for row in plan)
+
+
+def report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(f"{label:<10} p50 {statistics.median(ordered) * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    engine = create_async_engine(os.getenv("DATABASE_URL", "postgresql+asyncpg://localhost/trading_bench"))
+    started = time.perf_counter()
+    await seed(engine, args.rows, args.symbols, args.span_minutes)
+    print(f"seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+    before = await time_lookups(engine, args.lookups, args.symbols, args.span_minutes, args.seed)
+    print("plan before:\n" + await explain(engine))
+    async with engine.begin() as conn:
+        await conn.execute(text(COMPOSITE_INDEX))
+        await conn.execute(text("DROP INDEX ix_historical_snapshot_provider_endpoint"))
+        await conn.execute(text("DROP INDEX ix_historical_snapshot_symbol"))
+        await conn.execute(text("ANALYZE historical_snapshot"))
+    after = await time_lookups(engine, args.lookups, args.symbols, args.span_minutes, args.seed)
+    print("plan after:\n" + await explain(engine))
+
+    report("before", before)
+    report("after", after)
+    await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--span-minutes", type=int, default=5 * 24 * 60)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main_async(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Per-record cost of harvester pre-screening on realistically sized payloads.
+
+Compares the previous implementation (lowercase copy + one scan per marker, full
+``json.loads`` for the publication time) with ``HistoricalHarvester``, which decodes a
+payload only when a publication-time key occurs in it.
+The corpus is synthetic but shaped like real responses: small quote objects, a Twelve Data
+series, a GDELT article list, and a multi-megabyte SEC EDGAR submissions document.
+Run from the repository root: ``python scripts/bench_prescreen.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from trading.backtest.harvester import HistoricalHarvester
+
+FALLBACK = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+def corpus(seed: int) -> dict[str, str]:
+    rng = random.Random(seed)
+    words = ["market", "earnings", "guidance", "rates", "inflation", "supply", "chain", "merger", "outlook", "filing"]
+
+    def sentence(n: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    gdelt = {
+        "articles": [
+            {"url": f"https://news.example/{i}", "title": sentence(12), "seendate": "20250106T080000Z", "domain": "news.example", "tone": rng.uniform(-5, 5)}
+            for i in range(2500)
+        ]
+    }
+    sec = {
+        "cik": "0000320193",
+        "name": "EXAMPLE INC",
+        "filings": {
+            "recent": {
+                "accessionNumber": [f"0000320193-25-{i:06d}" for i in range(20000)],
+                "filingDate": ["2025-01-06"] * 20000,
+                "form": [rng.choice(["10-K", "10-Q", "8-K", "4"]) for _ in range(20000)],
+                "primaryDocDescription": [sentence(6) for _ in range(20000)],
+            }
+        },
+    }
+    series = {
+        "meta": {"symbol": "AAPL", "interval": "1min"},
+        "values": [{"datetime": f"2025-01-06 09:{i % 60:02d}:00", "open": "1", "high": "1", "low": "1", "close": "1", "volume": "10"} for i in range(5000)],
+        "status": "ok",
+    }
+    return {
+        "finnhub quote": json.dumps({"c": 243.1, "h": 244.0, "l": 241.2, "o": 242.0, "pc": 242.5, "t": 1736150400}),
+        "twelve_data series": json.dumps(series),
+        "gdelt articles": json.dumps(gdelt),
+        "sec submissions": json.dumps(sec),
+    }
+
+
+def legacy_is_forward_looking(payload: str) -> bool:
+    lowered = payload.lower()
+    return any(marker in lowered for marker in ["weekly recap", "month in review", "year ahead", "next week"])
+
+
+def legacy_published_at(payload: str, fallback: datetime) -> datetime:
+    try:
+        decoded = json.loads(payload)
+    except json.JSONDecodeError:
+        return fallback
+    for key in ("published_at", "datetime", "timestamp"):
+        value = decoded.get(key)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                continue
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+    return fallback
+
+
+def per_call_us(fn, payload: str, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn(payload)
+    return (time.perf_counter() - started) / runs * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'payload':<20} {'size':>9} {'legacy us':>12} {'current us':>13} {'speedup':>8}")
+    for name, payload in corpus(args.seed).items():
+        runs = args.runs if len(payload) > 100_000 else args.runs * 1000
+        assert legacy_published_at(payload, FALLBACK) == HistoricalHarvester.parse_published_at(payload, FALLBACK)
+        assert legacy_is_forward_looking(payload) == HistoricalHarvester.is_forward_looking_summary(payload)
+        legacy = per_call_us(lambda p: (legacy_is_forward_looking(p), legacy_published_at(p, FALLBACK)), payload, runs)
+        fast = per_call_us(
+            lambda p: (HistoricalHarvester.is_forward_looking_summary(p), HistoricalHarvester.parse_published_at(p, FALLBACK)),
+            payload,
+            runs,
+        )
+        print(f"{name:<20} {len(payload) / 1024:>7.0f}KB {legacy:>12.1f} {fast:>13.1f} {legacy / fast:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
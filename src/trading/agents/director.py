@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from typing import Any
 from xml.sax.saxutils import escape
 
 from trading.config import AppConfig
 from trading.infra.anthropic_client import AnthropicRouter, StrategyAsset
+from trading.infra.llm_cache import DirectorResponseCache, ModelCall
 
 
 @dataclass
@@ -57,6 +59,14 @@ class PromptCompiler:
 @dataclass
 class StrategyDirector:
     router: AnthropicRouter
+    # Record/replay cache for model responses (anthropic.response_cache); None calls the model directly.
+    response_cache: DirectorResponseCache | None = None
+
+    async def complete(self, payload: dict, call: ModelCall) -> Any:
+        """Send a payload from ``build_batched_prompt`` through ``call``, via the response cache if set."""
+        if self.response_cache is None:
+            return await call(payload)
+        return await self.response_cache.complete(payload, call)
 
     def build_batched_prompt(self, *, system_rules: str, global_portfolio_state: dict, assets: list[StrategyAsset]) -> dict:
         compiler = PromptCompiler(config=self.router.config)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from trading.config import AppConfig
+from trading.db.models import BacktestFill, BacktestPortfolioState, BacktestPosition
+
+
+@dataclass
+class FillBatch:
+    """One window's fills as parallel arrays; ``qty`` is signed (buys positive, sells negative)."""
+
+    slots: np.ndarray
+    qty: np.ndarray
+    price: np.ndarray
+    fees: np.ndarray
+    order_ids: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+
+class PortfolioBook:
+    """Positions, average costs, marks and realized PnL as float64 arrays indexed by universe slot.
+
+    ``apply`` folds a whole window's fills in with ``np.bincount`` per slot and side: the
+    quantity bought and sold within the window is realized at the sell VWAP minus the buy
+    VWAP, and only the net remainder trades against the held position, at its own side's
+    VWAP. Exposures are reported as fractions of equity.
+    """
+
+    def __init__(self, symbols: Sequence[str], cash: float) -> None:
+        self.symbols = list(symbols)
+        self.slots = {symbol: i for i, symbol in enumerate(self.symbols)}
+        n = len(self.symbols)
+        self.cash = float(cash)
+        self.qty = np.zeros(n)
+        self.avg_cost = np.zeros(n)
+        self.mark = np.zeros(n)
+        self.realized = np.zeros(n)
+        self.traded = np.zeros(n, dtype=bool)
+
+    def batch(self, fills: Iterable[Mapping[str, Any]]) -> FillBatch:
+        """Build a ``FillBatch`` from fill dicts (``symbol``, signed ``qty``, ``price``, optional ``fees``/``order_id``)."""
+        fills = list(fills)
+        try:
+            slots = [self.slots[fill["symbol"]] for fill in fills]
+        except KeyError as exc:
+            raise ValueError(f"fill for symbol outside the backtest universe: {exc.args[0]}") from None
+        return FillBatch(
+            slots=np.asarray(slots, dtype=np.int64),
+            qty=np.asarray([float(fill["qty"]) for fill in fills]),
+            price=np.asarray([float(fill["price"]) for fill in fills]),
+            fees=np.asarray([float(fill.get("fees", 0.0)) for fill in fills]),
+            order_ids=np.asarray([int(fill.get("order_id", 0)) for fill in fills], dtype=np.int64),
+        )
+
+    def apply(self, batch: FillBatch) -> None:
+        if not len(batch):
+            return
+        n = len(self.symbols)
+        traded = np.bincount(batch.slots, minlength=n) > 0
+        buys = batch.qty > 0
+        notional = batch.qty * batch.price
+        buy_qty = np.bincount(batch.slots, weights=np.where(buys, batch.qty, 0.0), minlength=n)
+        sell_qty = np.bincount(batch.slots, weights=np.where(buys, 0.0, -batch.qty), minlength=n)
+        buy_notional = np.bincount(batch.slots, weights=np.where(buys, notional, 0.0), minlength=n)
+        sell_notional = np.bincount(batch.slots, weights=np.where(buys, 0.0, -notional), minlength=n)
+        fees = np.bincount(batch.slots, weights=batch.fees, minlength=n)
+
+        q0, a0 = self.qty, self.avg_cost
+        qty = buy_qty - sell_qty
+        q1 = q0 + qty
+        with np.errstate(divide="ignore", invalid="ignore"):
+            buy_vwap = np.where(buy_qty > 0, buy_notional / buy_qty, 0.0)
+            sell_vwap = np.where(sell_qty > 0, sell_notional / sell_qty, 0.0)
+            # The window's offsetting buys and sells close against each other first.
+            realized = np.minimum(buy_qty, sell_qty) * (sell_vwap - buy_vwap)
+
+            vwap = np.where(qty > 0, buy_vwap, sell_vwap)
+            adds = (q0 == 0) | (np.sign(q0) == np.sign(qty))
+            flips = ~adds & (np.abs(qty) > np.abs(q0))
+            reduces = ~adds & ~flips
+
+            realized += np.where(reduces, -qty * (vwap - a0), 0.0)
+            realized += np.where(flips, q0 * (vwap - a0), 0.0)
+
+            avg = np.where(adds & (q1 != 0), (q0 * a0 + qty * vwap) / q1, a0)
+            avg = np.where(flips, vwap, avg)
+            avg = np.where(q1 == 0, 0.0, avg)
+
+        self.qty = q1
+        self.avg_cost = avg
+        self.realized += realized - fees
+        self.cash -= float(buy_notional.sum() - sell_notional.sum() + fees.sum())
+        self.traded |= traded
+        # Slots without a mark yet start at their last fill price in this batch.
+        last = len(batch) - 1 - np.unique(batch.slots[::-1], return_index=True)[1]
+        unmarked = self.mark[batch.slots[last]] == 0
+        self.mark[batch.slots[last][unmarked]] = batch.price[last][unmarked]
+
+    def mark_to_market(self, prices: Mapping[str, float]) -> None:
+        slots = [self.slots[symbol] for symbol in prices if symbol in self.slots]
+        self.mark[slots] = [float(prices[self.symbols[slot]]) for slot in slots]
+
+    @property
+    def market_value(self) -> np.ndarray:
+        return self.qty * self.mark
+
+    @property
+    def unrealized_pnl(self) -> np.ndarray:
+        return self.qty * (self.mark - self.avg_cost)
+
+    @property
+    def equity(self) -> float:
+        return self.cash + float(self.market_value.sum())
+
+    def state(self) -> dict[str, float]:
+        """Portfolio totals; ``margin_used`` is gross exposure financed beyond equity."""
+        value = self.market_value
+        gross, net, equity = float(np.abs(value).sum()), float(value.sum()), self.equity
+        return {
+            "equity": equity,
+            "cash": self.cash,
+            "margin_used": max(0.0, gross - equity),
+            "gross_exposure": gross / equity if equity > 0 else 0.0,
+            "net_exposure": net / equity if equity > 0 else 0.0,
+        }
+
+
+class AccountingEngine:
+    """Applies each window's fills to a ``PortfolioBook`` and bulk-writes the backtest tables.
+
+    Fill rows and portfolio snapshots are buffered and inserted with one executemany per
+    table every ``flush_every`` windows; ``backtest_positions`` holds current state, so a
+    flush replaces the run's rows.
+    """
+
+    def __init__(
+        self,
+        book: PortfolioBook,
+        run_id: str,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_every: int = 20,
+    ) -> None:
+        self.book = book
+        self.run_id = run_id
+        self.session_factory = session_factory
+        self.flush_every = max(1, flush_every)
+        self._fills: list[dict[str, Any]] = []
+        self._states: list[dict[str, Any]] = []
+        self._windows = 0
+
+    @classmethod
+    def from_config(
+        cls, config: AppConfig, run_id: str, session_factory: async_sessionmaker[AsyncSession]
+    ) -> AccountingEngine:
+        settings = config.backtest.get("accounting", {})
+        universe = config.universe
+        symbols = list(dict.fromkeys([*universe.get("holdings", []), *universe.get("watchlist", [])]))
+        book = PortfolioBook(symbols, cash=float(settings.get("starting_cash", 100000)))
+        return cls(book, run_id, session_factory, flush_every=int(settings.get("flush_every_windows", 20)))
+
+    async def close_window(
+        self,
+        as_of: datetime,
+        fills: FillBatch | Iterable[Mapping[str, Any]] = (),
+        marks: Mapping[str, float] | None = None,
+    ) -> dict[str, float]:
+        """Apply the window's fills and marks, buffer its rows, and flush when due; returns the state."""
+        batch = fills if isinstance(fills, FillBatch) else self.book.batch(fills)
+        self.book.apply(batch)
+        if marks:
+            self.book.mark_to_market(marks)
+        self._fills.extend(
+            {
+                "backtest_run_id": self.run_id,
+                "order_id": order_id,
+                "filled_at": as_of,
+                "fill_price": price,
+                "qty": qty,
+                "fees": fees,
+            }
+            for order_id, price, qty, fees in zip(
+                batch.order_ids.tolist(), batch.price.tolist(), batch.qty.tolist(), batch.fees.tolist()
+            )
+        )
+        state = self.book.state()
+        self._states.append({"backtest_run_id": self.run_id, "as_of": as_of, **state})
+        self._windows += 1
+        if self._windows % self.flush_every == 0:
+            await self.flush()
+        return state
+
+    async def flush(self) -> None:
+        book = self.book
+        traded = np.flatnonzero(book.traded)
+        positions = [
+            {
+                "backtest_run_id": self.run_id,
+                "symbol": book.symbols[slot],
+                "status": "open" if qty else "closed",
+                "quantity": qty,
+                "avg_cost": avg,
+                "mark_price": mark,
+                "unrealized_pnl": pnl,
+            }
+            for slot, qty, avg, mark, pnl in zip(
+                traded.tolist(),
+                book.qty[traded].tolist(),
+                book.avg_cost[traded].tolist(),
+                book.mark[traded].tolist(),
+                book.unrealized_pnl[traded].tolist(),
+            )
+        ]
+        async with self.session_factory() as session:
+            if self._fills:
+                await session.execute(insert(BacktestFill.__table__), self._fills)
+            if self._states:
+                await session.execute(insert(BacktestPortfolioState.__table__), self._states)
+            await session.execute(delete(BacktestPosition).where(BacktestPosition.backtest_run_id == self.run_id))
+            if positions:
+                await session.execute(insert(BacktestPosition.__table__), positions)
+            await session.commit()
+        self._fills = []
+        self._states = []
@@ -2,20 +2,31 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from datetime import date, datetime, time, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
 from typing import Awaitable, Callable
 
+from trading.backtest.events import Event, EventEngine
+from trading.backtest.virtual_time import VirtualTimeEventLoop
 from trading.config import AppConfig
+from trading.core.scheduler import AdaptiveInputs, AdaptiveIntervalScheduler
 from trading.core.trade_gate import TradeGate
 from trading.utils.time_provider import SimulatedClock, TimeProvider
 
 RunHook = Callable[[str, datetime], Awaitable[None]]
+EventHook = Callable[[Event], Awaitable[None]]
+
+_QUIET = AdaptiveInputs(event_velocity=0.0, volatility_state="normal", quota_pressure=0.0)
 
 
 @dataclass
 class BacktestRunner:
     config: AppConfig
     run_hook: RunHook
+    # Receives fill and earnings events; window and adaptive-tick events go to run_hook.
+    event_hook: EventHook | None = None
+    # Market conditions fed to the adaptive scheduler at each tick (``backtest.schedule_mode: adaptive``).
+    adaptive_inputs: Callable[[datetime], AdaptiveInputs] | None = None
 
     def __post_init__(self) -> None:
         bt = self.config.backtest
@@ -23,21 +34,82 @@ class BacktestRunner:
         self.clock = SimulatedClock(current=start)
         self.time_provider = TimeProvider(mode="backtest", simulated_clock=self.clock)
         self.trade_gate = TradeGate(config=self.config)
+        self.scheduler = AdaptiveIntervalScheduler(config=self.config)
+        self.engine = EventEngine(self.clock)
+
+    def replay(self) -> None:
+        """Run the backtest on a fresh event loop; with ``backtest.fast_forward`` it runs on virtual time."""
+        fast_forward = bool(self.config.backtest.get("fast_forward", False))
+        loop_factory = partial(VirtualTimeEventLoop, self.clock) if fast_forward else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(self.run())
 
     async def run(self) -> None:
         bt = self.config.backtest
         end = _parse_iso(bt.get("clock_end", "2025-01-10T16:30:00Z"))
         wait_seconds = int(bt.get("simulated_wait_seconds", 2))
+        # Outside a virtual-time loop, fast-forward still skips the wall-clock wait between windows.
+        skip_wait = bool(bt.get("fast_forward", False)) and not isinstance(
+            asyncio.get_running_loop(), VirtualTimeEventLoop
+        )
 
-        current_day = self.clock.now().date()
-        while current_day <= end.date():
-            for name, event_time in self._daily_windows(current_day):
-                if event_time < self.clock.now() or event_time > end:
-                    continue
-                self.clock.advance_to(event_time)
-                await self.run_hook(name, self.time_provider.now())
+        async def dispatch(event: Event) -> None:
+            if event.kind not in ("window", "tick"):
+                if self.event_hook is not None:
+                    await self.event_hook(event)
+                return
+            await self.run_hook(event.name, self.time_provider.now())
+            if skip_wait:
+                self.clock.advance_seconds(wait_seconds)
+            else:
                 await asyncio.sleep(wait_seconds)
-            current_day = current_day + timedelta(days=1)
+
+        self._seed(self.clock.now())
+        await self.engine.run(end, dispatch)
+
+    def _seed(self, start: datetime) -> None:
+        """Queue the first occurrence of every window (and adaptive tick) at or after ``start``."""
+        day = start.date()
+        for name, _ in self._daily_windows(day):
+            first = self._window_at(name, day)
+            if first < start:
+                first = self._window_at(name, day + timedelta(days=1))
+            self.engine.schedule(first, "window", name, repeat=partial(self._next_window, name))
+        if self.config.backtest.get("schedule_mode", "fixed") == "adaptive":
+            self.engine.schedule(self._in_session(start), "tick", "adaptive", repeat=self._after_tick)
+        # Earnings events fire at premarket on the first day of their window (events.earnings_window_days).
+        window = self.config.events.get("earnings_window_days", {})
+        lead, trail = timedelta(days=int(window.get("start", -1))), timedelta(days=int(window.get("end", 2)))
+        for symbol, days in self.config.events.get("earnings_dates", {}).items():
+            for raw in days:
+                earnings_day = date.fromisoformat(str(raw))
+                if earnings_day + trail >= start.date():
+                    at = max(start, self._window_at("premarket", earnings_day + lead))
+                    self.engine.schedule_earnings(symbol, earnings_day, at)
+
+    def _window_at(self, name: str, day: date) -> datetime:
+        return dict(self._daily_windows(day))[name]
+
+    def _next_window(self, name: str, fired_at: datetime) -> datetime:
+        return self._window_at(name, fired_at.date() + timedelta(days=1))
+
+    def _session(self, day: date) -> tuple[datetime, datetime]:
+        adaptive = self.config.schedule.get("adaptive", {})
+        return _combine(day, adaptive.get("session_start", "09:30")), _combine(day, adaptive.get("session_end", "16:00"))
+
+    def _in_session(self, at: datetime) -> datetime:
+        """``at`` if it falls inside the trading session, else the next session open."""
+        open_, close = self._session(at.date())
+        if at < open_:
+            return open_
+        if at >= close:
+            return self._session(at.date() + timedelta(days=1))[0]
+        return at
+
+    def _after_tick(self, fired_at: datetime) -> datetime:
+        inputs = self.adaptive_inputs(fired_at) if self.adaptive_inputs is not None else _QUIET
+        candidate = fired_at + timedelta(minutes=self.scheduler.next_interval_minutes(inputs))
+        return self._in_session(candidate)
 
     def _daily_windows(self, day: date) -> list[tuple[str, datetime]]:
         windows = self.config.schedule.get("windows", {})
@@ -52,6 +124,12 @@ class BacktestRunner:
             ("reflection", reflection),
         ]
 
+    def earnings_window_active(self, symbol: str | None = None) -> bool:
+        window = self.config.events.get("earnings_window_days", {})
+        return self.engine.earnings_window_active(
+            self.clock.now(), int(window.get("start", -1)), int(window.get("end", 2)), symbol=symbol
+        )
+
     def allow_order_notional(self, existing_daily_notional: float, proposed_notional: float) -> bool:
         return self.trade_gate.enforce_backtest_notional_cap(
             existing_daily_notional=existing_daily_notional,
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import copy
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from trading.backtest.runner import BacktestRunner, RunHook
+from trading.config import AppConfig, deep_merge
+
+
+@dataclass
+class TrialHarness:
+    """What a sweep factory returns for one run: the window hook and the metrics read after it."""
+
+    run_hook: RunHook
+    metrics: Callable[[], Mapping[str, float]]
+
+
+# ``factory(config, run_id, runner)``, referenced as "module:attr" so spawned workers can import it.
+# The runner is built first, so the harness can use its ``time_provider`` and clock.
+HarnessFactory = Callable[[AppConfig, str, BacktestRunner], TrialHarness]
+
+
+@dataclass
+class SweepResult:
+    index: int
+    run_id: str
+    overrides: dict[str, Any]
+    metrics: dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def grid(space: Mapping[str, Sequence[Any]]) -> list[dict[str, Any]]:
+    """Every combination of ``space`` values, keyed by dotted config path (``risk.min_win_prob``)."""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_search(space: Mapping[str, Sequence[Any] | tuple[float, float]], samples: int, seed: int = 0) -> list[dict[str, Any]]:
+    """``samples`` draws from ``space``: lists are sampled as choices, ``(low, high)`` tuples uniformly."""
+    rng = random.Random(seed)
+    draws = []
+    for _ in range(samples):
+        draw = {}
+        for key, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                draw[key] = rng.uniform(float(values[0]), float(values[1]))
+            else:
+                draw[key] = rng.choice(list(values))
+        draws.append(draw)
+    return draws
+
+
+def apply_overrides(raw: dict[str, Any], overrides: Mapping[str, Any]) -> dict[str, Any]:
+    nested: dict[str, Any] = {}
+    for path, value in overrides.items():
+        node = nested
+        *parents, leaf = path.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return deep_merge(copy.deepcopy(raw), nested)
+
+
+def load_factory(path: str) -> HarnessFactory:
+    module, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError(f"harness factory must be 'module:attr', got {path!r}")
+    return getattr(importlib.import_module(module), attr)
+
+
+async def _no_hook(name: str, ts: datetime) -> None:
+    """Placeholder until the factory's harness supplies the window hook."""
+
+
+def run_trial(base: dict[str, Any], factory_path: str, index: int, run_id: str, overrides: dict[str, Any]) -> SweepResult:
+    """Run one backtest in this process; failures are reported on the result rather than raised."""
+    started = time.perf_counter()
+    result = SweepResult(index=index, run_id=run_id, overrides=overrides)
+    try:
+        config = AppConfig(raw=apply_overrides(base, overrides))
+        runner = BacktestRunner(config=config, run_hook=_no_hook)
+        harness = load_factory(factory_path)(config, run_id, runner)
+        runner.run_hook = harness.run_hook
+        runner.replay()
+        result.metrics = {name: float(value) for name, value in harness.metrics().items()}
+    except Exception:
+        result.error = traceback.format_exc(limit=5)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def run_sweep(
+    base: AppConfig,
+    factory_path: str,
+    trials: Iterable[Mapping[str, Any]],
+    *,
+    sweep_id: str | None = None,
+    workers: int | None = None,
+    on_result: Callable[[SweepResult], None] | None = None,
+) -> list[SweepResult]:
+    """Run each override set as an independent backtest, one worker process per core.
+
+    Workers are spawned, so each builds its own ``BacktestRunner`` (and ``SimulatedClock``)
+    from a pickled copy of the config. With ``backtest.snapshot_source: parquet`` they share
+    the exported snapshot files read-only through the OS page cache. Results come back in
+    trial order.
+    """
+    sweep_id = sweep_id or time.strftime("sweep-%Y%m%dT%H%M%S")
+    trials = [dict(trial) for trial in trials]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(trials) or 1))
+    results: list[SweepResult] = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(run_trial, base.raw, factory_path, i, f"{sweep_id}-{i:04d}", trial) for i, trial in enumerate(trials)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return sorted(results, key=lambda r: r.index)
+
+
+def rank(results: Iterable[SweepResult], metric: str, descending: bool = True) -> list[SweepResult]:
+    """Successful runs ordered by ``metric``; failed runs and runs without it go last."""
+    results = list(results)
+    scored = sorted(
+        (r for r in results if r.error is None and metric in r.metrics), key=lambda r: r.metrics[metric], reverse=descending
+    )
+    ranked = {r.index for r in scored}
+    return scored + [r for r in results if r.index not in ranked]
+
+
+def format_table(results: Sequence[SweepResult], metric: str) -> str:
+    keys = sorted({key for r in results for key in r.overrides})
+    metrics = [metric] + sorted({name for r in results for name in r.metrics} - {metric})
+    header = ["rank", "run_id", *keys, *metrics, "seconds"]
+    rows = [header]
+    for position, r in enumerate(results, start=1):
+        values = [_cell(r.metrics.get(name)) if r.error is None else "error" for name in metrics]
+        rows.append([str(position), r.run_id, *(_cell(r.overrides.get(key)) for key in keys), *values, f"{r.seconds:.2f}"])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+
+
+def parse_param(spec: str) -> tuple[str, list[Any] | tuple[float, float]]:
+    """``key=v1,v2,...`` for a list of values or ``key=low:high`` for a uniform range."""
+    key, _, values = spec.partition("=")
+    if not key or not values:
+        raise ValueError(f"expected key=v1,v2 or key=low:high, got {spec!r}")
+    if ":" in values and "," not in values:
+        low, high = values.split(":", 1)
+        return key, (float(low), float(high))
+    return key, [_literal(value) for value in values.split(",")]
+
+
+def _literal(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
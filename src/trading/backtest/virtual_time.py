@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import selectors
+from typing import Any, Callable
+
+from trading.utils.time_provider import SimulatedClock
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop on virtual time: when nothing is runnable it jumps to the next timer instead of waiting.
+
+    ``loop.time()`` starts at 0 and only moves by those jumps, so ``asyncio.sleep``,
+    ``call_later`` and ``wait_for`` deadlines fire in the same order as on a real loop but
+    cost no wall time; ``clock``, if given, advances with it. Work handed to
+    ``run_in_executor``/``to_thread`` takes zero virtual time: the loop blocks for it in real
+    time before jumping. Socket I/O is not tracked, so a timeout around a network call fires
+    as soon as nothing else is runnable; hooks under fast-forward should read recorded data
+    (e.g. the Parquet snapshot source) rather than the network.
+    """
+
+    def __init__(self, clock: SimulatedClock | None = None) -> None:
+        self.clock = clock
+        self._virtual_now = 0.0
+        self._executor_jobs = 0
+        selector = _VirtualSelector()
+        super().__init__(selector)
+        selector.loop = self
+
+    def time(self) -> float:
+        return self._virtual_now
+
+    def run_in_executor(self, executor: Any, func: Callable[..., Any], *args: Any) -> asyncio.Future:
+        future = super().run_in_executor(executor, func, *args)
+        self._executor_jobs += 1
+        future.add_done_callback(self._executor_job_done)
+        return future
+
+    async def shutdown_default_executor(self, *args: Any, **kwargs: Any) -> None:
+        # Joining executor threads is real work; a jump here would trip the join timeout.
+        self._executor_jobs += 1
+        try:
+            await super().shutdown_default_executor(*args, **kwargs)
+        finally:
+            self._executor_jobs -= 1
+
+    def _executor_job_done(self, _future: asyncio.Future) -> None:
+        self._executor_jobs -= 1
+
+    def _advance(self, seconds: float) -> None:
+        self._virtual_now += seconds
+        if self.clock is not None:
+            self.clock.advance_seconds(seconds)
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector whose timed waits become virtual-time jumps on the owning loop."""
+
+    loop: VirtualTimeEventLoop
+
+    def select(self, timeout: float | None = None) -> list[tuple[selectors.SelectorKey, int]]:
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None or self.loop._executor_jobs:
+            # No timers to jump to, or thread work outstanding: wait for real until woken.
+            return super().select(None)
+        # The base loop caps waits at one day; longer timers are reached over several jumps.
+        self.loop._advance(timeout)
+        return []
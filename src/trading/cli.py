@@ -2,24 +2,29 @@ from __future__ import annotations
 
 import typer
 
-from trading.main import implementation_plan, run_decision, run_schedule_probe
-from trading.setup import maybe_run_setup_wizard
-
+# Command modules are imported inside each command so `trading --help` only pays for typer.
 app = typer.Typer(no_args_is_help=True)
 
 
 @app.command("setup")
 def setup_cmd() -> None:
+    from trading.setup import maybe_run_setup_wizard
+
     maybe_run_setup_wizard()
 
 
 @app.command("plan")
 def plan_cmd() -> None:
+    from trading.main import implementation_plan
+
     print(implementation_plan())
 
 
 @app.command("run-decision")
 def run_decision_cmd() -> None:
+    from trading.main import run_decision
+    from trading.setup import maybe_run_setup_wizard
+
     maybe_run_setup_wizard()
     payload = run_decision()
     print({"keys": list(payload.keys())})
@@ -27,8 +32,117 @@ def run_decision_cmd() -> None:
 
 @app.command("run-schedule")
 def run_schedule_cmd() -> None:
+    from trading.main import run_schedule_probe
+
     run_schedule_probe()
 
 
+@app.command("db-partitions")
+def db_partitions_cmd() -> None:
+    """Create the current and upcoming monthly historical_snapshot partitions (Postgres)."""
+    import asyncio
+
+    from trading.config import load_config
+    from trading.db.partitions import ensure_partitions_ahead
+    from trading.db.session import build_engine
+
+    months_ahead = int(load_config().backtest.get("archive", {}).get("partitions_ahead", 3))
+
+    async def run() -> list:
+        engine = build_engine()
+        try:
+            return await ensure_partitions_ahead(engine, months_ahead)
+        finally:
+            await engine.dispose()
+
+    created = asyncio.run(run())
+    print({"created": [partition.name for partition in created]})
+
+
+@app.command("db-archive")
+def db_archive_cmd(retention_months: int | None = None) -> None:
+    """Move historical_snapshot partitions older than the retention window to Parquet."""
+    import asyncio
+    from datetime import datetime, timezone
+
+    from trading.config import load_config
+    from trading.db.partitions import SnapshotArchive, archive_partitions, month_floor
+    from trading.db.session import build_engine
+
+    archive_cfg = load_config().backtest.get("archive", {})
+    keep = int(archive_cfg.get("retention_months", 12) if retention_months is None else retention_months)
+    current = month_floor(datetime.now(timezone.utc))
+    months = current.year * 12 + current.month - 1 - keep
+    cutoff = current.replace(year=months // 12, month=months % 12 + 1)
+
+    async def run() -> list:
+        engine = build_engine()
+        try:
+            return await archive_partitions(engine, SnapshotArchive(archive_cfg.get("root", "data/archive")), cutoff)
+        finally:
+            await engine.dispose()
+
+    archived = asyncio.run(run())
+    print({"cutoff": cutoff.isoformat(), "archived": {item.partition.label: item.rows for item in archived}})
+
+
+@app.command("snapshots-export")
+def snapshots_export_cmd(run_id: str | None = None, out: str | None = None) -> None:
+    """Export historical_snapshot rows to Parquet for database-free backtests."""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from trading.config import load_config
+    from trading.data.parquet_store import ParquetSnapshotStore, export_snapshots
+    from trading.db.blob_store import blob_store_from_config
+    from trading.db.session import build_engine
+
+    backtest = load_config().backtest
+    store = ParquetSnapshotStore(out or backtest.get("snapshot_parquet", {}).get("root", "data/snapshots"))
+    blob_store = blob_store_from_config(backtest) if backtest.get("blob_store", {}).get("enabled", False) else None
+
+    async def run() -> dict[str, int]:
+        engine = build_engine()
+        try:
+            return await export_snapshots(async_sessionmaker(engine), store, run_id=run_id, blob_store=blob_store)
+        finally:
+            await engine.dispose()
+
+    print({"root": str(store.root), "rows": asyncio.run(run())})
+
+
+@app.command("sweep")
+def sweep_cmd(
+    harness: str,
+    param: list[str] = typer.Option(..., help="key=v1,v2 (grid values) or key=low:high (uniform range)"),
+    samples: int = typer.Option(0, help="Random draws instead of the full grid"),
+    seed: int = 0,
+    metric: str = typer.Option("pnl", help="Metric to rank by"),
+    ascending: bool = False,
+    workers: int | None = None,
+) -> None:
+    """Run backtests over config overrides in parallel and print them ranked by a metric."""
+    from trading.backtest.sweep import format_table, grid, parse_param, rank, random_search, run_sweep
+    from trading.config import load_config
+
+    space = dict(parse_param(spec) for spec in param)
+    if samples > 0:
+        trials = random_search(space, samples, seed=seed)
+    elif any(isinstance(values, tuple) for values in space.values()):
+        raise typer.BadParameter("ranges (low:high) need --samples")
+    else:
+        trials = grid(space)
+
+    results = run_sweep(
+        load_config(),
+        harness,
+        trials,
+        workers=workers,
+        on_result=lambda r: print(f"{r.run_id} {'failed' if r.error else 'done'} in {r.seconds:.1f}s", flush=True),
+    )
+    print(format_table(rank(results, metric, descending=not ascending), metric))
+
+
 if __name__ == "__main__":
     app()
@@ -63,11 +63,12 @@ def _default_config() -> dict[str, Any]:
     }
 
 
-def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+def deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    """``base`` with ``override`` merged in; nested dicts merge key by key, anything else replaces."""
     out = dict(base)
     for key, value in override.items():
         if isinstance(value, dict) and isinstance(out.get(key), dict):
-            out[key] = _deep_merge(out[key], value)
+            out[key] = deep_merge(out[key], value)
         else:
             out[key] = value
     return out
@@ -82,4 +83,4 @@ def load_config(path: str | Path = "config/default.yaml") -> AppConfig:
 
     with open(path, "r", encoding="utf-8") as f:
         loaded = yaml.safe_load(f) or {}
-    return AppConfig(raw=_deep_merge(defaults, loaded))
+    return AppConfig(raw=deep_merge(defaults, loaded))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import numpy as np
+
+_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarSeries:
+    """Columnar OHLCV bars in ascending time order.
+
+    Timestamps are int64 epoch seconds of the provider's wall-clock ``datetime`` field;
+    OHLCV columns are float64. Storage grows by doubling so appends are amortized O(new bars).
+    """
+
+    def __init__(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> None:
+        self._n = len(timestamps)
+        capacity = max(self._n, 16)
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._ohlcv = np.empty((capacity, len(_FIELDS)), dtype=np.float64)
+        self._ts[: self._n] = timestamps
+        self._ohlcv[: self._n] = ohlcv
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts[: self._n]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._ohlcv[: self._n, 0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._ohlcv[: self._n, 1]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._ohlcv[: self._n, 2]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._ohlcv[: self._n, 3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._ohlcv[: self._n, 4]
+
+    @property
+    def last_timestamp(self) -> int | None:
+        return int(self._ts[self._n - 1]) if self._n else None
+
+    def append(self, timestamps: np.ndarray, ohlcv: np.ndarray) -> int:
+        """Append bars newer than the last stored one; returns how many were added."""
+        if self._n:
+            keep = timestamps > self._ts[self._n - 1]
+            timestamps, ohlcv = timestamps[keep], ohlcv[keep]
+        added = len(timestamps)
+        needed = self._n + added
+        if needed > len(self._ts):
+            capacity = max(needed, 2 * len(self._ts))
+            self._ts = np.resize(self._ts, capacity)
+            self._ohlcv = np.resize(self._ohlcv, (capacity, len(_FIELDS)))
+        self._ts[self._n : needed] = timestamps
+        self._ohlcv[self._n : needed] = ohlcv
+        self._n = needed
+        return added
+
+
+def _decode_values(values: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray]:
+    # Twelve Data lists bars newest first; reverse so arrays are ascending.
+    ordered = values[::-1]
+    timestamps = np.array([v["datetime"] for v in ordered], dtype="datetime64[s]").astype(np.int64)
+    ohlcv = np.array([[v.get(f, "nan") for f in _FIELDS] for v in ordered], dtype=np.float64).reshape(-1, len(_FIELDS))
+    return timestamps, ohlcv
+
+
+def _values(payload: str | dict[str, Any]) -> list[dict[str, Any]]:
+    decoded = json.loads(payload) if isinstance(payload, (str, bytes)) else payload
+    if not isinstance(decoded, dict):
+        return []
+    return [v for v in decoded.get("values") or [] if isinstance(v, dict) and "datetime" in v]
+
+
+def decode_twelve_data_series(payload: str | dict[str, Any]) -> BarSeries:
+    return BarSeries(*_decode_values(_values(payload)))
+
+
+class BarCache:
+    """Per-(symbol, interval) bar arrays that only decode bars newer than what is already held."""
+
+    def __init__(self) -> None:
+        self._series: dict[tuple[str, str], BarSeries] = {}
+        self._last_datetime: dict[tuple[str, str], str] = {}
+
+    def get(self, symbol: str, interval: str) -> BarSeries | None:
+        return self._series.get((symbol.upper(), interval))
+
+    def update(self, symbol: str, interval: str, payload: str | dict[str, Any]) -> BarSeries:
+        key = (symbol.upper(), interval)
+        values = _values(payload)
+        last = self._last_datetime.get(key)
+        if last is not None:
+            # ISO datetimes sort lexically, so the newest-first list can be cut at the first known bar.
+            fresh = []
+            for value in values:
+                if value["datetime"] <= last:
+                    break
+                fresh.append(value)
+            values = fresh
+        timestamps, ohlcv = _decode_values(values)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = BarSeries(timestamps, ohlcv)
+        else:
+            series.append(timestamps, ohlcv)
+        if values:
+            self._last_datetime[key] = max(values[0]["datetime"], last or "")
+        return series
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+    disk_evictions: int = 0
+
+
+@dataclass
+class _Entry:
+    value: str
+    expires_at: float
+    size: int
+
+
+class ResponseCache:
+    """TTL + LRU cache for provider tool responses with an optional on-disk tier.
+
+    Entries expire per endpoint TTL and are evicted least-recently-used once either
+    ``max_entries`` or ``max_bytes`` is exceeded; the disk tier is held to the same caps and
+    only stores entries whose TTL is at least ``disk_min_ttl``. A disk file's mtime is its
+    expiry, so a new instance drops expired files without reading them. Error strings, JSON
+    error envelopes and batched payloads with a per-symbol error are never cached.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: dict[str, float],
+        *,
+        default_ttl: float = 0.0,
+        max_entries: int = 2048,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: str | Path | None = None,
+        disk_min_ttl: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.disk_min_ttl = disk_min_ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._signatures: dict[Callable[..., str], inspect.Signature] = {}
+        # Disk file name -> size, least recently used first.
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        if self.disk_path is not None:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float:
+        return float(self.ttl_seconds.get(endpoint, self.default_ttl))
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict[str, Any]) -> str:
+        return f"{endpoint}:{json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))}"
+
+    def get(self, key: str) -> str | None:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return entry.value
+                self._drop(key)
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+        return value
+
+    def put(self, key: str, value: str, ttl: float) -> None:
+        if ttl <= 0 or _is_error(value):
+            return
+        expires_at = self.clock() + ttl
+        entry = _Entry(value=value, expires_at=expires_at, size=len(value.encode("utf-8")))
+        with self._lock:
+            if entry.size <= self.max_bytes:
+                if key in self._entries:
+                    self._drop(key)
+                self._entries[key] = entry
+                self._bytes += entry.size
+                self._evict()
+        if ttl >= self.disk_min_ttl:
+            self._disk_put(key, value, expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def call(self, endpoint: str, fn: Callable[..., str], args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return fn(*args, **kwargs)
+        signature = self._signatures.get(fn)
+        if signature is None:
+            signature = self._signatures[fn] = inspect.signature(fn)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = self.make_key(endpoint, dict(bound.arguments))
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+        value = fn(*args, **kwargs)
+        self.put(key, value, ttl)
+        return value
+
+    def cached(self, endpoint: str) -> Callable[[Callable[..., str]], Callable[..., str]]:
+        def decorator(fn: Callable[..., str]) -> Callable[..., str]:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> str:
+                return self.call(endpoint, fn, args, kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.stats.evictions += 1
+
+    def _disk_file(self, key: str) -> Path | None:
+        if self.disk_path is None:
+            return None
+        return self.disk_path / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _load_disk_index(self) -> None:
+        now = self.clock()
+        files = []
+        for entry in os.scandir(self.disk_path):
+            if entry.name.endswith(".tmp"):
+                Path(entry.path).unlink(missing_ok=True)
+            elif entry.name.endswith(".json"):
+                stat = entry.stat()
+                if stat.st_mtime <= now:
+                    Path(entry.path).unlink(missing_ok=True)
+                else:
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+        # Without recorded use, the entries expiring soonest are evicted first.
+        for _, name, size in sorted(files):
+            self._disk[name] = size
+            self._disk_bytes += size
+        with self._lock:
+            self._disk_evict()
+
+    def _disk_forget(self, name: str) -> None:
+        size = self._disk.pop(name, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _disk_evict(self) -> None:
+        while self._disk and (len(self._disk) > self.max_entries or self._disk_bytes > self.max_bytes):
+            name, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            (self.disk_path / name).unlink(missing_ok=True)
+            self.stats.disk_evictions += 1
+
+    def _disk_get(self, key: str, now: float) -> str | None:
+        path = self._disk_file(key)
+        if path is None:
+            return None
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            with self._lock:
+                self._disk_forget(path.name)
+            return None
+        if record.get("key") != key:
+            return None
+        if float(record.get("expires_at", 0)) <= now:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_forget(path.name)
+            return None
+        value = str(record["value"])
+        with self._lock:
+            if path.name in self._disk:
+                self._disk.move_to_end(path.name)
+            entry = _Entry(value=value, expires_at=float(record["expires_at"]), size=len(value.encode("utf-8")))
+            if key not in self._entries and entry.size <= self.max_bytes:
+                self._entries[key] = entry
+                self._bytes += entry.size
+                self._evict()
+        return value
+
+    def _disk_put(self, key: str, value: str, expires_at: float) -> None:
+        path = self._disk_file(key)
+        if path is None:
+            return
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "expires_at": expires_at, "value": value}, f)
+            size = f.tell()
+        os.utime(tmp, (expires_at, expires_at))
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk_forget(path.name)
+            self._disk[path.name] = size
+            self._disk_bytes += size
+            self._disk_evict()
+
+
+def _is_error(value: str) -> bool:
+    """Whole-response error strings, JSON error envelopes, and batches with any per-symbol error."""
+    if value.startswith("ERROR:"):
+        return True
+    if '"error"' not in value:
+        return False
+    try:
+        decoded = json.loads(value)
+    except ValueError:
+        return False
+    if not isinstance(decoded, dict):
+        return False
+    return bool(decoded.get("error")) or any(isinstance(item, dict) and item.get("error") for item in decoded.values())
+
+
+def cache_from_config(mcp_cfg: dict[str, Any]) -> ResponseCache:
+    raw = mcp_cfg.get("cache", {})
+    enabled = bool(raw.get("enabled", True))
+    ttl = {k: float(v) for k, v in raw.get("ttl_seconds", {}).items()} if enabled else {}
+    default_ttl = ttl.pop("default", 0.0)
+    return ResponseCache(
+        ttl_seconds=ttl,
+        default_ttl=default_ttl,
+        max_entries=int(raw.get("max_entries", 2048)),
+        max_bytes=int(raw.get("max_bytes", 64 * 1024 * 1024)),
+        disk_path=raw.get("disk_path") if enabled else None,
+        disk_min_ttl=float(raw.get("disk_min_ttl_seconds", 60)),
+    )
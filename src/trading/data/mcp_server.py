@@ -1,14 +1,45 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import importlib
 import importlib.util
+import json
 import os
-from typing import Any
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
-
-from trading.config import load_config
-from trading.data.quota import QuotaManager
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from trading.config import AppConfig, load_config
+from trading.data.cache import ResponseCache, cache_from_config
+from trading.data.quota import QuotaManager, quota_from_config
+from trading.data.routing import ProviderRouter, router_from_config
+from trading.data.transport import HttpTransport, transport_from_config
+
+PROVIDER_CONFIG_KEYS = {
+    "YAHOO": "yahoo",
+    "STOOQ": "stooq",
+    "TWELVE_DATA": "twelvedata",
+    "FINNHUB": "finnhub",
+    "FMP": "fmp",
+    "ALPHA_VANTAGE": "alphavantage",
+    "FRED": "fred",
+    "GDELT": "gdelt",
+    "SEC_EDGAR": "sec_edgar",
+}
+
+_PROVIDER_ORIGINS = {
+    "YAHOO": "https://query1.finance.yahoo.com",
+    "STOOQ": "https://stooq.com",
+    "TWELVE_DATA": "https://api.twelvedata.com",
+    "FINNHUB": "https://finnhub.io",
+    "FMP": "https://financialmodelingprep.com",
+    "ALPHA_VANTAGE": "https://www.alphavantage.co",
+    "FRED": "https://api.stlouisfed.org",
+    "GDELT": "https://api.gdeltproject.org",
+    "SEC_EDGAR": "https://data.sec.gov",
+}
 
 
 class _FallbackMCP:
@@ -26,106 +57,315 @@ class _FallbackMCP:
         return
 
 
+_TOOLS: list[Callable[..., str]] = []
+
+
 def _build_mcp():
     if importlib.util.find_spec("fastmcp") is None:
-        return _FallbackMCP("MarketOracle")
-    fastmcp = importlib.import_module("fastmcp")
-    return fastmcp.FastMCP("MarketOracle")
+        server = _FallbackMCP("MarketOracle")
+    else:
+        fastmcp = importlib.import_module("fastmcp")
+        server = fastmcp.FastMCP("MarketOracle")
+    for tool in _TOOLS:
+        server.tool()(tool)
+    return server
 
 
-def _quota_limits_from_config() -> dict[str, int]:
-    cfg = load_config()
-    raw = cfg.mcp.get("quotas", {})
-    return {
-        "YAHOO": int(raw.get("yahoo", 100000)),
-        "STOOQ": int(raw.get("stooq", 100000)),
-        "TWELVE_DATA": int(raw.get("twelvedata", 800)),
-        "FINNHUB": int(raw.get("finnhub", 50000)),
-        "FMP": int(raw.get("fmp", 250)),
-        "ALPHA_VANTAGE": int(raw.get("alphavantage", 25)),
-        "FRED": int(raw.get("fred", 10000)),
-        "GDELT": int(raw.get("gdelt", 1000)),
-        "SEC_EDGAR": int(raw.get("sec_edgar", 10000)),
-    }
+_DEFAULT_DAILY_QUOTAS = {
+    "YAHOO": 100000,
+    "STOOQ": 100000,
+    "TWELVE_DATA": 800,
+    "FINNHUB": 50000,
+    "FMP": 250,
+    "ALPHA_VANTAGE": 25,
+    "FRED": 10000,
+    "GDELT": 1000,
+    "SEC_EDGAR": 10000,
+}
+
+
+# Module attributes built on first use (config parse, fastmcp import, connection pools),
+# so importing this module stays cheap. Tests may monkeypatch any of them.
+_LAZY_FACTORIES: dict[str, Callable[[], Any]] = {
+    "config": load_config,
+    "mcp": _build_mcp,
+    "quota": lambda: quota_from_config(_config().mcp, PROVIDER_CONFIG_KEYS, _DEFAULT_DAILY_QUOTAS),
+    "transport": lambda: transport_from_config(_config().mcp, PROVIDER_CONFIG_KEYS),
+    "response_cache": lambda: cache_from_config(_config().mcp),
+    "router": lambda: router_from_config(_config().mcp),
+}
+_lazy_lock = threading.RLock()
+
+
+def _lazy(name: str) -> Any:
+    module_globals = globals()
+    if name not in module_globals:
+        with _lazy_lock:
+            if name not in module_globals:
+                module_globals[name] = _LAZY_FACTORIES[name]()
+    return module_globals[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_FACTORIES:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _config() -> AppConfig:
+    return _lazy("config")
+
+
+def _quota() -> QuotaManager:
+    return _lazy("quota")
+
+
+def _router() -> ProviderRouter:
+    return _lazy("router")
+
+
+def _transport() -> HttpTransport:
+    return _lazy("transport")
+
 
+def _tool(fn: Callable[..., str]) -> Callable[..., str]:
+    """Register a MarketOracle tool; responses go through the shared response cache."""
 
-mcp = _build_mcp()
-quota = QuotaManager(limits=_quota_limits_from_config())
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> str:
+        cache: ResponseCache = _lazy("response_cache")
+        return cache.call(fn.__name__, fn, args, kwargs)
+
+    _TOOLS.append(wrapper)
+    return wrapper
+
+
+def warm_up(preconnect: bool = False) -> None:
+    """Build config, quota, cache, router, transport and the MCP server ahead of a trading window.
+
+    With ``preconnect`` each provider host also gets a HEAD request so its pooled
+    TCP+TLS connection is already open when the window starts.
+    """
+    for name in _LAZY_FACTORIES:
+        _lazy(name)
+    if preconnect:
+        transport = _transport()
+        with ThreadPoolExecutor(max_workers=len(_PROVIDER_ORIGINS)) as pool:
+            list(pool.map(lambda item: transport.preconnect(*item), _PROVIDER_ORIGINS.items()))
 
 
 def _quota_error(provider: str) -> str:
     return f"ERROR: {provider} QUOTA_EXCEEDED"
 
 
-def _get(url: str, params: dict[str, Any]) -> str:
-    query = urlencode(params)
-    req = Request(f"{url}?{query}", method="GET")
-    with urlopen(req, timeout=10) as response:
-        return response.read().decode("utf-8")
+def _get(provider: str, url: str, params: dict[str, Any]) -> str:
+    return _transport().get(provider, url, params)
+
+
+@dataclass(frozen=True)
+class _QuoteSource:
+    provider: str
+    url: str
+    batch_size: int
+    params: Callable[[list[str]], dict[str, Any]]
+    split: Callable[[Any, list[str]], dict[str, Any]]
+    # Inverse of ``split`` for one symbol: the body a single-symbol request would have returned.
+    join: Callable[[Any], Any] = lambda item: item
+
+
+def _split_yahoo(decoded: Any, symbols: list[str]) -> dict[str, Any]:
+    results = (decoded.get("quoteResponse") or {}).get("result") or []
+    return {str(item.get("symbol", "")).upper(): item for item in results if isinstance(item, dict)}
+
+
+def _split_stooq(decoded: Any, symbols: list[str]) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for item in decoded.get("symbols") or []:
+        name = str(item.get("symbol", "")).upper()
+        out[name.removesuffix(".US")] = item
+    return out
 
 
-@mcp.tool()
+def _split_twelve_data(decoded: Any, symbols: list[str]) -> dict[str, Any]:
+    if len(symbols) == 1:
+        decoded = {symbols[0].upper(): decoded}
+    return {
+        key.upper(): item
+        for key, item in decoded.items()
+        if isinstance(item, dict) and item.get("status") != "error"
+    }
+
+
+def _split_single(decoded: Any, symbols: list[str]) -> dict[str, Any]:
+    return {symbols[0].upper(): decoded}
+
+
+# Fallback chain shared by get_price and get_prices; batch sizes are per HTTP request.
+_QUOTE_SOURCES = [
+    _QuoteSource(
+        provider="YAHOO",
+        url="https://query1.finance.yahoo.com/v7/finance/quote",
+        batch_size=50,
+        params=lambda symbols: {"symbols": ",".join(symbols)},
+        split=_split_yahoo,
+        join=lambda item: {"quoteResponse": {"result": [item], "error": None}},
+    ),
+    _QuoteSource(
+        provider="STOOQ",
+        url="https://stooq.com/q/l/",
+        batch_size=20,
+        params=lambda symbols: {"s": " ".join(s.lower() for s in symbols), "f": "sd2t2ohlcv", "e": "json"},
+        split=_split_stooq,
+        join=lambda item: {"symbols": [item]},
+    ),
+    _QuoteSource(
+        provider="TWELVE_DATA",
+        url="https://api.twelvedata.com/quote",
+        batch_size=8,
+        params=lambda symbols: {"symbol": ",".join(symbols), "apikey": os.getenv("TWELVE_DATA_API_KEY", "")},
+        split=_split_twelve_data,
+    ),
+    _QuoteSource(
+        provider="FINNHUB",
+        url="https://finnhub.io/api/v1/quote",
+        batch_size=1,
+        params=lambda symbols: {"symbol": symbols[0], "token": os.getenv("FINNHUB_API_KEY", "")},
+        split=_split_single,
+    ),
+]
+
+
+_QUOTE_SOURCES_BY_PROVIDER = {source.provider: source for source in _QUOTE_SOURCES}
+
+
+def _chunks(items: list[str], size: int) -> list[list[str]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _request_quotes(source: _QuoteSource, symbols: list[str]) -> str | None:
+    if not _quota().check_and_consume(source.provider):
+        return None
+    return _get(source.provider, source.url, source.params(symbols))
+
+
+@_tool
 def get_price(symbol: str) -> str:
-    if quota.check_and_consume("YAHOO"):
-        return _get("https://query1.finance.yahoo.com/v7/finance/quote", {"symbols": symbol})
-    if quota.check_and_consume("STOOQ"):
-        return _get("https://stooq.com/q/l/", {"s": symbol.lower(), "f": "sd2t2ohlcv", "e": "json"})
-    if quota.check_and_consume("TWELVE_DATA"):
-        return _get("https://api.twelvedata.com/quote", {"symbol": symbol, "apikey": os.getenv("TWELVE_DATA_API_KEY", "")})
-    if quota.check_and_consume("FINNHUB"):
-        return _get("https://finnhub.io/api/v1/quote", {"symbol": symbol, "token": os.getenv("FINNHUB_API_KEY", "")})
-    return _quota_error("FINNHUB")
-
-
-@mcp.tool()
+    result = _router().route(
+        list(_QUOTE_SOURCES_BY_PROVIDER),
+        lambda provider: _request_quotes(_QUOTE_SOURCES_BY_PROVIDER[provider], [symbol]),
+        _quota(),
+    )
+    return result if result is not None else _quota_error("FINNHUB")
+
+
+@_tool
+def get_prices(symbols: list[str]) -> str:
+    """Batch quotes: one request per provider-sized chunk, falling through the get_price chain."""
+    import requests
+
+    router = _router()
+    pending = list(dict.fromkeys(s.upper() for s in symbols))
+    results: dict[str, Any] = {}
+    for provider in router.order(list(_QUOTE_SOURCES_BY_PROVIDER), _quota()):
+        if not pending:
+            break
+        source = _QUOTE_SOURCES_BY_PROVIDER[provider]
+        unresolved: list[str] = []
+        for chunk in _chunks(pending, source.batch_size):
+            try:
+                raw = router.timed(provider, lambda _p, chunk=chunk: _request_quotes(source, chunk))
+                by_symbol = source.split(json.loads(raw), chunk) if raw is not None else {}
+            except (requests.RequestException, ValueError, AttributeError):
+                by_symbol = {}
+            for symbol in chunk:
+                if symbol in by_symbol:
+                    results[symbol] = {"provider": provider, "data": by_symbol[symbol]}
+                else:
+                    unresolved.append(symbol)
+        pending = unresolved
+    for symbol in pending:
+        results[symbol] = {"error": "QUOTE_UNAVAILABLE"}
+    return json.dumps(results)
+
+
+def quote_payload(symbol: str, entry: dict[str, Any]) -> str:
+    """One ``get_prices`` element as the payload ``get_price(symbol)`` returns for the same quote."""
+    source = _QUOTE_SOURCES_BY_PROVIDER.get(entry.get("provider", ""))
+    if source is None or "data" not in entry:
+        return json.dumps({"error": entry.get("error", "QUOTE_UNAVAILABLE"), "provider_endpoint": "get_price", "symbol": symbol})
+    return json.dumps(source.join(entry["data"]))
+
+
+@_tool
 def finnhub_quote(symbol: str) -> str:
-    if not quota.check_and_consume("FINNHUB"):
+    if not _quota().check_and_consume("FINNHUB"):
         return _quota_error("FINNHUB")
-    return _get("https://finnhub.io/api/v1/quote", {"symbol": symbol, "token": os.getenv("FINNHUB_API_KEY", "")})
+    return _get("FINNHUB", "https://finnhub.io/api/v1/quote", {"symbol": symbol, "token": os.getenv("FINNHUB_API_KEY", "")})
 
 
-@mcp.tool()
+@_tool
 def fmp_quote(symbol: str) -> str:
-    if not quota.check_and_consume("FMP"):
+    if not _quota().check_and_consume("FMP"):
         return _quota_error("FMP")
-    return _get(f"https://financialmodelingprep.com/api/v3/quote/{symbol}", {"apikey": os.getenv("FMP_API_KEY", "")})
+    return _get("FMP", f"https://financialmodelingprep.com/api/v3/quote/{symbol}", {"apikey": os.getenv("FMP_API_KEY", "")})
 
 
-@mcp.tool()
+@_tool
 def twelve_data_series(symbol: str, interval: str = "1min") -> str:
-    if not quota.check_and_consume("TWELVE_DATA"):
+    if not _quota().check_and_consume("TWELVE_DATA"):
         return _quota_error("TWELVE_DATA")
-    return _get("https://api.twelvedata.com/time_series", {"symbol": symbol, "interval": interval, "apikey": os.getenv("TWELVE_DATA_API_KEY", "")})
+    return _get("TWELVE_DATA", "https://api.twelvedata.com/time_series", {"symbol": symbol, "interval": interval, "apikey": os.getenv("TWELVE_DATA_API_KEY", "")})
 
 
-@mcp.tool()
+@_tool
 def alpha_vantage_global_quote(symbol: str) -> str:
-    if not quota.check_and_consume("ALPHA_VANTAGE"):
+    if not _quota().check_and_consume("ALPHA_VANTAGE"):
         return _quota_error("ALPHA_VANTAGE")
-    return _get("https://www.alphavantage.co/query", {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": os.getenv("ALPHA_VANTAGE_API_KEY", "")})
+    return _get("ALPHA_VANTAGE", "https://www.alphavantage.co/query", {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": os.getenv("ALPHA_VANTAGE_API_KEY", "")})
 
 
-@mcp.tool()
+@_tool
 def fred_series(series_id: str = "GNP") -> str:
-    if not quota.check_and_consume("FRED"):
+    if not _quota().check_and_consume("FRED"):
         return _quota_error("FRED")
-    return _get("https://api.stlouisfed.org/fred/series", {"series_id": series_id, "api_key": os.getenv("FRED_API_KEY", ""), "file_type": "json"})
+    return _get("FRED", "https://api.stlouisfed.org/fred/series", {"series_id": series_id, "api_key": os.getenv("FRED_API_KEY", ""), "file_type": "json"})
 
 
-@mcp.tool()
+@_tool
 def gdelt_search(query: str = "AAPL") -> str:
-    if not quota.check_and_consume("GDELT"):
+    if not _quota().check_and_consume("GDELT"):
         return _quota_error("GDELT")
-    return _get("https://api.gdeltproject.org/api/v2/doc/doc", {"query": query, "mode": "ArtList", "format": "json", "maxrecords": 10})
+    return _get("GDELT", "https://api.gdeltproject.org/api/v2/doc/doc", {"query": query, "mode": "ArtList", "format": "json", "maxrecords": 10})
 
 
-@mcp.tool()
+@_tool
 def sec_edgar_submissions(cik: str) -> str:
-    if not quota.check_and_consume("SEC_EDGAR"):
+    if not _quota().check_and_consume("SEC_EDGAR"):
         return _quota_error("SEC_EDGAR")
     padded_cik = str(cik).zfill(10)
-    return _get(f"https://data.sec.gov/submissions/CIK{padded_cik}.json", {})
+    return _get("SEC_EDGAR", f"https://data.sec.gov/submissions/CIK{padded_cik}.json", {})
+
+
+def _async_variant(tool: Callable[..., str]) -> Callable[..., Awaitable[str]]:
+    @functools.wraps(tool)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        return await asyncio.to_thread(tool, *args, **kwargs)
+
+    wrapper.__name__ = f"{tool.__name__}_async"
+    wrapper.__qualname__ = wrapper.__name__
+    return wrapper
+
+
+get_price_async = _async_variant(get_price)
+get_prices_async = _async_variant(get_prices)
+finnhub_quote_async = _async_variant(finnhub_quote)
+fmp_quote_async = _async_variant(fmp_quote)
+twelve_data_series_async = _async_variant(twelve_data_series)
+alpha_vantage_global_quote_async = _async_variant(alpha_vantage_global_quote)
+fred_series_async = _async_variant(fred_series)
+gdelt_search_async = _async_variant(gdelt_search)
+sec_edgar_submissions_async = _async_variant(sec_edgar_submissions)
 
 
 def run() -> None:
-    mcp.run()
+    _lazy("mcp").run()
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Literal, Sequence
 
-from sqlalchemy import Select, desc, select
+from sqlalchemy import Select, desc, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from trading.config import AppConfig
+from trading.data.parquet_store import ParquetSnapshotStore, snapshot_store_from_config
+from trading.data.pit_index import SnapshotIndex
+from trading.data.quota import flush_quota_usage
+from trading.data.singleflight import SingleFlight
+from trading.data.snapshots import QuoteRecord, SnapshotCycle
+from trading.db.blob_store import BlobPointer, BlobStore, blob_store_from_config
 from trading.db.models import HistoricalSnapshot
+from trading.db.partitions import SnapshotArchive
 from trading.utils.time_provider import TimeProvider
 
 
@@ -19,6 +28,9 @@ class OracleQuery:
     symbol: str | None
     params: dict[str, Any]
 
+    def flight_key(self) -> tuple[str, str | None, str]:
+        return (self.provider_endpoint, self.symbol, json.dumps(self.params, sort_keys=True, default=str))
+
 
 class OracleClient:
     """Proxy layer that serves live MarketOracle responses or PIT snapshots in backtest mode."""
@@ -27,17 +39,147 @@ class OracleClient:
         self,
         config: AppConfig,
         time_provider: TimeProvider,
-        session_factory: async_sessionmaker[AsyncSession],
+        session_factory: async_sessionmaker[AsyncSession] | None,
     ) -> None:
         self.config = config
         self.time_provider = time_provider
         self.session_factory = session_factory
+        self.flights: SingleFlight[str] = SingleFlight()
+        self.snapshots = SnapshotCycle()
+        self.index: SnapshotIndex | None = None
+        self._index_lock = asyncio.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._blob_store: BlobStore | None = None
+        # None until first checked; False when no archived months exist.
+        self._archive: SnapshotArchive | Literal[False] | None = None
+        # Set when backtest.snapshot_source is "parquet": backtests then never touch the database.
+        self.snapshot_store: ParquetSnapshotStore | None = snapshot_store_from_config(config.backtest)
+
+    async def warm_up(self) -> None:
+        """Build the live data layer ahead of a trading window so the first fetch does not stall."""
+        if self.config.runtime.get("mode", "live") == "backtest":
+            return
+        from trading.data import mcp_server
+
+        await asyncio.to_thread(mcp_server.warm_up, bool(self.config.mcp.get("warm_up_preconnect", False)))
+
+    def begin_cycle(self) -> None:
+        """Drop parsed quotes from the previous decision cycle."""
+        self.snapshots.reset()
+
+    async def fetch_quote(self, query: OracleQuery) -> QuoteRecord | None:
+        """Fetch and parse a quote once per cycle; later calls for the symbol are served from memory."""
+        if query.symbol is not None:
+            cached = self.snapshots.get(query.symbol)
+            if cached is not None:
+                return cached
+        payload = await self.fetch(query)
+        records = self.snapshots.ingest(payload, query.symbol)
+        if query.symbol is None:
+            return records[0] if records else None
+        return self.snapshots.get(query.symbol)
 
-    async def fetch(self, query: OracleQuery) -> str:
+    async def fetch(self, query: OracleQuery, deadline: float | None = None) -> str:
+        """Fetch one query. In live mode ``deadline`` (seconds) overrides ``mcp.live_fetch.deadline_seconds``."""
         mode = self.config.runtime.get("mode", "live")
         if mode == "backtest":
-            return await self._fetch_backtest(query)
-        return self._fetch_live(query)
+            # PIT answers depend on the simulated clock, so the as-of time is part of the key.
+            key = (*query.flight_key(), self._as_of())
+            return await self.flights.do(key, lambda: self._fetch_backtest(query))
+        try:
+            # Timing out only abandons this waiter; the shared flight keeps running for others.
+            return await asyncio.wait_for(
+                self.flights.do(query.flight_key(), lambda: self._fetch_live_async(query)),
+                timeout=self._live_deadline(deadline),
+            )
+        except asyncio.TimeoutError:
+            return self._deadline_exceeded(query)
+
+    def close(self) -> None:
+        """Release the live fetch pool; in-flight provider calls finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _live_settings(self) -> dict[str, Any]:
+        return self.config.mcp.get("live_fetch", {})
+
+    def _live_deadline(self, deadline: float | None) -> float | None:
+        if deadline is None:
+            deadline = self._live_settings().get("deadline_seconds")
+        return float(deadline) if deadline is not None else None
+
+    @staticmethod
+    def _deadline_exceeded(query: OracleQuery) -> str:
+        return json.dumps({"error": "DEADLINE_EXCEEDED", "provider_endpoint": query.provider_endpoint, "symbol": query.symbol})
+
+    def _live_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            workers = int(self._live_settings().get("max_workers", 32))
+            self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="oracle-live")
+        return self._executor
+
+    async def fetch_many(self, queries: Sequence[OracleQuery], deadline: float | None = None) -> list[str]:
+        """Resolve several queries at once; results are in input order.
+
+        Backtest mode answers every symbol's as-of lookup with one SQL statement. Live mode
+        folds plain ``get_price`` queries into a single ``get_prices`` batch call and returns
+        each quote in the shape ``fetch`` gives for it; ``deadline`` applies as in ``fetch``.
+        """
+        if not queries:
+            return []
+        if self.config.runtime.get("mode", "live") == "backtest":
+            return await self._fetch_many_backtest(queries)
+        return await self._fetch_many_live(queries, deadline)
+
+    async def _fetch_many_live(self, queries: Sequence[OracleQuery], deadline: float | None) -> list[str]:
+        from trading.data import mcp_server
+
+        results: list[str] = [""] * len(queries)
+        # Only queries that get_price(symbol) would answer as-is can share the batch call.
+        batched = {
+            i: str(q.params.get("symbol", q.symbol)).upper()
+            for i, q in enumerate(queries)
+            if q.provider_endpoint == "get_price" and set(q.params) <= {"symbol"} and q.params.get("symbol", q.symbol)
+        }
+        others = [i for i in range(len(queries)) if i not in batched]
+
+        async def run_batch() -> None:
+            symbols = list(dict.fromkeys(batched.values()))
+            loop = asyncio.get_running_loop()
+            try:
+                raw = await asyncio.wait_for(
+                    loop.run_in_executor(self._live_executor(), mcp_server.get_prices, symbols),
+                    timeout=self._live_deadline(deadline),
+                )
+            except asyncio.TimeoutError:
+                for i in batched:
+                    results[i] = self._deadline_exceeded(queries[i])
+                return
+            await self._maybe_flush_quota()
+            decoded = json.loads(raw)
+            for i, symbol in batched.items():
+                # Same shape as fetch() for the query, so callers need not know which path served it.
+                results[i] = mcp_server.quote_payload(symbol, decoded.get(symbol, {"error": "QUOTE_UNAVAILABLE"}))
+
+        async def run_one(i: int) -> None:
+            results[i] = await self.fetch(queries[i], deadline)
+
+        await asyncio.gather(*([run_batch()] if batched else []), *(run_one(i) for i in others))
+        return results
+
+    async def _fetch_live_async(self, query: OracleQuery) -> str:
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(self._live_executor(), self._fetch_live, query)
+        await self._maybe_flush_quota()
+        return payload
+
+    async def _maybe_flush_quota(self) -> None:
+        from trading.data import mcp_server
+
+        batch_size = int(self.config.mcp.get("quota_flush_batch_size", 50))
+        if self.session_factory is not None and mcp_server.quota.pending_count() >= batch_size:
+            await flush_quota_usage(mcp_server.quota, self.session_factory)
 
     def _fetch_live(self, query: OracleQuery) -> str:
         from trading.data import mcp_server
@@ -51,10 +193,129 @@ class OracleClient:
         except TypeError:
             return str(tool())
 
-    async def _fetch_backtest(self, query: OracleQuery) -> str:
+    def _as_of(self) -> datetime:
         now = self.time_provider.now()
         if now.tzinfo is None:
             now = now.replace(tzinfo=timezone.utc)
+        return now
+
+    async def preload(self, start: datetime | None = None, end: datetime | None = None) -> SnapshotIndex:
+        """Bulk-load ``historical_snapshot`` rows for the backtest clock range into a ``SnapshotIndex``.
+
+        Rows published before ``start`` are streamed but only the latest per key is kept. With a
+        Parquet snapshot source the index is built from its files instead of the database.
+        """
+        bt = self.config.backtest
+        start = start or _parse_iso(bt.get("clock_start", "2025-01-06T08:00:00Z"))
+        end = end or _parse_iso(bt.get("clock_end", "2025-01-10T16:30:00Z"))
+        max_bytes = int(bt.get("preload_index", {}).get("max_bytes", 512 * 1024 * 1024))
+        if self.snapshot_store is not None:
+            self.index = await asyncio.to_thread(self.snapshot_store.load_index, start, end, max_bytes)
+            return self.index
+        index = SnapshotIndex(start=start, end=end, max_bytes=max_bytes)
+        statement = (
+            select(
+                HistoricalSnapshot.provider_endpoint,
+                HistoricalSnapshot.symbol,
+                HistoricalSnapshot.published_at,
+                HistoricalSnapshot.response_json,
+                HistoricalSnapshot.blob_ref,
+            )
+            .where(HistoricalSnapshot.published_at <= end)
+            .order_by(HistoricalSnapshot.provider_endpoint, HistoricalSnapshot.symbol, HistoricalSnapshot.published_at)
+        )
+        async with self.session_factory() as session:
+            result = await session.stream(statement)
+            async for endpoint, symbol, published_at, payload, blob_ref in result:
+                index.add(endpoint, symbol, published_at, _stored_payload(payload, blob_ref))
+        self.index = index.finish()
+        return self.index
+
+    async def _ensure_index(self) -> SnapshotIndex | None:
+        preload = self.config.backtest.get("preload_index", {}).get("enabled", False)
+        if self.index is None and (preload or self.snapshot_store is not None):
+            async with self._index_lock:
+                if self.index is None:
+                    await self.preload()
+        return self.index
+
+    async def _fetch_many_backtest(self, queries: Sequence[OracleQuery]) -> list[str]:
+        now = self._as_of()
+        index = await self._ensure_index()
+        results: list[str | None] = [None] * len(queries)
+        pending: dict[tuple[str, str], list[int]] = {}
+        unkeyed: list[int] = []
+        for i, query in enumerate(queries):
+            if index is not None and index.covers(query.provider_endpoint, query.symbol, now):
+                payload = index.lookup(query.provider_endpoint, query.symbol, now)
+                results[i] = await self._serve(query, now, payload)
+            elif query.symbol is None:
+                unkeyed.append(i)
+            else:
+                pending.setdefault((query.provider_endpoint, query.symbol), []).append(i)
+
+        if pending:
+            latest = await self._latest_payloads(list(pending), now)
+            for key, positions in pending.items():
+                for i in positions:
+                    payload = latest.get(key)
+                    results[i] = await self._serve(queries[i], now, payload)
+        if unkeyed:
+            payloads = await asyncio.gather(*(self._fetch_backtest(queries[i]) for i in unkeyed))
+            for i, payload in zip(unkeyed, payloads):
+                results[i] = payload
+        return [r if r is not None else self._missing(q, now) for r, q in zip(results, queries)]
+
+    async def _latest_payloads(self, keys: list[tuple[str, str]], now: datetime) -> dict[tuple[str, str], str | BlobPointer]:
+        """Latest row at or before ``now`` for every (endpoint, symbol) key, in one statement."""
+        if self.snapshot_store is not None:
+            found = await asyncio.gather(
+                *(asyncio.to_thread(self.snapshot_store.lookup, endpoint, symbol, now) for endpoint, symbol in keys)
+            )
+            return {key: payload for key, payload in zip(keys, found) if payload is not None}
+        # One ORDER BY published_at DESC LIMIT 1 branch per key, so each is a single backward
+        # seek on the PIT index instead of ranking the key's whole history.
+        latest = [
+            select(
+                HistoricalSnapshot.provider_endpoint,
+                HistoricalSnapshot.symbol,
+                HistoricalSnapshot.response_json,
+                HistoricalSnapshot.blob_ref,
+            )
+            .where(HistoricalSnapshot.provider_endpoint == endpoint)
+            .where(HistoricalSnapshot.symbol == symbol)
+            .where(HistoricalSnapshot.published_at <= now)
+            .order_by(desc(HistoricalSnapshot.published_at))
+            .limit(1)
+            .subquery()
+            for endpoint, symbol in keys
+        ]
+        statement = union_all(*(select(branch) for branch in latest))
+        async with self.session_factory() as session:
+            rows = (await session.execute(statement)).all()
+        return {(endpoint, symbol): _stored_payload(payload, blob_ref) for endpoint, symbol, payload, blob_ref in rows}
+
+    @staticmethod
+    def _missing(query: OracleQuery, now: datetime) -> str:
+        return json.dumps(
+            {
+                "error": "DATA_MISSING_AT_TIME",
+                "provider_endpoint": query.provider_endpoint,
+                "symbol": query.symbol,
+                "as_of": now.isoformat(),
+            }
+        )
+
+    async def _fetch_backtest(self, query: OracleQuery) -> str:
+        now = self._as_of()
+
+        index = await self._ensure_index()
+        if index is not None and index.covers(query.provider_endpoint, query.symbol, now):
+            payload = index.lookup(query.provider_endpoint, query.symbol, now)
+            return await self._serve(query, now, payload)
+        if self.snapshot_store is not None:
+            payload = await asyncio.to_thread(self.snapshot_store.lookup, query.provider_endpoint, query.symbol, now)
+            return await self._serve(query, now, payload)
 
         statement: Select[tuple[HistoricalSnapshot]] = (
             select(HistoricalSnapshot)
@@ -69,13 +330,36 @@ class OracleClient:
         async with self.session_factory() as session:
             row = (await session.execute(statement)).scalars().first()
 
-        if row is None:
-            return json.dumps(
-                {
-                    "error": "DATA_MISSING_AT_TIME",
-                    "provider_endpoint": query.provider_endpoint,
-                    "symbol": query.symbol,
-                    "as_of": now.isoformat(),
-                }
-            )
-        return row.response_json
+        return await self._serve(query, now, None if row is None else _stored_payload(row.response_json, row.blob_ref))
+
+    async def _serve(self, query: OracleQuery, now: datetime, payload: str | BlobPointer | None) -> str:
+        if payload is None:
+            payload = await self._archived(query, now)
+        return self._missing(query, now) if payload is None else await self._materialize(payload)
+
+    async def _archived(self, query: OracleQuery, now: datetime) -> str | BlobPointer | None:
+        """Fall back to the Parquet cold tier; archived months predate every row left in the database."""
+        if self._archive is None:
+            archive = SnapshotArchive(self.config.backtest.get("archive", {}).get("root", "data/archive"))
+            self._archive = archive if archive.months() else False
+        if not self._archive:
+            return None
+        return await asyncio.to_thread(self._archive.lookup, query.provider_endpoint, query.symbol, now)
+
+    async def _materialize(self, payload: str | BlobPointer) -> str:
+        if isinstance(payload, str):
+            return payload
+        if self._blob_store is None:
+            self._blob_store = blob_store_from_config(self.config.backtest)
+        return await asyncio.to_thread(self._blob_store.get, payload.content_hash)
+
+
+def _stored_payload(response_json: str, blob_ref: str | None) -> str | BlobPointer:
+    return BlobPointer(blob_ref) if blob_ref else response_json
+
+
+def _parse_iso(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from trading.data.pit_index import SnapshotIndex
+from trading.db.blob_store import BlobPointer, BlobStore
+from trading.db.models import HistoricalSnapshot
+from trading.db.partitions import ArchiveWriter, read_latest, require_pyarrow
+
+_MANIFEST = "manifest.json"
+_INDEX_COLUMNS = ["symbol", "published_at", "response_json", "blob_ref"]
+
+
+class ParquetSnapshotStore:
+    """``historical_snapshot`` rows exported to one Parquet file per provider endpoint.
+
+    Lets a backtest serve PIT lookups with no database: files are read memory-mapped into a
+    ``SnapshotIndex``, and keys that did not fit in the index are answered by a filtered read
+    of the endpoint's file. Rows are written sorted by (symbol, published_at).
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path_for(self, endpoint: str) -> Path:
+        return self.root / f"{endpoint}.parquet"
+
+    def endpoints(self) -> list[str]:
+        manifest = self.manifest()
+        if manifest is not None:
+            return sorted(manifest["endpoints"])
+        return sorted(path.stem for path in self.root.glob("*.parquet"))
+
+    def manifest(self) -> dict[str, Any] | None:
+        path = self.root / _MANIFEST
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+    def load_index(self, start: datetime, end: datetime, max_bytes: int = 512 * 1024 * 1024) -> SnapshotIndex:
+        pa = require_pyarrow()
+        index = SnapshotIndex(start=start, end=end, max_bytes=max_bytes)
+        cutoff = end.astimezone(timezone.utc).replace(tzinfo=None) if end.tzinfo is not None else end
+        for endpoint in self.endpoints():
+            table = pa.parquet.read_table(
+                self.path_for(endpoint), columns=_INDEX_COLUMNS, filters=[("published_at", "<=", cutoff)], memory_map=True
+            ).sort_by([("symbol", "ascending"), ("published_at", "ascending")])
+            columns = [table.column(name).to_pylist() for name in _INDEX_COLUMNS]
+            for symbol, published_at, payload, blob_ref in zip(*columns):
+                index.add(endpoint, symbol, published_at, BlobPointer(blob_ref) if blob_ref else payload)
+        return index.finish()
+
+    def lookup(self, endpoint: str, symbol: str | None, as_of: datetime) -> str | BlobPointer | None:
+        path = self.path_for(endpoint)
+        return read_latest(path, endpoint, symbol, as_of) if path.exists() else None
+
+
+async def export_snapshots(
+    session_factory: async_sessionmaker[AsyncSession],
+    store: ParquetSnapshotStore,
+    run_id: str | None = None,
+    blob_store: BlobStore | None = None,
+    batch_size: int = 50_000,
+) -> dict[str, int]:
+    """Write ``historical_snapshot`` rows (optionally one run's) into ``store``; returns rows per endpoint.
+
+    With ``blob_store`` given, blob-backed payloads are inlined so the export is self-contained.
+    Files for endpoints absent from this export are removed.
+    """
+    columns = [getattr(HistoricalSnapshot, name) for name in HistoricalSnapshot.__table__.columns.keys()]
+    statement = select(*columns).order_by(
+        HistoricalSnapshot.provider_endpoint, HistoricalSnapshot.symbol, HistoricalSnapshot.published_at
+    )
+    if run_id is not None:
+        statement = statement.where(HistoricalSnapshot.run_id == run_id)
+
+    counts: dict[str, int] = {}
+    writer: ArchiveWriter | None = None
+    current: str | None = None
+    try:
+        async with session_factory() as session:
+            result = await session.stream(statement)
+            async for batch in result.mappings().partitions(batch_size):
+                rows = [dict(row) for row in batch]
+                if blob_store is not None:
+                    for row in rows:
+                        if row["blob_ref"]:
+                            row["response_json"], row["blob_ref"] = blob_store.get(row["blob_ref"]), None
+                for endpoint, group in groupby(rows, key=itemgetter("provider_endpoint")):
+                    if endpoint != current:
+                        if writer is not None:
+                            counts[current] = writer.commit()
+                        current, writer = endpoint, ArchiveWriter(store.path_for(endpoint))
+                    writer.write(list(group))
+        if writer is not None:
+            counts[current] = writer.commit()
+            writer = None
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    for path in store.root.glob("*.parquet"):
+        if path.stem not in counts:
+            path.unlink()
+    store.root.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "run_id": run_id,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "endpoints": counts,
+        "inlined_blobs": blob_store is not None,
+    }
+    (store.root / _MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return counts
+
+
+def snapshot_store_from_config(backtest_cfg: dict[str, Any]) -> ParquetSnapshotStore | None:
+    """The Parquet store when ``backtest.snapshot_source`` is ``parquet``, else None (Postgres)."""
+    if backtest_cfg.get("snapshot_source", "postgres") != "parquet":
+        return None
+    return ParquetSnapshotStore(backtest_cfg.get("snapshot_parquet", {}).get("root", "data/snapshots"))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from trading.db.blob_store import BlobPointer
+
+# Key used for queries without a symbol: the SQL path matches any symbol for the endpoint.
+ANY_SYMBOL = "*"
+# Held in place of blob-backed payloads; the caller decompresses on lookup.
+_POINTER_BYTES = 64
+
+
+def epoch(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@dataclass
+class _Series:
+    published: array = field(default_factory=lambda: array("d"))
+    offsets: array = field(default_factory=lambda: array("q"))
+
+
+class SnapshotIndex:
+    """Point-in-time index over ``historical_snapshot`` rows held in memory.
+
+    Rows are grouped per (provider_endpoint, symbol) into sorted ``published_at`` arrays
+    with offsets into one shared payload list, so an as-of lookup is a bisect. Blob-backed rows
+    are held as ``BlobPointer`` and only decompressed by the caller when served. Rows must be
+    added in (endpoint, symbol, published_at) order. Loading stops once ``max_bytes`` of
+    payload is held; keys that did not fit, and as-of times outside ``start``..``end``, report
+    ``covers() == False`` so callers fall back to SQL.
+    """
+
+    def __init__(self, *, start: datetime, end: datetime, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.start = epoch(start)
+        self.end = epoch(end)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.truncated = False
+        self._payloads: list[str | BlobPointer] = []
+        self._series: dict[tuple[str, str | None], _Series] = {}
+        self._current: tuple[str, str | None] | None = None
+        self._pending: list[tuple[float, str | BlobPointer]] = []
+        self._incomplete_endpoints: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def add(self, endpoint: str, symbol: str | None, published_at: datetime, payload: str | BlobPointer) -> None:
+        key = (endpoint, symbol)
+        if key != self._current:
+            self._flush()
+            self._current = key
+        ts = epoch(published_at)
+        if ts > self.end:
+            return
+        if ts <= self.start and self._pending and self._pending[-1][0] <= self.start:
+            # Only the latest row at or before the window start can ever be served.
+            self._pending[-1] = (ts, payload)
+        else:
+            self._pending.append((ts, payload))
+
+    def finish(self) -> SnapshotIndex:
+        self._flush()
+        self._current = None
+        by_endpoint: dict[str, list[tuple[str, str | None]]] = {}
+        for endpoint, symbol in self._series:
+            by_endpoint.setdefault(endpoint, []).append((endpoint, symbol))
+        for endpoint, keys in by_endpoint.items():
+            if endpoint in self._incomplete_endpoints:
+                continue
+            rows = sorted(
+                (ts, offset)
+                for key in keys
+                for ts, offset in zip(self._series[key].published, self._series[key].offsets)
+            )
+            merged = _Series()
+            merged.published.extend(ts for ts, _ in rows)
+            merged.offsets.extend(offset for _, offset in rows)
+            self._series[(endpoint, ANY_SYMBOL)] = merged
+        return self
+
+    def _flush(self) -> None:
+        if self._current is None or not self._pending:
+            return
+        size = sum(len(payload) if isinstance(payload, str) else _POINTER_BYTES for _, payload in self._pending)
+        if self.truncated or self.bytes + size > self.max_bytes:
+            self.truncated = True
+            self._incomplete_endpoints.add(self._current[0])
+            self._pending = []
+            return
+        series = self._series.setdefault(self._current, _Series())
+        for ts, payload in self._pending:
+            series.published.append(ts)
+            series.offsets.append(len(self._payloads))
+            self._payloads.append(payload)
+        self.bytes += size
+        self._pending = []
+
+    def covers(self, endpoint: str, symbol: str | None, as_of: datetime) -> bool:
+        ts = epoch(as_of)
+        # Before the window start only the latest pre-start row is held, so earlier rows are unknown.
+        if ts < self.start or ts > self.end:
+            return False
+        key = (endpoint, ANY_SYMBOL if symbol is None else symbol)
+        if key in self._series:
+            return True
+        # A key absent from a complete load simply has no rows in range.
+        return not self.truncated
+
+    def lookup(self, endpoint: str, symbol: str | None, as_of: datetime) -> str | BlobPointer | None:
+        series = self._series.get((endpoint, ANY_SYMBOL if symbol is None else symbol))
+        if series is None:
+            return None
+        idx = bisect_right(series.published, epoch(as_of))
+        if idx == 0:
+            return None
+        return self._payloads[series.offsets[idx - 1]]
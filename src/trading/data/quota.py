@@ -1,19 +1,262 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from dataclasses import dataclass, field
+import contextlib
+import os
+import struct
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+WINDOW_SECONDS = {"minute": 60, "day": 86400}
+
+
+@dataclass(frozen=True)
+class QuotaWindow:
+    name: str
+    seconds: int
+    limit: int
+
+
+def _roll(counter: tuple[int, int, int], now: float, seconds: int) -> tuple[tuple[int, int, int], float]:
+    """Sliding-window counter: weight the previous fixed window by how much of it still overlaps."""
+    start, curr, prev = counter
+    window_start = int(now // seconds) * seconds
+    if window_start != start:
+        prev = curr if window_start - start == seconds else 0
+        curr = 0
+        start = window_start
+    weight = 1.0 - (now - start) / seconds
+    return (start, curr, prev), prev * weight + curr
+
+
+class MemoryQuotaState:
+    """Process-local counters."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, tuple[int, int, int]] = {}
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        yield
+
+    def read(self, name: str) -> tuple[int, int, int]:
+        return self._counters.get(name, (0, 0, 0))
+
+    def write(self, name: str, counter: tuple[int, int, int]) -> None:
+        self._counters[name] = counter
+
+
+class FileQuotaState:
+    """Counters in a memory-mapped file guarded by ``flock`` so several processes share one budget.
+
+    Each record is a fixed-size slot (name, window start, current count, previous count);
+    slots are claimed on first use and never move, so lookups are cached per process.
+    """
+
+    _RECORD = struct.Struct("<48sqqq")
+    _MAX_RECORDS = 512
+
+    def __init__(self, path: str | Path) -> None:
+        import fcntl
+        import mmap
+
+        self._fcntl = fcntl
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = self._RECORD.size * self._MAX_RECORDS
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+        self._slots: dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def _slot(self, name: str) -> int:
+        slot = self._slots.get(name)
+        if slot is not None:
+            return slot
+        encoded = name.encode("utf-8")[:48].ljust(48, b"\0")
+        for idx in range(self._MAX_RECORDS):
+            raw_name, *_ = self._RECORD.unpack_from(self._mm, idx * self._RECORD.size)
+            if raw_name == encoded:
+                break
+            if raw_name == b"\0" * 48:
+                self._RECORD.pack_into(self._mm, idx * self._RECORD.size, encoded, 0, 0, 0)
+                break
+        else:
+            raise RuntimeError(f"quota state file {self.path} is full")
+        self._slots[name] = idx
+        return idx
+
+    def read(self, name: str) -> tuple[int, int, int]:
+        _, start, curr, prev = self._RECORD.unpack_from(self._mm, self._slot(name) * self._RECORD.size)
+        return start, curr, prev
+
+    def write(self, name: str, counter: tuple[int, int, int]) -> None:
+        encoded = name.encode("utf-8")[:48].ljust(48, b"\0")
+        self._RECORD.pack_into(self._mm, self._slot(name) * self._RECORD.size, encoded, *counter)
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
+
+
+class _UsageView(MutableMapping):
+    """Dict-style view of the per-day usage of each provider."""
+
+    def __init__(self, manager: QuotaManager) -> None:
+        self._manager = manager
+
+    def __getitem__(self, provider: str) -> int:
+        return round(self._manager.used(provider, "day"))
+
+    def __setitem__(self, provider: str, value: int) -> None:
+        self._manager.set_used(provider, "day", int(value))
+
+    def __delitem__(self, provider: str) -> None:
+        self._manager.set_used(provider, "day", 0)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._manager.limits)
+
+    def __len__(self) -> int:
+        return len(self._manager.limits)
 
 
-@dataclass
 class QuotaManager:
-    limits: dict[str, int]
-    usage: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    """Sliding-window quota engine with per-minute and per-day limits.
+
+    ``limits`` are the per-day budgets and ``per_minute`` the optional per-minute
+    budgets. Check-and-consume is atomic across threads (and across processes when
+    the state is a ``FileQuotaState``). Consumption is also tallied in memory so it
+    can be flushed to ``quota_usage`` in batches.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        per_minute: dict[str, int] | None = None,
+        state: MemoryQuotaState | FileQuotaState | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.limits = limits
+        self.per_minute = per_minute or {}
+        self.state = state or MemoryQuotaState()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending: Counter[str] = Counter()
+
+    @property
+    def usage(self) -> _UsageView:
+        return _UsageView(self)
+
+    def windows_for(self, provider: str) -> list[QuotaWindow]:
+        windows = []
+        if provider in self.per_minute:
+            windows.append(QuotaWindow("minute", WINDOW_SECONDS["minute"], int(self.per_minute[provider])))
+        if provider in self.limits:
+            windows.append(QuotaWindow("day", WINDOW_SECONDS["day"], int(self.limits[provider])))
+        return windows
 
-    def check_and_consume(self, provider: str) -> bool:
-        limit = self.limits.get(provider)
-        if limit is None:
+    def check_and_consume(self, provider: str, n: int = 1) -> bool:
+        windows = self.windows_for(provider)
+        if not windows:
             return True
-        if self.usage[provider] >= limit:
-            return False
-        self.usage[provider] += 1
+        now = self.clock()
+        with self._lock, self.state.locked():
+            rolled = []
+            for window in windows:
+                name = f"{provider}:{window.name}"
+                counter, used = _roll(self.state.read(name), now, window.seconds)
+                if used + n > window.limit:
+                    return False
+                rolled.append((name, counter))
+            for name, (start, curr, prev) in rolled:
+                self.state.write(name, (start, curr + n, prev))
+            self._pending[provider] += n
         return True
+
+    def used(self, provider: str, window_name: str) -> float:
+        with self._lock, self.state.locked():
+            _, used = _roll(self.state.read(f"{provider}:{window_name}"), self.clock(), WINDOW_SECONDS[window_name])
+        return used
+
+    def set_used(self, provider: str, window_name: str, value: int) -> None:
+        seconds = WINDOW_SECONDS[window_name]
+        start = int(self.clock() // seconds) * seconds
+        with self._lock, self.state.locked():
+            self.state.write(f"{provider}:{window_name}", (start, value, 0))
+
+    def remaining(self, provider: str) -> float | None:
+        windows = self.windows_for(provider)
+        if not windows:
+            return None
+        return min(max(w.limit - self.used(provider, w.name), 0.0) for w in windows)
+
+    def pressure(self, provider: str) -> float:
+        windows = self.windows_for(provider)
+        if not windows:
+            return 0.0
+        return max(self.used(provider, w.name) / w.limit if w.limit else 1.0 for w in windows)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(self._pending.values())
+
+    def drain_pending(self) -> dict[str, int]:
+        with self._lock:
+            pending = dict(self._pending)
+            self._pending.clear()
+        return pending
+
+
+async def flush_quota_usage(quota: QuotaManager, session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Write one ``quota_usage`` row per (provider, window) touched since the last flush."""
+    from trading.db.models import QuotaUsage
+
+    pending = quota.drain_pending()
+    rows = []
+    for provider in pending:
+        for window in quota.windows_for(provider):
+            used = quota.used(provider, window.name)
+            rows.append(
+                QuotaUsage(
+                    id=str(uuid.uuid4()),
+                    provider=provider,
+                    window_type=window.name,
+                    used_count=used,
+                    remaining_count=max(window.limit - used, 0.0),
+                )
+            )
+    if not rows:
+        return 0
+    async with session_factory() as session:
+        session.add_all(rows)
+        await session.commit()
+    return len(rows)
+
+
+def quota_from_config(mcp_cfg: dict[str, Any], provider_keys: dict[str, str], daily_defaults: dict[str, int]) -> QuotaManager:
+    daily = mcp_cfg.get("quotas", {})
+    minute = mcp_cfg.get("quotas_per_minute", {})
+    state_path = mcp_cfg.get("quota_state_path")
+    return QuotaManager(
+        limits={p: int(daily.get(key, daily_defaults[p])) for p, key in provider_keys.items()},
+        per_minute={p: int(minute[key]) for p, key in provider_keys.items() if key in minute},
+        state=FileQuotaState(state_path) if state_path else MemoryQuotaState(),
+    )
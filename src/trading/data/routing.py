@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from trading.data.quota import QuotaManager
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int = 5
+    cooldown_seconds: float = 30.0
+    state: str = "closed"
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    # Start time of the single half-open probe; None when no probe is in flight.
+    probe_started: float | None = None
+
+    def available(self, now: float) -> bool:
+        """Whether the provider may be ranked at all; moves an open breaker to half-open after the cooldown."""
+        if self.state == "open" and now - self.opened_at >= self.cooldown_seconds:
+            self.state = "half_open"
+        return self.state != "open"
+
+    def allow(self, now: float) -> bool:
+        """Claim a call: closed lets everything through; half-open admits one probe until it reports back.
+
+        A probe that never reports (hung or abandoned) frees its slot after another cooldown.
+        """
+        if not self.available(now):
+            return False
+        if self.state == "closed":
+            return True
+        if self.probe_started is not None and now - self.probe_started < self.cooldown_seconds:
+            return False
+        self.probe_started = now
+        return True
+
+    def release(self) -> None:
+        """Give back a claimed probe slot without an outcome (the call was skipped)."""
+        self.probe_started = None
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.probe_started = None
+
+    def record_failure(self, now: float) -> bool:
+        """Returns True when this failure opened the breaker."""
+        self.consecutive_failures += 1
+        self.probe_started = None
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            opened = self.state != "open"
+            self.state = "open"
+            self.opened_at = now
+            return opened
+        return False
+
+
+@dataclass
+class ProviderHealth:
+    window: int = 100
+    latencies: deque[float] = field(default_factory=deque)
+    outcomes: deque[bool] = field(default_factory=deque)
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.outcomes.append(ok)
+        while len(self.latencies) > self.window:
+            self.latencies.popleft()
+            self.outcomes.popleft()
+
+    def quantile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+
+class ProviderRouter:
+    """Orders providers by observed health and quota, with circuit breakers and optional hedging.
+
+    A provider's cost estimate is its p95 latency (``prior_latency_seconds`` until it has
+    samples), inflated by its error rate and quota pressure. Providers whose breaker is open
+    are skipped until the cooldown elapses; quota-exhausted providers go last. With hedging
+    enabled, the next provider is started once the in-flight one exceeds its own p95.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        window: int = 100,
+        prior_latency_seconds: float = 1.0,
+        hedge_enabled: bool = False,
+        hedge_min_samples: int = 20,
+        hedge_min_delay_seconds: float = 0.25,
+        max_workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.window = window
+        self.prior_latency_seconds = prior_latency_seconds
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.max_workers = max_workers
+        self.clock = clock
+        self.decisions: Counter[str] = Counter()
+        self._health: dict[str, ProviderHealth] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _health_for(self, provider: str) -> ProviderHealth:
+        if provider not in self._health:
+            self._health[provider] = ProviderHealth(window=self.window)
+        return self._health[provider]
+
+    def _breaker_for(self, provider: str) -> CircuitBreaker:
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.cooldown_seconds)
+        return self._breakers[provider]
+
+    def record(self, provider: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._health_for(provider).record(latency, ok)
+            breaker = self._breaker_for(provider)
+            if ok:
+                breaker.record_success()
+            elif breaker.record_failure(self.clock()):
+                self.decisions[f"breaker_open:{provider}"] += 1
+
+    def order(self, candidates: list[str], quota: QuotaManager | None = None) -> list[str]:
+        now = self.clock()
+        ranked = []
+        with self._lock:
+            for idx, provider in enumerate(candidates):
+                if not self._breaker_for(provider).available(now):
+                    self.decisions[f"skipped_open:{provider}"] += 1
+                    continue
+                health = self._health_for(provider)
+                p95 = health.quantile(0.95)
+                latency = self.prior_latency_seconds if p95 is None else p95
+                pressure = quota.pressure(provider) if quota is not None else 0.0
+                exhausted = quota is not None and quota.remaining(provider) == 0
+                score = latency * (1.0 + 4.0 * health.error_rate()) * (1.0 + pressure)
+                ranked.append((exhausted, score, idx, provider))
+        ordered = [provider for *_, provider in sorted(ranked)]
+        if ordered:
+            self.decisions[f"primary:{ordered[0]}"] += 1
+        return ordered
+
+    def hedge_delay(self, provider: str) -> float | None:
+        if not self.hedge_enabled:
+            return None
+        with self._lock:
+            health = self._health_for(provider)
+            if len(health.latencies) < self.hedge_min_samples:
+                return None
+            p95 = health.quantile(0.95)
+        return max(p95 or 0.0, self.hedge_min_delay_seconds)
+
+    def timed(self, provider: str, call: Callable[[str], Any]) -> Any:
+        """Run ``call(provider)``, recording latency and outcome; ``None`` means skipped.
+
+        The breaker is claimed here, right before the call: a half-open provider gets one probe,
+        and further calls while it is in flight are skipped without reaching the provider. A
+        call that skips (no quota) hands the probe slot back.
+        """
+        with self._lock:
+            if not self._breaker_for(provider).allow(self.clock()):
+                self.decisions[f"skipped_probe:{provider}"] += 1
+                return None
+        started = self.clock()
+        try:
+            result = call(provider)
+        except Exception:
+            self.record(provider, self.clock() - started, ok=False)
+            raise
+        if result is None:
+            with self._lock:
+                self._breaker_for(provider).release()
+        else:
+            self.record(provider, self.clock() - started, ok=True)
+        return result
+
+    def route(self, candidates: list[str], call: Callable[[str], str | None], quota: QuotaManager | None = None) -> str | None:
+        """Try providers in health order until one returns a result.
+
+        Returns ``None`` when every provider was skipped; re-raises the last error when
+        every attempted provider failed.
+        """
+        ordered = self.order(candidates, quota)
+        if not self.hedge_enabled:
+            last_exc: Exception | None = None
+            for provider in ordered:
+                try:
+                    result = self.timed(provider, call)
+                except Exception as exc:
+                    last_exc = exc
+                    self.decisions["fallthrough"] += 1
+                    continue
+                if result is not None:
+                    return result
+            if last_exc is not None:
+                raise last_exc
+            return None
+        return self._route_hedged(ordered, call)
+
+    def _route_hedged(self, ordered: list[str], call: Callable[[str], str | None]) -> str | None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="oracle-hedge")
+        pending: dict[Future, tuple[str, bool]] = {}
+        queue = list(ordered)
+        last_exc: Exception | None = None
+        hedged = False
+        while queue or pending:
+            if not pending:
+                provider = queue.pop(0)
+                pending[self._executor.submit(self.timed, provider, call)] = (provider, False)
+                continue
+            delay = None
+            if queue and not hedged:
+                primary = next(p for p, is_hedge in pending.values() if not is_hedge)
+                delay = self.hedge_delay(primary)
+            done, _ = wait(list(pending), timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                provider = queue.pop(0)
+                self.decisions["hedge_fired"] += 1
+                pending[self._executor.submit(self.timed, provider, call)] = (provider, True)
+                continue
+            for future in done:
+                provider, is_hedge = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    last_exc = exc
+                    self.decisions["fallthrough"] += 1
+                    continue
+                if result is not None:
+                    if is_hedge:
+                        self.decisions["hedge_won"] += 1
+                    return result
+        if last_exc is not None:
+            raise last_exc
+        return None
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            providers = {
+                name: {
+                    "samples": len(health.latencies),
+                    "p50": health.quantile(0.5),
+                    "p95": health.quantile(0.95),
+                    "error_rate": health.error_rate(),
+                    "breaker": self._breaker_for(name).state,
+                }
+                for name, health in self._health.items()
+            }
+            return {"providers": providers, "decisions": dict(self.decisions)}
+
+
+def router_from_config(mcp_cfg: dict[str, Any]) -> ProviderRouter:
+    raw = mcp_cfg.get("routing", {})
+    hedge = raw.get("hedge", {})
+    return ProviderRouter(
+        failure_threshold=int(raw.get("failure_threshold", 5)),
+        cooldown_seconds=float(raw.get("cooldown_seconds", 30)),
+        window=int(raw.get("window", 100)),
+        prior_latency_seconds=float(raw.get("prior_latency_seconds", 1.0)),
+        hedge_enabled=bool(hedge.get("enabled", False)),
+        hedge_min_samples=int(hedge.get("min_samples", 20)),
+        hedge_min_delay_seconds=float(hedge.get("min_delay_seconds", 0.25)),
+        max_workers=int(hedge.get("max_workers", 8)),
+    )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.calls - self.executions
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key onto one in-flight task.
+
+    The shared task is shielded, so a caller being cancelled does not cancel the
+    fetch for the other waiters.
+    """
+
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._inflight: dict[Hashable, asyncio.Task[T]] = {}
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.stats.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        return await asyncio.shield(task)
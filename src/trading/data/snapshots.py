@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from trading.db.models import MarketSnapshot
+
+NAN = float("nan")
+
+
+@dataclass(slots=True)
+class QuoteRecord:
+    """One normalized quote; missing fields are NaN rather than None so the layout stays all-float."""
+
+    symbol: str
+    provider: str
+    bid: float
+    ask: float
+    last: float
+    timestamp: float
+    mid: float = NAN
+    spread: float = NAN
+
+    def __post_init__(self) -> None:
+        if self.bid > 0 and self.ask > 0:
+            self.mid = (self.bid + self.ask) / 2.0
+            self.spread = self.ask - self.bid
+        else:
+            self.mid = self.last
+
+    def to_market_snapshot(self, snapshot_id: str | None = None) -> MarketSnapshot:
+        from trading.db.models import MarketSnapshot
+
+        return MarketSnapshot(
+            id=snapshot_id or str(uuid.uuid4()),
+            symbol=self.symbol,
+            bid=self.bid,
+            ask=self.ask,
+            mid=self.mid,
+            spread=self.spread,
+            last=self.last,
+        )
+
+
+def _num(value: Any) -> float:
+    try:
+        out = float(value)
+    except (TypeError, ValueError):
+        return NAN
+    return out if math.isfinite(out) else NAN
+
+
+def _date_ts(date: Any, time: Any = "00:00:00") -> float:
+    try:
+        parsed = datetime.fromisoformat(f"{date}T{time or '00:00:00'}")
+    except (TypeError, ValueError):
+        return NAN
+    return parsed.replace(tzinfo=parsed.tzinfo or timezone.utc).timestamp()
+
+
+def _yahoo(item: dict[str, Any], symbol: str | None) -> QuoteRecord:
+    return QuoteRecord(
+        symbol=str(item.get("symbol") or symbol or "").upper(),
+        provider="YAHOO",
+        bid=_num(item.get("bid")),
+        ask=_num(item.get("ask")),
+        last=_num(item.get("regularMarketPrice")),
+        timestamp=_num(item.get("regularMarketTime")),
+    )
+
+
+def _stooq(item: dict[str, Any], symbol: str | None) -> QuoteRecord:
+    return QuoteRecord(
+        symbol=str(item.get("symbol") or symbol or "").upper().removesuffix(".US"),
+        provider="STOOQ",
+        bid=NAN,
+        ask=NAN,
+        last=_num(item.get("close")),
+        timestamp=_date_ts(item.get("date"), item.get("time")),
+    )
+
+
+def _twelve_data(item: dict[str, Any], symbol: str | None) -> QuoteRecord:
+    return QuoteRecord(
+        symbol=str(item.get("symbol") or symbol or "").upper(),
+        provider="TWELVE_DATA",
+        bid=NAN,
+        ask=NAN,
+        last=_num(item.get("close")),
+        timestamp=_num(item.get("timestamp")),
+    )
+
+
+def _finnhub(item: dict[str, Any], symbol: str | None) -> QuoteRecord:
+    return QuoteRecord(
+        symbol=(symbol or "").upper(),
+        provider="FINNHUB",
+        bid=NAN,
+        ask=NAN,
+        last=_num(item.get("c")),
+        timestamp=_num(item.get("t")),
+    )
+
+
+def _fmp(item: dict[str, Any], symbol: str | None) -> QuoteRecord:
+    return QuoteRecord(
+        symbol=str(item.get("symbol") or symbol or "").upper(),
+        provider="FMP",
+        bid=NAN,
+        ask=NAN,
+        last=_num(item.get("price")),
+        timestamp=_num(item.get("timestamp")),
+    )
+
+
+def _alpha_vantage(item: dict[str, Any], symbol: str | None) -> QuoteRecord:
+    return QuoteRecord(
+        symbol=str(item.get("01. symbol") or symbol or "").upper(),
+        provider="ALPHA_VANTAGE",
+        bid=NAN,
+        ask=NAN,
+        last=_num(item.get("05. price")),
+        timestamp=_date_ts(item.get("07. latest trading day")),
+    )
+
+
+_ITEM_PARSERS: dict[str, Callable[[dict[str, Any], str | None], QuoteRecord]] = {
+    "YAHOO": _yahoo,
+    "STOOQ": _stooq,
+    "TWELVE_DATA": _twelve_data,
+    "FINNHUB": _finnhub,
+    "FMP": _fmp,
+    "ALPHA_VANTAGE": _alpha_vantage,
+}
+
+
+def parse_quotes(payload: str | Any, symbol: str | None = None) -> list[QuoteRecord]:
+    """Decode any MarketOracle quote payload (single provider or ``get_prices``) into records.
+
+    Unrecognized or error payloads yield an empty list.
+    """
+    try:
+        decoded = json.loads(payload) if isinstance(payload, (str, bytes)) else payload
+    except ValueError:
+        return []
+    if isinstance(decoded, list):
+        return [_fmp(item, symbol) for item in decoded if isinstance(item, dict)]
+    if not isinstance(decoded, dict):
+        return []
+    if "quoteResponse" in decoded:
+        return [_yahoo(item, symbol) for item in (decoded["quoteResponse"] or {}).get("result") or []]
+    if "symbols" in decoded:
+        return [_stooq(item, symbol) for item in decoded["symbols"] or []]
+    if "Global Quote" in decoded:
+        return [_alpha_vantage(decoded["Global Quote"], symbol)]
+    if "c" in decoded and "t" in decoded:
+        return [_finnhub(decoded, symbol)]
+    if "close" in decoded and "symbol" in decoded:
+        return [_twelve_data(decoded, symbol)]
+    records = []
+    for key, entry in decoded.items():
+        if not isinstance(entry, dict):
+            continue
+        if "provider" in entry and "data" in entry:
+            parser = _ITEM_PARSERS.get(entry["provider"])
+            if parser is not None and isinstance(entry["data"], dict):
+                records.append(parser(entry["data"], key))
+        elif "close" in entry and entry.get("status") != "error":
+            records.append(_twelve_data(entry, key))
+    return records
+
+
+class SnapshotCycle:
+    """Parsed quotes for the current decision cycle, keyed by symbol.
+
+    Payloads are decoded once on ingest; consumers read fields off ``QuoteRecord``.
+    Call ``reset()`` at the start of each cycle.
+    """
+
+    def __init__(self) -> None:
+        self._records: dict[str, QuoteRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._records
+
+    def ingest(self, payload: str | Any, symbol: str | None = None) -> list[QuoteRecord]:
+        records = parse_quotes(payload, symbol)
+        for record in records:
+            if record.symbol:
+                self._records[record.symbol] = record
+        return records
+
+    def get(self, symbol: str) -> QuoteRecord | None:
+        return self._records.get(symbol.upper())
+
+    def records(self) -> list[QuoteRecord]:
+        return list(self._records.values())
+
+    def reset(self) -> None:
+        self._records.clear()
+
+    def to_market_snapshots(self) -> list[MarketSnapshot]:
+        return [record.to_market_snapshot() for record in self._records.values()]
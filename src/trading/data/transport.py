@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    timeout_seconds: float = 10.0
+    max_concurrency: int = 8
+
+
+@dataclass
+class HttpTransport:
+    """Shared keep-alive transport for provider calls.
+
+    One ``requests.Session`` backs every provider; urllib3 keeps a connection pool per host,
+    so repeated calls to the same provider reuse TCP+TLS connections. Each provider gets its
+    own timeout and a semaphore capping in-flight requests.
+    """
+
+    limits: dict[str, ProviderLimits] = field(default_factory=dict)
+    default_limits: ProviderLimits = field(default_factory=ProviderLimits)
+    pool_connections: int = 16
+    pool_maxsize: int = 16
+
+    def __post_init__(self) -> None:
+        # Imported here so importing the data layer does not pay for requests/urllib3.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._request_error = requests.RequestException
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def limits_for(self, provider: str) -> ProviderLimits:
+        return self.limits.get(provider, self.default_limits)
+
+    def _semaphore(self, provider: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(provider)
+            if sem is None:
+                sem = threading.BoundedSemaphore(max(1, self.limits_for(provider).max_concurrency))
+                self._semaphores[provider] = sem
+            return sem
+
+    def get(self, provider: str, url: str, params: dict[str, Any]) -> str:
+        limits = self.limits_for(provider)
+        with self._semaphore(provider):
+            response = self._session.get(url, params=params, timeout=limits.timeout_seconds)
+        response.raise_for_status()
+        return response.content.decode("utf-8")
+
+    def preconnect(self, provider: str, url: str) -> bool:
+        """Open a pooled connection to ``url``'s host; any HTTP status counts as connected."""
+        try:
+            self._session.head(url, timeout=self.limits_for(provider).timeout_seconds)
+        except self._request_error:
+            return False
+        return True
+
+    async def aget(self, provider: str, url: str, params: dict[str, Any]) -> str:
+        return await asyncio.to_thread(self.get, provider, url, params)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+def transport_from_config(mcp_cfg: dict[str, Any], provider_keys: dict[str, str]) -> HttpTransport:
+    """Build a transport from ``mcp.transport``; ``provider_keys`` maps provider ids to config keys."""
+    raw = mcp_cfg.get("transport", {})
+    timeouts = raw.get("timeouts", {})
+    concurrency = raw.get("max_concurrency", {})
+    default = ProviderLimits(
+        timeout_seconds=float(timeouts.get("default", 10)),
+        max_concurrency=int(concurrency.get("default", 8)),
+    )
+    limits = {
+        provider: ProviderLimits(
+            timeout_seconds=float(timeouts.get(key, default.timeout_seconds)),
+            max_concurrency=int(concurrency.get(key, default.max_concurrency)),
+        )
+        for provider, key in provider_keys.items()
+    }
+    pool_maxsize = int(raw.get("pool_maxsize", max([default.max_concurrency, *(lim.max_concurrency for lim in limits.values())])))
+    return HttpTransport(
+        limits=limits,
+        default_limits=default,
+        pool_connections=max(len(limits), 1),
+        pool_maxsize=pool_maxsize,
+    )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+try:  # Optional: zstd compresses JSON better and faster than gzip.
+    import zstandard
+except ModuleNotFoundError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+@dataclass(frozen=True)
+class BlobPointer:
+    """Reference to a payload held in a ``BlobStore``; resolved only when the payload is read."""
+
+    content_hash: str
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    content_hash: str
+    path: str
+    codec: str
+    size: int
+    stored_size: int
+
+
+class BlobStore:
+    """Content-addressed, compressed payload files under ``root``.
+
+    A payload lives at ``<root>/<hash[:2]>/<hash><suffix>``; identical payloads share one file,
+    so writes are idempotent. The suffix records the codec, so stores written with either codec
+    stay readable.
+    """
+
+    def __init__(self, root: str | Path, codec: str = "zstd", level: int | None = None) -> None:
+        if codec == "zstd" and zstandard is None:
+            codec = "gzip"
+        if codec not in _SUFFIXES:
+            raise ValueError(f"unsupported blob codec: {codec}")
+        self.root = Path(root)
+        self.codec = codec
+        self.level = level
+
+    def relative_path(self, digest: str, codec: str | None = None) -> str:
+        return f"{digest[:2]}/{digest}{_SUFFIXES[codec or self.codec]}"
+
+    def put(self, payload: str, digest: str | None = None) -> BlobRef:
+        raw = payload.encode("utf-8")
+        digest = digest or hashlib.sha256(raw).hexdigest()
+        existing = self._locate(digest)
+        if existing is not None:
+            return BlobRef(digest, existing[0], existing[1], len(raw), (self.root / existing[0]).stat().st_size)
+        data = self._compress(raw)
+        rel = self.relative_path(digest)
+        target = self.root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".blob-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return BlobRef(digest, rel, self.codec, len(raw), len(data))
+
+    def get(self, digest: str) -> str:
+        found = self._locate(digest)
+        if found is None:
+            raise KeyError(digest)
+        rel, codec = found
+        data = (self.root / rel).read_bytes()
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read .zst blobs")
+            raw = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            raw = gzip.decompress(data)
+        return raw.decode("utf-8")
+
+    def __contains__(self, digest: str) -> bool:
+        return self._locate(digest) is not None
+
+    def _locate(self, digest: str) -> tuple[str, str] | None:
+        for codec in (self.codec, *(c for c in _SUFFIXES if c != self.codec)):
+            rel = self.relative_path(digest, codec)
+            if (self.root / rel).exists():
+                return rel, codec
+        return None
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(raw)
+        # mtime=0 keeps output deterministic for identical payloads.
+        return gzip.compress(raw, compresslevel=self.level or 6, mtime=0)
+
+
+def blob_store_from_config(backtest_cfg: dict[str, Any]) -> BlobStore:
+    raw = backtest_cfg.get("blob_store", {})
+    return BlobStore(raw.get("root", "data/blobs"), codec=raw.get("codec", "zstd"), level=raw.get("level"))
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, Float, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -67,21 +67,82 @@ class MarketSnapshot(Base):
 
 class HistoricalSnapshot(Base):
     __tablename__ = "historical_snapshot"
+    # On Postgres the table is range-partitioned by month on published_at (migration 0005), so
+    # unique constraints must include it; cross-poll dedup is enforced by HistoricalSnapshotKey.
+    __table_args__ = (
+        UniqueConstraint("payload_hash", "provider_endpoint", "symbol", "published_at", name="uq_historical_snapshot_payload"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     run_id: Mapped[str] = mapped_column(String(64), index=True)
     provider: Mapped[str] = mapped_column(String(64), index=True)
-    provider_endpoint: Mapped[str] = mapped_column(String(128), index=True)
-    symbol: Mapped[str | None] = mapped_column(String(16), index=True, nullable=True)
+    provider_endpoint: Mapped[str] = mapped_column(String(128))
+    symbol: Mapped[str | None] = mapped_column(String(16), nullable=True)
     request_params_json: Mapped[dict] = mapped_column(JSON)
+    # Empty when the payload lives in the blob store; ``blob_ref`` then holds its content hash.
     response_json: Mapped[str] = mapped_column(Text)
+    blob_ref: Mapped[str | None] = mapped_column(String(64), nullable=True)
     event_timestamp: Mapped[datetime] = mapped_column(DateTime, index=True)
     published_at: Mapped[datetime] = mapped_column(DateTime, index=True)
     ingested_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, index=True)
-    payload_hash: Mapped[str] = mapped_column(String(128), index=True)
+    payload_hash: Mapped[str] = mapped_column(String(128))
     leakage_flag: Mapped[bool] = mapped_column(Boolean, default=False)
 
 
+# PIT lookups filter on endpoint + symbol and read the newest published_at; see migration 0001.
+Index(
+    "ix_historical_snapshot_pit",
+    HistoricalSnapshot.provider_endpoint,
+    HistoricalSnapshot.symbol,
+    HistoricalSnapshot.published_at.desc(),
+)
+
+
+class HistoricalSnapshotKey(Base):
+    __tablename__ = "historical_snapshot_key"
+    __table_args__ = (UniqueConstraint("payload_hash", "provider_endpoint", "symbol", name="uq_historical_snapshot_key"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    payload_hash: Mapped[str] = mapped_column(String(128))
+    provider_endpoint: Mapped[str] = mapped_column(String(128))
+    symbol: Mapped[str | None] = mapped_column(String(16), nullable=True)
+
+
+# An open harvest range bound is stored as these sentinels: NULLs never match in the unique key.
+OPEN_RANGE_START = datetime.min
+OPEN_RANGE_END = datetime.max
+
+
+class HarvestCheckpoint(Base):
+    __tablename__ = "harvest_checkpoint"
+    # A run id re-run over a different range is a separate checkpoint set (migration 0007).
+    __table_args__ = (
+        UniqueConstraint(
+            "run_id", "provider_endpoint", "symbol", "range_start", "range_end", name="uq_harvest_checkpoint_key"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(String(64))
+    provider_endpoint: Mapped[str] = mapped_column(String(128))
+    symbol: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    range_start: Mapped[datetime] = mapped_column(DateTime, default=OPEN_RANGE_START)
+    range_end: Mapped[datetime] = mapped_column(DateTime, default=OPEN_RANGE_END)
+    last_published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+
+class DirectorResponseRecord(Base):
+    """Recorded Strategy Director response, keyed by a hash of the request payload."""
+
+    __tablename__ = "director_response"
+
+    payload_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(128))
+    response_json: Mapped[str] = mapped_column(Text)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+
 class BacktestPortfolioState(Base):
     __tablename__ = "backtest_portfolio_state"
 
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+    from trading.db.blob_store import BlobPointer
+
+PARENT = "historical_snapshot"
+_PARTITION_NAME = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+_DETACHED_NAME = re.compile(rf"^({PARENT}_y\d{{4}}m\d{{2}})_detached$")
+_ARCHIVE_NAME = re.compile(r"^(\d{4})-(\d{2})(?:-(\d+))?\.parquet$")
+_ARCHIVE_COLUMNS = (
+    "id",
+    "run_id",
+    "provider",
+    "provider_endpoint",
+    "symbol",
+    "request_params_json",
+    "response_json",
+    "blob_ref",
+    "event_timestamp",
+    "published_at",
+    "ingested_at",
+    "payload_hash",
+    "leakage_flag",
+)
+
+
+def month_floor(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+@dataclass(frozen=True, order=True)
+class MonthPartition:
+    """One monthly range partition of ``historical_snapshot`` on ``published_at``."""
+
+    start: date
+
+    @property
+    def end(self) -> date:
+        return next_month(self.start)
+
+    @property
+    def name(self) -> str:
+        return f"{PARENT}_y{self.start.year:04d}m{self.start.month:02d}"
+
+    @property
+    def detached_name(self) -> str:
+        """Name the partition takes once ``archive_partitions`` has detached it for export."""
+        return f"{self.name}_detached"
+
+    @property
+    def label(self) -> str:
+        return f"{self.start.year:04d}-{self.start.month:02d}"
+
+    def create_sql(self) -> str:
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.name} PARTITION OF {PARENT} "
+            f"FOR VALUES FROM ('{self.start.isoformat()}') TO ('{self.end.isoformat()}')"
+        )
+
+    @classmethod
+    def from_name(cls, name: str) -> MonthPartition | None:
+        match = _PARTITION_NAME.match(name)
+        return cls(date(int(match.group(1)), int(match.group(2)), 1)) if match else None
+
+
+def months_between(start: date | datetime, end: date | datetime) -> list[MonthPartition]:
+    """Partitions covering ``start`` through ``end`` inclusive."""
+    months = []
+    current, last = month_floor(start), month_floor(end)
+    while current <= last:
+        months.append(MonthPartition(current))
+        current = next_month(current)
+    return months
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    result = await conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent)"), {"parent": PARENT}
+    )
+    return result.first() is not None
+
+
+async def list_partitions(conn: AsyncConnection) -> list[MonthPartition]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:parent)"
+        ),
+        {"parent": PARENT},
+    )
+    return sorted(p for p in (MonthPartition.from_name(row[0]) for row in result) if p is not None)
+
+
+async def ensure_partitions(conn: AsyncConnection, months: Iterable[MonthPartition]) -> list[MonthPartition]:
+    """Create any missing monthly partitions; returns the ones that were created."""
+    existing = set(await list_partitions(conn))
+    created = []
+    for partition in sorted(set(months) - existing):
+        await conn.execute(text(partition.create_sql()))
+        created.append(partition)
+    return created
+
+
+async def ensure_partitions_ahead(engine: AsyncEngine, months_ahead: int = 3, now: datetime | None = None) -> list[MonthPartition]:
+    now = now or datetime.now(timezone.utc)
+    months = [MonthPartition(month_floor(now))]
+    for _ in range(months_ahead):
+        months.append(MonthPartition(months[-1].end))
+    async with engine.begin() as conn:
+        if not await is_partitioned(conn):
+            return []
+        return await ensure_partitions(conn, months)
+
+
+def require_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ModuleNotFoundError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError("pyarrow is required for snapshot archives (pip install '.[archive]')") from exc
+    return pyarrow
+
+
+class SnapshotArchive:
+    """Monthly Parquet files (zstd) holding detached ``historical_snapshot`` partitions.
+
+    Each archive run writes a new file per month (``<label>.parquet``, then ``<label>-1.parquet``
+    and so on), so a month that was backfilled and archived again never overwrites earlier rows;
+    ``lookup`` reads every file of a month. Archived months are older than the retention cutoff,
+    so a reader only needs the archive when the database has no row at or before the requested time.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def paths_for(self, partition: MonthPartition) -> list[Path]:
+        """Existing files for ``partition`` in the order they were written."""
+        files = self._files().get(partition, {})
+        return [files[n] for n in sorted(files)]
+
+    def next_path(self, partition: MonthPartition) -> Path:
+        files = self._files().get(partition, {})
+        n = max(files) + 1 if files else 0
+        return self.root / PARENT / (f"{partition.label}.parquet" if n == 0 else f"{partition.label}-{n}.parquet")
+
+    def months(self) -> list[MonthPartition]:
+        return sorted(self._files())
+
+    def _files(self) -> dict[MonthPartition, dict[int, Path]]:
+        directory = self.root / PARENT
+        if not directory.is_dir():
+            return {}
+        files: dict[MonthPartition, dict[int, Path]] = {}
+        for path in directory.glob("*.parquet"):
+            match = _ARCHIVE_NAME.match(path.name)
+            if match:
+                partition = MonthPartition(date(int(match.group(1)), int(match.group(2)), 1))
+                files.setdefault(partition, {})[int(match.group(3) or 0)] = path
+        return files
+
+    def writer(self, partition: MonthPartition) -> ArchiveWriter:
+        return ArchiveWriter(self.next_path(partition), replace=False)
+
+    def write(self, partition: MonthPartition, rows: Iterable[dict[str, Any]]) -> int:
+        writer = self.writer(partition)
+        try:
+            writer.write(list(rows))
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def lookup(self, endpoint: str, symbol: str | None, as_of: datetime) -> str | BlobPointer | None:
+        """Latest archived payload at or before ``as_of``, searching newest month first."""
+        as_of = _naive_utc(as_of)
+        for partition in reversed([m for m in self.months() if m.start <= as_of.date()]):
+            rows = [row for path in self.paths_for(partition) if (row := _latest_row(path, endpoint, symbol, as_of))]
+            if rows:
+                return _payload(max(rows, key=lambda row: row["published_at"]))
+        return None
+
+
+def read_latest(path: Path, endpoint: str, symbol: str | None, as_of: datetime) -> str | BlobPointer | None:
+    """Latest payload at or before ``as_of`` in one snapshot Parquet file (any symbol when ``symbol`` is None)."""
+    row = _latest_row(path, endpoint, symbol, as_of)
+    return None if row is None else _payload(row)
+
+
+def _latest_row(path: Path, endpoint: str, symbol: str | None, as_of: datetime) -> dict[str, Any] | None:
+    pa = require_pyarrow()
+    filters = [("provider_endpoint", "=", endpoint), ("published_at", "<=", _naive_utc(as_of))]
+    if symbol is not None:
+        filters.append(("symbol", "=", symbol))
+    table = pa.parquet.read_table(
+        path, columns=["published_at", "response_json", "blob_ref"], filters=filters, memory_map=True
+    )
+    if table.num_rows == 0:
+        return None
+    return max(table.to_pylist(), key=lambda row: row["published_at"])
+
+
+def _payload(row: dict[str, Any]) -> str | BlobPointer:
+    from trading.db.blob_store import BlobPointer
+
+    return BlobPointer(row["blob_ref"]) if row["blob_ref"] else row["response_json"]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+class ArchiveWriter:
+    """Streams row batches into a temporary Parquet file that becomes the target on ``commit``.
+
+    With ``replace=False`` ``commit`` refuses to overwrite an existing target and raises
+    ``FileExistsError``, leaving the temporary file for ``abort``.
+    """
+
+    def __init__(self, target: Path, replace: bool = True) -> None:
+        self._pa = require_pyarrow()
+        self.target = target
+        self.replace = replace
+        self.rows = 0
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=target.parent, prefix=".archive-", suffix=".parquet")
+        os.close(fd)
+        self._schema = self._pa.schema(
+            [
+                ("id", self._pa.int64()),
+                ("run_id", self._pa.string()),
+                ("provider", self._pa.string()),
+                ("provider_endpoint", self._pa.string()),
+                ("symbol", self._pa.string()),
+                ("request_params_json", self._pa.string()),
+                ("response_json", self._pa.string()),
+                ("blob_ref", self._pa.string()),
+                ("event_timestamp", self._pa.timestamp("us")),
+                ("published_at", self._pa.timestamp("us")),
+                ("ingested_at", self._pa.timestamp("us")),
+                ("payload_hash", self._pa.string()),
+                ("leakage_flag", self._pa.bool_()),
+            ]
+        )
+        self._writer = self._pa.parquet.ParquetWriter(self._tmp, self._schema, compression="zstd")
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        batch = []
+        for row in rows:
+            out = {column: row.get(column) for column in _ARCHIVE_COLUMNS}
+            out["request_params_json"] = json.dumps(out["request_params_json"], sort_keys=True, default=str)
+            batch.append(out)
+        self._writer.write_table(self._pa.Table.from_pylist(batch, schema=self._schema))
+        self.rows += len(batch)
+
+    def commit(self) -> int:
+        self._writer.close()
+        if self.replace:
+            os.replace(self._tmp, self.target)
+        else:
+            os.link(self._tmp, self.target)
+            Path(self._tmp).unlink()
+        return self.rows
+
+    def abort(self) -> None:
+        self._writer.close()
+        Path(self._tmp).unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class ArchivedPartition:
+    partition: MonthPartition
+    rows: int
+    path: Path
+
+
+async def list_detached(conn: AsyncConnection) -> list[MonthPartition]:
+    """Months detached by an archive run whose export has not finished yet."""
+    result = await conn.execute(
+        text("SELECT relname FROM pg_class WHERE relkind = 'r' AND NOT relispartition AND relname LIKE :pattern"),
+        {"pattern": f"{PARENT}_y%_detached"},
+    )
+    months = []
+    for (name,) in result:
+        match = _DETACHED_NAME.match(name)
+        partition = MonthPartition.from_name(match.group(1)) if match else None
+        if partition is not None:
+            months.append(partition)
+    return sorted(months)
+
+
+async def archive_partitions(
+    engine: AsyncEngine, archive: SnapshotArchive, before: date, batch_size: int = 50_000
+) -> list[ArchivedPartition]:
+    """Move every monthly partition ending on or before ``before`` to Parquet.
+
+    Each partition is detached and renamed first, so rows written afterwards for that month go
+    to a recreated partition (archived by a later run) instead of being dropped unexported.
+    The detached table is only dropped once its file is committed with the same row count;
+    tables left detached by a failed run are exported first.
+    """
+    async with engine.connect() as conn:
+        if not await is_partitioned(conn):
+            return []
+        leftover = await list_detached(conn)
+    archived = [await _export_detached(engine, archive, partition, batch_size) for partition in leftover]
+    async with engine.begin() as conn:
+        due = [p for p in await list_partitions(conn) if p.end <= before]
+        for partition in due:
+            await conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}"))
+            await conn.execute(text(f"ALTER TABLE {partition.name} RENAME TO {partition.detached_name}"))
+    for partition in due:
+        archived.append(await _export_detached(engine, archive, partition, batch_size))
+    return archived
+
+
+async def _export_detached(
+    engine: AsyncEngine, archive: SnapshotArchive, partition: MonthPartition, batch_size: int
+) -> ArchivedPartition:
+    table = partition.detached_name
+    writer = archive.writer(partition)
+    try:
+        async with engine.connect() as conn:
+            expected = (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar_one()
+            result = await conn.stream(text(f"SELECT {', '.join(_ARCHIVE_COLUMNS)} FROM {table} ORDER BY id"))
+            async for rows in result.mappings().partitions(batch_size):
+                writer.write([dict(row) for row in rows])
+        written = writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+    if written != expected:
+        raise RuntimeError(f"archive of {table} wrote {written} rows, expected {expected}")
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE {table}"))
+    return ArchivedPartition(partition, written, writer.target)
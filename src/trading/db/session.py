@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import os
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 
-def build_session_factory() -> async_sessionmaker[AsyncSession]:
+def build_engine() -> AsyncEngine:
     db_url = os.getenv("DATABASE_URL", "postgresql+asyncpg://localhost/trading")
-    engine = create_async_engine(db_url, echo=False, pool_pre_ping=True)
-    return async_sessionmaker(engine, expire_on_commit=False)
+    return create_async_engine(db_url, echo=False, pool_pre_ping=True)
+
+
+def build_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(build_engine(), expire_on_commit=False)
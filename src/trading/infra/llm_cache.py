@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Protocol
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from trading.db.models import DirectorResponseRecord
+
+MODES = ("off", "record", "replay")
+# Request fields that can change the model's answer; anything else (metadata, stream) is ignored.
+KEY_FIELDS = (
+    "model",
+    "system",
+    "messages",
+    "tools",
+    "tool_choice",
+    "thinking",
+    "max_tokens",
+    "temperature",
+    "top_p",
+    "top_k",
+    "stop_sequences",
+)
+
+ModelCall = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+class ReplayMissError(LookupError):
+    """Strict replay found no recording for a payload; the message names its hash."""
+
+
+def payload_hash(payload: dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of the payload's ``KEY_FIELDS``."""
+    keyed = {name: payload[name] for name in KEY_FIELDS if name in payload}
+    canonical = json.dumps(keyed, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseStore(Protocol):
+    async def get(self, key: str) -> Any | None: ...
+
+    async def put(self, key: str, model: str, response: Any) -> None: ...
+
+
+class DiskResponseStore:
+    """One JSON file per payload hash under ``root`` (``<hash[:2]>/<hash>.json``)."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    async def get(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def put(self, key: str, model: str, response: Any) -> None:
+        await asyncio.to_thread(self._write, key, model, response)
+
+    def _read(self, key: str) -> Any | None:
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        record = json.loads(path.read_text(encoding="utf-8"))
+        return record["response"] if record.get("key") == key else None
+
+    def _write(self, key: str, model: str, response: Any) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".response-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"key": key, "model": model, "response": response}, handle, sort_keys=True)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+class DbResponseStore:
+    """Recordings in the ``director_response`` table."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def get(self, key: str) -> Any | None:
+        async with self.session_factory() as session:
+            raw = (
+                await session.execute(
+                    select(DirectorResponseRecord.response_json).where(DirectorResponseRecord.payload_hash == key)
+                )
+            ).scalar_one_or_none()
+        return None if raw is None else json.loads(raw)
+
+    async def put(self, key: str, model: str, response: Any) -> None:
+        async with self.session_factory() as session:
+            await session.merge(
+                DirectorResponseRecord(payload_hash=key, model=model, response_json=json.dumps(response, sort_keys=True))
+            )
+            await session.commit()
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    recorded: int = 0
+
+
+class DirectorResponseCache:
+    """Record/replay cache in front of the model call for a compiled director payload.
+
+    ``record`` serves an existing recording or calls the model and stores its (JSON-serializable)
+    response; ``replay`` never calls the model and raises ``ReplayMissError`` on a miss, so a
+    backtest rerun is deterministic; ``off`` always calls through.
+    """
+
+    def __init__(self, store: ResponseStore, mode: str = "record") -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown response cache mode: {mode}")
+        self.store = store
+        self.mode = mode
+        self.stats = ResponseCacheStats()
+
+    async def complete(self, payload: dict[str, Any], call: ModelCall) -> Any:
+        if self.mode == "off":
+            return await call(payload)
+        key = payload_hash(payload)
+        cached = await self.store.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        self.stats.misses += 1
+        if self.mode == "replay":
+            raise ReplayMissError(f"no recorded director response for payload {key}")
+        response = await call(payload)
+        await self.store.put(key, str(payload.get("model", "")), response)
+        self.stats.recorded += 1
+        return response
+
+
+def response_cache_from_config(
+    anthropic_cfg: dict[str, Any], session_factory: async_sessionmaker[AsyncSession] | None = None
+) -> DirectorResponseCache | None:
+    raw = anthropic_cfg.get("response_cache", {})
+    mode = raw.get("mode", "off")
+    if mode == "off":
+        return None
+    if raw.get("store", "disk") == "db":
+        if session_factory is None:
+            raise ValueError("anthropic.response_cache.store=db needs a session factory")
+        store: ResponseStore = DbResponseStore(session_factory)
+    else:
+        store = DiskResponseStore(raw.get("root", "data/director_responses"))
+    return DirectorResponseCache(store, mode=mode)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 
 
@@ -8,9 +9,13 @@ class MCPRuntime:
     """Scaffold for a single multiplexed local MCP server runtime."""
 
     started: bool = False
+    preconnect: bool = False
 
     async def start(self) -> None:
         # TODO: boot a single MCP stdio server process exposing provider tools.
+        from trading.data import mcp_server
+
+        await asyncio.to_thread(mcp_server.warm_up, self.preconnect)
         self.started = True
 
     async def stop(self) -> None:
@@ -17,7 +17,7 @@ class SimulatedClock:
         self.current = next_dt
         return self.current
 
-    def advance_seconds(self, seconds: int) -> datetime:
+    def advance_seconds(self, seconds: float) -> datetime:
         self.current = self.current + timedelta(seconds=seconds)
         return self.current
 
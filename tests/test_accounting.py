@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from trading.backtest.accounting import AccountingEngine, PortfolioBook
+from trading.config import AppConfig
+
+
+def test_book_tracks_average_cost_realized_pnl_and_flips():
+    book = PortfolioBook(["AAPL", "MSFT", "NVDA"], cash=10_000)
+    aapl = book.slots["AAPL"]
+
+    book.apply(book.batch([{"symbol": "AAPL", "qty": 10, "price": 100}, {"symbol": "AAPL", "qty": 10, "price": 110, "fees": 1}]))
+    assert book.qty[aapl] == 20 and book.avg_cost[aapl] == pytest.approx(105)
+    assert book.cash == pytest.approx(10_000 - 2_100 - 1)
+    assert book.mark[aapl] == 110
+
+    book.apply(book.batch([{"symbol": "AAPL", "qty": -5, "price": 120}]))
+    assert book.realized[aapl] == pytest.approx(75 - 1)
+    assert book.avg_cost[aapl] == pytest.approx(105)
+
+    book.apply(book.batch([{"symbol": "AAPL", "qty": -25, "price": 90}]))
+    assert book.qty[aapl] == -10 and book.avg_cost[aapl] == pytest.approx(90)
+    assert book.realized[aapl] == pytest.approx(74 - 225)
+
+    # Bought and sold within one window: the cash difference is realized, nothing is held.
+    book.apply(book.batch([{"symbol": "MSFT", "qty": 3, "price": 50}, {"symbol": "MSFT", "qty": -3, "price": 52}]))
+    assert book.qty[book.slots["MSFT"]] == 0 and book.realized[book.slots["MSFT"]] == pytest.approx(6)
+
+    book.mark_to_market({"AAPL": 80, "TSLA": 1})
+    state = book.state()
+    assert book.unrealized_pnl[aapl] == pytest.approx(100)
+    assert state["equity"] == pytest.approx(10_000 + book.realized.sum() + book.unrealized_pnl.sum())
+    assert state["gross_exposure"] == pytest.approx(800 / state["equity"])
+    assert state["net_exposure"] == pytest.approx(-800 / state["equity"])
+
+    with pytest.raises(ValueError):
+        book.batch([{"symbol": "TSLA", "qty": 1, "price": 1}])
+
+
+
+def test_partial_offset_within_a_window_realizes_the_matched_quantity():
+    book = PortfolioBook(["AAPL", "MSFT"], cash=10_000)
+    aapl, msft = book.slots["AAPL"], book.slots["MSFT"]
+
+    book.apply(book.batch([{"symbol": "AAPL", "qty": 10, "price": 100}, {"symbol": "AAPL", "qty": -9, "price": 120}]))
+    assert book.qty[aapl] == 1 and book.avg_cost[aapl] == pytest.approx(100)
+    assert book.realized[aapl] == pytest.approx(180)
+
+    # Held long 10 @ 90; the window buys 5 @ 100 and sells 8 @ 110, a net sale of 3 @ 110.
+    book.apply(book.batch([{"symbol": "MSFT", "qty": 10, "price": 90}]))
+    book.apply(book.batch([{"symbol": "MSFT", "qty": 5, "price": 100}, {"symbol": "MSFT", "qty": -8, "price": 110}]))
+    assert book.qty[msft] == 7 and book.avg_cost[msft] == pytest.approx(90)
+    assert book.realized[msft] == pytest.approx(5 * 10 + 3 * 20)
+
+    book.mark_to_market({"AAPL": 100, "MSFT": 90})
+    assert book.equity == pytest.approx(10_000 + book.realized.sum() + book.unrealized_pnl.sum())
+
+def test_equity_reconciles_with_pnl_over_random_windows():
+    rng = np.random.default_rng(3)
+    symbols = [f"S{i}" for i in range(50)]
+    book = PortfolioBook(symbols, cash=1_000_000)
+    for _ in range(200):
+        n = int(rng.integers(1, 40))
+        book.apply(
+            book.batch(
+                {
+                    "symbol": symbols[int(rng.integers(0, 50))],
+                    "qty": float(rng.integers(-50, 51)),
+                    "price": float(rng.uniform(10, 500)),
+                    "fees": float(rng.uniform(0, 2)),
+                }
+                for _ in range(n)
+            )
+        )
+        book.mark_to_market({s: float(rng.uniform(10, 500)) for s in symbols[::3]})
+        assert book.equity == pytest.approx(1_000_000 + book.realized.sum() + book.unrealized_pnl.sum())
+
+
+@pytest.mark.asyncio
+async def test_engine_bulk_flushes_fills_states_and_positions():
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from trading.db.models import Base, BacktestFill, BacktestPortfolioState, BacktestPosition
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    cfg = AppConfig(
+        raw={
+            "universe": {"holdings": ["AAPL"], "watchlist": ["MSFT"]},
+            "backtest": {"accounting": {"starting_cash": 50_000, "flush_every_windows": 2}},
+        }
+    )
+    accounting = AccountingEngine.from_config(cfg, "bt-1", session_factory)
+
+    async def count(model) -> int:
+        async with session_factory() as session:
+            return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+    t0 = datetime(2025, 1, 6, 9, 50, tzinfo=timezone.utc)
+    await accounting.close_window(t0, [{"symbol": "AAPL", "qty": 10, "price": 200, "order_id": 1}])
+    assert await count(BacktestPortfolioState) == 0
+
+    state = await accounting.close_window(
+        t0 + timedelta(hours=2),
+        [{"symbol": "MSFT", "qty": 5, "price": 400, "order_id": 2}, {"symbol": "AAPL", "qty": -10, "price": 210, "order_id": 3}],
+        marks={"MSFT": 410},
+    )
+    assert state["equity"] == pytest.approx(50_000 + 100 + 50)
+    assert await count(BacktestFill) == 3
+    assert await count(BacktestPortfolioState) == 2
+
+    await accounting.close_window(t0 + timedelta(days=1), marks={"MSFT": 420})
+    await accounting.flush()
+    async with session_factory() as session:
+        positions = {p.symbol: p for p in (await session.execute(select(BacktestPosition))).scalars()}
+    assert await count(BacktestPortfolioState) == 3
+    assert positions["AAPL"].status == "closed" and positions["AAPL"].quantity == 0
+    assert positions["MSFT"].status == "open" and positions["MSFT"].unrealized_pnl == pytest.approx(100)
@@ -1,8 +1,10 @@
 import asyncio
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 
 from trading.backtest.runner import BacktestRunner
 from trading.config import AppConfig
+from trading.core.scheduler import AdaptiveInputs
 
 
 def test_backtest_runner_windows_and_notional_cap():
@@ -39,3 +41,122 @@ def test_backtest_runner_windows_and_notional_cap():
     assert names == ["premarket", "open_plus", "noon", "reflection"]
     assert runner.allow_order_notional(2000, 3500)
     assert not runner.allow_order_notional(9500, 600)
+
+
+def _fast_forward_config(clock_end: str) -> AppConfig:
+    return AppConfig(
+        raw={
+            "runtime": {"mode": "backtest"},
+            "backtest": {
+                "clock_start": "2025-01-06T08:00:00Z",
+                "clock_end": clock_end,
+                "simulated_wait_seconds": 3600,
+                "fast_forward": True,
+            },
+        }
+    )
+
+
+def test_fast_forward_replays_a_year_without_sleeping():
+    seen = []
+
+    async def hook(name: str, ts: datetime) -> None:
+        seen.append(ts)
+
+    runner = BacktestRunner(config=_fast_forward_config("2025-12-31T16:30:00Z"), run_hook=hook)
+    started = time.monotonic()
+    runner.replay()
+
+    assert len(seen) == 360 * 4
+    assert seen == sorted(seen)
+    # 360 days x 4 windows x an hour of simulated wait would take 60 days of wall clock.
+    assert time.monotonic() - started < 10
+    assert runner.clock.now() == datetime(2025, 12, 31, 17, 30, tzinfo=timezone.utc)
+
+
+def test_fast_forward_keeps_hook_timer_order_on_the_simulated_clock():
+    events = []
+
+    async def hook(name: str, ts: datetime) -> None:
+        if name != "premarket":
+            return
+
+        async def later(label: str, delay: float) -> None:
+            await asyncio.sleep(delay)
+            events.append((label, runner.time_provider.now()))
+
+        asyncio.get_running_loop().call_later(20, lambda: events.append(("call_later", runner.time_provider.now())))
+        await asyncio.gather(later("slow", 30), later("fast", 10))
+        # Executor work takes no virtual time, so a generous deadline never trips.
+        await asyncio.wait_for(asyncio.to_thread(time.sleep, 0.05), timeout=1)
+        events.append(("thread", runner.time_provider.now()))
+
+    runner = BacktestRunner(config=_fast_forward_config("2025-01-06T08:00:00Z"), run_hook=hook)
+    runner.replay()
+
+    start = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+    assert events == [
+        ("fast", start + timedelta(seconds=10)),
+        ("call_later", start + timedelta(seconds=20)),
+        ("slow", start + timedelta(seconds=30)),
+        ("thread", start + timedelta(seconds=30)),
+    ]
+
+
+def test_fast_forward_skips_wall_clock_wait_on_a_regular_loop():
+    runner = BacktestRunner(config=_fast_forward_config("2025-01-06T16:30:00Z"), run_hook=lambda *_: asyncio.sleep(0))
+    started = time.monotonic()
+    asyncio.run(runner.run())
+    assert time.monotonic() - started < 1
+    assert runner.clock.now() == datetime(2025, 1, 6, 17, 30, tzinfo=timezone.utc)
+
+
+def test_adaptive_schedule_interleaves_ticks_with_windows_and_routes_events():
+    seen = []
+    events = []
+    cfg = AppConfig(
+        raw={
+            "runtime": {"mode": "backtest"},
+            "backtest": {
+                "clock_start": "2025-01-06T08:00:00Z",
+                "clock_end": "2025-01-06T16:30:00Z",
+                "simulated_wait_seconds": 0,
+                "fast_forward": True,
+                "schedule_mode": "adaptive",
+            },
+            "schedule": {"adaptive": {"quiet_interval_minutes": 90, "active_interval_minutes": 30}},
+            "events": {"earnings_window_days": {"start": -1, "end": 2}, "earnings_dates": {"AAPL": ["2025-01-07"]}},
+        }
+    )
+
+    async def hook(name: str, ts: datetime) -> None:
+        seen.append((name, ts.strftime("%H:%M")))
+        if name == "open_plus":
+            runner.engine.schedule_fill(ts + timedelta(minutes=5), {"symbol": "MSFT", "qty": 10})
+
+    async def on_event(event) -> None:
+        events.append((event.kind, event.name, event.at.strftime("%H:%M"), runner.earnings_window_active("AAPL")))
+
+    def inputs(ts: datetime) -> AdaptiveInputs:
+        # Volatile after noon: the scheduler tightens to the active interval.
+        return AdaptiveInputs(event_velocity=0.9 if ts.hour >= 12 else 0.1, volatility_state="normal", quota_pressure=0.0)
+
+    runner = BacktestRunner(config=cfg, run_hook=hook, event_hook=on_event, adaptive_inputs=inputs)
+    asyncio.run(runner.run())
+
+    assert seen == [
+        ("premarket", "08:00"),
+        ("adaptive", "09:30"),
+        ("open_plus", "09:50"),
+        ("adaptive", "11:00"),
+        ("noon", "12:00"),
+        ("adaptive", "12:30"),
+        ("adaptive", "13:00"),
+        ("adaptive", "13:30"),
+        ("adaptive", "14:00"),
+        ("adaptive", "14:30"),
+        ("adaptive", "15:00"),
+        ("adaptive", "15:30"),
+        ("reflection", "16:30"),
+    ]
+    assert events == [("earnings", "AAPL", "08:00", True), ("fill", "MSFT", "09:55", True)]
@@ -0,0 +1,32 @@
+import json
+
+import numpy as np
+
+from trading.data.bars import BarCache, decode_twelve_data_series
+
+
+def _payload(minutes):
+    values = [
+        {"datetime": f"2025-01-06 09:{m:02d}:00", "open": str(m), "high": str(m + 1), "low": str(m - 1), "close": str(m + 0.5), "volume": "100"}
+        for m in sorted(minutes, reverse=True)
+    ]
+    return json.dumps({"meta": {"symbol": "AAPL", "interval": "1min"}, "values": values, "status": "ok"})
+
+
+def test_decode_series_into_ascending_columns():
+    series = decode_twelve_data_series(_payload([30, 31, 32]))
+    assert series.timestamps.dtype == np.int64 and series.close.dtype == np.float64
+    assert np.all(np.diff(series.timestamps) == 60)
+    assert series.close.tolist() == [30.5, 31.5, 32.5]
+    assert len(decode_twelve_data_series('{"status": "error"}')) == 0
+
+
+def test_cache_appends_only_new_bars():
+    cache = BarCache()
+    cache.update("AAPL", "1min", _payload([30, 31, 32]))
+    series = cache.update("aapl", "1min", _payload([31, 32, 33, 34]))
+    assert series is cache.get("AAPL", "1min")
+    assert series.open.tolist() == [30.0, 31.0, 32.0, 33.0, 34.0]
+    for minute in range(35, 55):
+        cache.update("AAPL", "1min", _payload([minute - 1, minute]))
+    assert len(series) == 25 and series.last_timestamp - series.timestamps[0] == 24 * 60
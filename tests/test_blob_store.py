@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from trading.db.blob_store import BlobStore
+
+
+def test_blob_store_roundtrip_is_content_addressed(tmp_path):
+    store = BlobStore(tmp_path, codec="gzip")
+    payload = '{"filings": ' + '["10-K", "10-Q"], ' * 200 + "null}"
+    first = store.put(payload)
+    second = store.put(payload)
+
+    assert first == second
+    assert first.stored_size < first.size
+    assert first.content_hash in store
+    assert store.get(first.content_hash) == payload
+    assert len(list(tmp_path.rglob("*.gz"))) == 1
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_harvested_blob_payloads_are_served_to_backtest_readers(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from trading.backtest.harvester import HarvestRecord, HistoricalHarvester
+    from trading.config import AppConfig
+    from trading.data.oracle_client import OracleClient, OracleQuery
+    from trading.db.models import Base, EvidenceStore, HistoricalSnapshot
+    from trading.utils.time_provider import SimulatedClock, TimeProvider
+
+    big = '{"articles": [' + ", ".join(f'{{"title": "story {i}"}}' for i in range(100)) + "]}"
+    published = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+
+    async def scenario(preload: bool):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        cfg = AppConfig(
+            raw={
+                "runtime": {"mode": "backtest"},
+                "backtest": {
+                    "clock_start": "2025-01-06T08:00:00Z",
+                    "clock_end": "2025-01-06T16:00:00Z",
+                    "preload_index": {"enabled": preload},
+                    "blob_store": {"enabled": True, "root": str(tmp_path), "codec": "gzip", "min_bytes": 256},
+                },
+            }
+        )
+        tp = TimeProvider(mode="backtest", simulated_clock=SimulatedClock(datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)))
+        client = OracleClient(cfg, tp, session_factory)
+        harvester = HistoricalHarvester(client, session_factory)
+        await harvester.persist_records(
+            "r1",
+            [
+                HarvestRecord("GDELT", "gdelt_search", "AAPL", {"symbol": "AAPL"}, big, published, published),
+                HarvestRecord("FINNHUB", "finnhub_quote", "AAPL", {"symbol": "AAPL"}, '{"c":1}', published, published),
+            ],
+        )
+        async with session_factory() as session:
+            rows = {r.provider_endpoint: r for r in (await session.execute(select(HistoricalSnapshot))).scalars()}
+            evidence = (await session.execute(select(EvidenceStore))).scalars().all()
+        served = await client.fetch(OracleQuery(provider_endpoint="gdelt_search", symbol="AAPL", params={}))
+        small = await client.fetch(OracleQuery(provider_endpoint="finnhub_quote", symbol="AAPL", params={}))
+        return rows, evidence, served, small
+
+    for preload in (False, True):
+        rows, evidence, served, small = asyncio.run(scenario(preload))
+        assert rows["gdelt_search"].response_json == "" and rows["gdelt_search"].blob_ref
+        assert rows["finnhub_quote"].blob_ref is None
+        assert [e.content_hash for e in evidence] == [rows["gdelt_search"].blob_ref]
+        assert served == big
+        assert small == '{"c":1}'
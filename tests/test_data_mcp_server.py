@@ -1,4 +1,9 @@
+import json
+import subprocess
+import sys
+
 from trading.data import mcp_server
+from trading.data.quota import QuotaManager
 
 
 def test_quota_exceeded_error_format():
@@ -9,3 +14,36 @@ def test_quota_exceeded_error_format():
 
 def test_config_driven_quota_loaded_for_twelve_data():
     assert "TWELVE_DATA" in mcp_server.quota.limits
+
+
+def test_get_prices_batches_and_falls_through_per_symbol(monkeypatch):
+    calls = []
+
+    def fake_get(provider, url, params):
+        calls.append((provider, params))
+        if provider == "YAHOO":
+            return json.dumps({"quoteResponse": {"result": [{"symbol": s, "bid": 1.0} for s in params["symbols"].split(",") if s != "MSFT"]}})
+        if provider == "STOOQ":
+            return json.dumps({"symbols": [{"symbol": "MSFT.US", "close": 2.0}]})
+        raise AssertionError(provider)
+
+    monkeypatch.setattr(mcp_server, "quota", QuotaManager(limits={"YAHOO": 10, "STOOQ": 10}))
+    monkeypatch.setattr(mcp_server, "_get", fake_get)
+    symbols = [f"S{i}" for i in range(58)] + ["MSFT"]
+    out = json.loads(mcp_server.get_prices(symbols))
+
+    assert [p for p, _ in calls] == ["YAHOO", "YAHOO", "STOOQ"]
+    assert mcp_server.quota.usage["YAHOO"] == 2
+    assert out["S0"]["provider"] == "YAHOO"
+    assert out["MSFT"] == {"provider": "STOOQ", "data": {"symbol": "MSFT.US", "close": 2.0}}
+
+
+def test_import_defers_config_and_fastmcp_until_first_use():
+    code = (
+        "import sys; import trading.data.mcp_server as m; "
+        "print('fastmcp' in sys.modules, 'yaml' in sys.modules, 'quota' in vars(m)); "
+        "m.warm_up(); print('quota' in vars(m), len(m._TOOLS))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split("\n")
+    assert out[0] == "False False False"
+    assert out[1] == f"True {len(mcp_server._TOOLS)}"
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from trading.backtest.events import EventEngine
+from trading.utils.time_provider import SimulatedClock
+
+T0 = datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)
+
+
+def test_engine_orders_by_time_then_kind_and_advances_clock():
+    clock = SimulatedClock(T0)
+    engine = EventEngine(clock)
+    seen = []
+
+    async def handler(event):
+        seen.append((event.kind, event.name, clock.now()))
+
+    engine.schedule(T0 + timedelta(hours=2), "window", "noon")
+    engine.schedule(T0 + timedelta(hours=2), "tick", "adaptive")
+    engine.schedule_fill(T0 + timedelta(hours=2), {"symbol": "AAPL", "qty": 5})
+    dropped = engine.schedule(T0 + timedelta(hours=1), "window", "open_plus")
+    engine.schedule(T0 + timedelta(hours=9), "window", "after_end")
+    engine.cancel(dropped)
+
+    fired = asyncio.run(engine.run(T0 + timedelta(hours=8), handler))
+
+    assert fired == 3
+    assert seen == [
+        ("fill", "AAPL", T0 + timedelta(hours=2)),
+        ("window", "noon", T0 + timedelta(hours=2)),
+        ("tick", "adaptive", T0 + timedelta(hours=2)),
+    ]
+    assert engine.peek().name == "after_end"
+
+
+def test_recurring_events_skip_idle_stretches_and_stop_when_cancelled():
+    clock = SimulatedClock(T0)
+    engine = EventEngine(clock)
+    fired = []
+
+    async def handler(event):
+        fired.append(event.at)
+        if len(fired) == 3:
+            engine.cancel(event)
+
+    # Quarterly cadence: a year of idle days costs four heap operations, not 365 iterations.
+    engine.schedule(T0, "window", "quarterly", repeat=lambda at: at + timedelta(days=91))
+    asyncio.run(engine.run(T0 + timedelta(days=365), handler))
+
+    assert fired == [T0, T0 + timedelta(days=91), T0 + timedelta(days=182)]
+    assert engine.peek() is None
+
+
+def test_earnings_window_active_uses_configured_offsets():
+    engine = EventEngine(SimulatedClock(T0))
+    engine.schedule_earnings("AAPL", date(2025, 1, 30), T0)
+
+    def active(day, symbol=None):
+        at = datetime(2025, 1, day, 12, tzinfo=timezone.utc)
+        return engine.earnings_window_active(at, start_days=-1, end_days=2, symbol=symbol)
+
+    assert not active(28)
+    assert active(29) and active(30) and active(31, "AAPL")
+    assert not active(31, "MSFT")
+    assert engine.earnings_window_active(datetime(2025, 2, 1, tzinfo=timezone.utc), -1, 2)
+    assert not engine.earnings_window_active(datetime(2025, 2, 2, tzinfo=timezone.utc), -1, 2)
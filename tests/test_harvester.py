@@ -0,0 +1,225 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from trading.backtest.harvester import HistoricalHarvester
+from trading.config import AppConfig
+from trading.data.oracle_client import OracleQuery
+from trading.db.models import Base, HistoricalSnapshot
+
+
+class FakeOracle:
+    def __init__(self, config: AppConfig, delay: float = 0.01) -> None:
+        self.config = config
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def fetch(self, query: OracleQuery) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if query.symbol == "BAD":
+            return "ERROR: FINNHUB QUOTA_EXCEEDED"
+        return f'{{"c": 1, "s": "{query.symbol}"}}'
+
+
+async def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_harvest_streams_chunks_with_bounded_concurrency():
+    async def scenario():
+        session_factory = await _session_factory()
+        cfg = AppConfig(
+            raw={
+                "runtime": {"mode": "backtest"},
+                "backtest": {"harvest": {"chunk_size": 5, "concurrency": {"default": 3, "market_oracle": 3}}},
+            }
+        )
+        oracle = FakeOracle(cfg)
+        harvester = HistoricalHarvester(oracle, session_factory)
+        seen = []
+        symbols = [f"S{i}" for i in range(20)] + ["BAD"]
+        progress = await harvester.harvest(symbols, ["get_price"], run_id="r1", on_progress=lambda p: seen.append(p.persisted))
+
+        async with session_factory() as session:
+            stored = (await session.execute(select(func.count()).select_from(HistoricalSnapshot))).scalar_one()
+        return oracle.peak, progress, seen, stored
+
+    peak, progress, seen, stored = asyncio.run(scenario())
+    assert peak == 3
+    assert progress.total == 21 and progress.fetched == 20 and progress.failed == 1
+    assert progress.persisted == stored == 20
+    assert len(seen) >= 4 and seen == sorted(seen) and seen[-1] == 20
+    assert progress.records_per_second > 0
+
+
+def test_harvest_skips_providers_without_daily_quota(monkeypatch):
+    from trading.data import mcp_server
+    from trading.data.quota import QuotaManager
+
+    monkeypatch.setattr(mcp_server, "quota", QuotaManager({"FINNHUB": 0}))
+
+    async def scenario():
+        session_factory = await _session_factory()
+        oracle = FakeOracle(AppConfig(raw={"runtime": {"mode": "live"}}))
+        harvester = HistoricalHarvester(oracle, session_factory)
+        return await harvester.harvest(["AAPL", "MSFT"], ["finnhub_quote", "get_price"])
+
+    progress = asyncio.run(scenario())
+    assert progress.skipped_quota == 2
+    assert progress.persisted == 2
+
+
+def test_harvest_passes_each_tool_its_key_param_and_drops_error_envelopes():
+    class ToolOracle(FakeOracle):
+        def __init__(self, config):
+            super().__init__(config, delay=0)
+            self.params = {}
+
+        async def fetch(self, query):
+            self.params[query.provider_endpoint] = query.params
+            if query.provider_endpoint == "get_price":
+                return '{"error": "DEADLINE_EXCEEDED", "provider_endpoint": "get_price", "symbol": "DGS10"}'
+            return '{"ok": true}'
+
+    async def scenario():
+        session_factory = await _session_factory()
+        oracle = ToolOracle(AppConfig(raw={"runtime": {"mode": "backtest"}}))
+        endpoints = ["fred_series", "gdelt_search", "sec_edgar_submissions", "finnhub_quote", "get_price"]
+        progress = await HistoricalHarvester(oracle, session_factory).harvest(["DGS10"], endpoints)
+        async with session_factory() as session:
+            rows = (await session.execute(select(HistoricalSnapshot))).scalars().all()
+        return oracle.params, progress, {row.provider_endpoint: row.request_params_json for row in rows}
+
+    params, progress, stored = asyncio.run(scenario())
+    assert params["fred_series"] == {"series_id": "DGS10"}
+    assert params["gdelt_search"] == {"query": "DGS10"}
+    assert params["sec_edgar_submissions"] == {"cik": "DGS10"}
+    assert params["finnhub_quote"] == {"symbol": "DGS10"}
+    assert progress.fetched == 4 and progress.failed == 1
+    assert "get_price" not in stored and stored["fred_series"] == {"series_id": "DGS10"}
+    assert HistoricalHarvester.is_error_payload('{"error": "unknown_tool:nope"}')
+    assert HistoricalHarvester.is_error_payload("ERROR: FINNHUB QUOTA_EXCEEDED")
+    assert not HistoricalHarvester.is_error_payload('{"articles": [{"error": "none"}]}')
+
+
+def test_persist_records_bulk_inserts_and_skips_unchanged_payloads():
+    from datetime import datetime, timezone
+
+    from trading.backtest.harvester import HarvestRecord
+
+    now = datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)
+
+    def record(symbol: str, body: str) -> HarvestRecord:
+        return HarvestRecord("FINNHUB", "finnhub_quote", symbol, {"symbol": symbol}, body, now, now)
+
+    async def scenario():
+        session_factory = await _session_factory()
+        harvester = HistoricalHarvester(FakeOracle(AppConfig(raw={})), session_factory)
+        first = await harvester.persist_records(
+            "r1", [record("AAPL", '{"c":1}'), record("AAPL", '{"c":1}'), record("MSFT", '{"c":1}'), record("X", "weekly recap")]
+        )
+        second = await harvester.persist_records("r2", [record("AAPL", '{"c":1}'), record("AAPL", '{"c":2}')])
+        async with session_factory() as session:
+            stored = (await session.execute(select(func.count()).select_from(HistoricalSnapshot))).scalar_one()
+        return first, second, stored
+
+    first, second, stored = asyncio.run(scenario())
+    assert (first.inserted, first.deduplicated, first.skipped) == (2, 1, 1)
+    assert (second.inserted, second.deduplicated) == (1, 1)
+    assert stored == 3
+
+
+def test_harvest_resumes_run_and_fetches_incrementally():
+    from datetime import datetime, timezone
+
+    class CountingOracle(FakeOracle):
+        def __init__(self, config, failing=()):
+            super().__init__(config, delay=0)
+            self.failing = set(failing)
+            self.calls = []
+
+        async def fetch(self, query):
+            self.calls.append(query.symbol)
+            if query.symbol in self.failing:
+                raise RuntimeError("provider down")
+            return '{"c": 1, "timestamp": 1736150400}'  # 2025-01-06T08:00:00Z
+
+    async def scenario():
+        session_factory = await _session_factory()
+        cfg = AppConfig(raw={"runtime": {"mode": "backtest"}})
+        first = CountingOracle(cfg, failing={"MSFT"})
+        crashed = await HistoricalHarvester(first, session_factory).harvest(["AAPL", "MSFT"], ["finnhub_quote"], run_id="r1")
+
+        second = CountingOracle(cfg)
+        resumed = await HistoricalHarvester(second, session_factory).harvest(["AAPL", "MSFT"], ["finnhub_quote"], run_id="r1")
+
+        third = CountingOracle(cfg)
+        fresh = await HistoricalHarvester(third, session_factory).harvest(
+            ["AAPL", "MSFT", "TSLA"], ["finnhub_quote"], run_id="r2", incremental=True
+        )
+
+        # Checkpoints are per requested range: the same run id over another range fetches again.
+        january = (datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 2, 1, tzinfo=timezone.utc))
+        february = (datetime(2025, 2, 1, tzinfo=timezone.utc), datetime(2025, 3, 1, tzinfo=timezone.utc))
+        ranged = []
+        for range_start, range_end in (january, january, february):
+            oracle = CountingOracle(cfg)
+            await HistoricalHarvester(oracle, session_factory).harvest(
+                ["AAPL"], ["finnhub_quote"], run_id="r3", range_start=range_start, range_end=range_end
+            )
+            ranged.append(oracle.calls)
+        return crashed, resumed, second.calls, fresh, third.calls, ranged
+
+    crashed, resumed, resumed_calls, fresh, fresh_calls, ranged = asyncio.run(scenario())
+    assert crashed.failed == 1 and crashed.persisted == 1
+    assert resumed_calls == ["MSFT"] and resumed.resumed == 1 and resumed.persisted == 1
+    assert sorted(fresh_calls) == ["AAPL", "MSFT", "TSLA"]
+    assert fresh.unchanged == 2 and fresh.persisted == 1
+    assert ranged == [["AAPL"], [], ["AAPL"]]
+
+
+def test_open_range_checkpoint_is_stored_once():
+    from trading.db.models import HarvestCheckpoint
+
+    async def scenario():
+        session_factory = await _session_factory()
+        harvester = HistoricalHarvester(None, session_factory)
+        for _ in range(2):
+            await harvester._checkpoint("r1", [("finnhub_quote", "AAPL", None)], None, None)
+        async with session_factory() as session:
+            count = await session.scalar(select(func.count()).select_from(HarvestCheckpoint))
+        return count, await harvester._checkpointed("r1", None, None)
+
+    count, done = asyncio.run(scenario())
+    assert count == 1
+    assert done == {("finnhub_quote", "AAPL")}
+
+
+def test_published_at_and_leakage_prescreen():
+    import json
+    from datetime import datetime, timezone
+
+    fallback = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    nested = json.dumps({"meta": {"datetime": "2020-01-01"}, "values": [{"timestamp": 5}], "timestamp": 1736150400})
+    assert HistoricalHarvester.parse_published_at(nested, fallback) == datetime(2025, 1, 6, 8, tzinfo=timezone.utc)
+    assert HistoricalHarvester.parse_published_at('{"datetime" : "2025-01-06T08:00:00Z"}', fallback).hour == 8
+    assert HistoricalHarvester.parse_published_at('{"filings": {"timestamp": 1}}', fallback) == fallback
+    assert HistoricalHarvester.parse_published_at('[{"timestamp": 1}]', fallback) == fallback
+    assert HistoricalHarvester.parse_published_at("ERROR: FINNHUB QUOTA_EXCEEDED", fallback) == fallback
+
+    assert HistoricalHarvester.is_forward_looking_summary('{"title": "Markets: Weekly RECAP"}')
+    assert not HistoricalHarvester.is_forward_looking_summary('{"title": "quarterly outlook"}')
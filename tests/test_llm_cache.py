@@ -0,0 +1,92 @@
+import asyncio
+import copy
+
+import pytest
+
+from trading.agents.director import StrategyDirector
+from trading.config import AppConfig
+from trading.infra.anthropic_client import AnthropicRouter, StrategyAsset
+from trading.infra.llm_cache import (
+    DirectorResponseCache,
+    DiskResponseStore,
+    ReplayMissError,
+    payload_hash,
+    response_cache_from_config,
+)
+
+
+def _payload(director: StrategyDirector, cash: int = 10) -> dict:
+    assets = [StrategyAsset(symbol=f"S{i}", status="watchlist", features={"x": i}) for i in range(30)]
+    return director.build_batched_prompt(system_rules="rules", global_portfolio_state={"cash": cash}, assets=assets)
+
+
+def test_payload_hash_covers_model_inputs_only():
+    director = StrategyDirector(router=AnthropicRouter(AppConfig(raw={})))
+    payload = _payload(director)
+    assert payload_hash(payload) == payload_hash(copy.deepcopy(payload))
+    assert payload_hash(payload) == payload_hash({**payload, "metadata": {"user_id": "backtest-7"}})
+    assert payload_hash(payload) != payload_hash(_payload(director, cash=11))
+    assert payload_hash(payload) != payload_hash({**payload, "model": "other-model"})
+    assert payload_hash(payload) != payload_hash({**payload, "tools": [{"name": "get_price"}]})
+
+
+def test_record_then_strict_replay_from_disk(tmp_path):
+    calls = []
+
+    async def model(payload: dict) -> dict:
+        calls.append(payload["model"])
+        return {"content": [{"type": "text", "text": "<execution_orders>[]</execution_orders>"}]}
+
+    store = DiskResponseStore(tmp_path)
+    recorder = StrategyDirector(
+        router=AnthropicRouter(AppConfig(raw={})), response_cache=DirectorResponseCache(store, mode="record")
+    )
+    payload = _payload(recorder)
+    first = asyncio.run(recorder.complete(payload, model))
+    again = asyncio.run(recorder.complete(payload, model))
+    assert first == again
+    assert len(calls) == 1
+    assert store.path_for(payload_hash(payload)).exists()
+
+    replayer = StrategyDirector(
+        router=AnthropicRouter(AppConfig(raw={})), response_cache=DirectorResponseCache(DiskResponseStore(tmp_path), mode="replay")
+    )
+    assert asyncio.run(replayer.complete(payload, model)) == first
+    with pytest.raises(ReplayMissError):
+        asyncio.run(replayer.complete(_payload(replayer, cash=99), model))
+    assert len(calls) == 1
+    assert replayer.response_cache.stats.hits == 1 and replayer.response_cache.stats.misses == 1
+
+
+def test_response_cache_from_config(tmp_path):
+    assert response_cache_from_config({}) is None
+    cache = response_cache_from_config({"response_cache": {"mode": "replay", "root": str(tmp_path)}})
+    assert cache.mode == "replay" and isinstance(cache.store, DiskResponseStore)
+    with pytest.raises(ValueError):
+        response_cache_from_config({"response_cache": {"mode": "record", "store": "db"}})
+    with pytest.raises(ValueError):
+        DirectorResponseCache(DiskResponseStore(tmp_path), mode="rewind")
+
+
+@pytest.mark.asyncio
+async def test_db_store_round_trip():
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from trading.db.models import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    cache = response_cache_from_config(
+        {"response_cache": {"mode": "record", "store": "db"}}, async_sessionmaker(engine, expire_on_commit=False)
+    )
+
+    async def model(payload: dict) -> str:
+        return "<execution_orders>[]</execution_orders>"
+
+    payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+    assert await cache.complete(payload, model) == "<execution_orders>[]</execution_orders>"
+    assert await cache.store.get(payload_hash(payload)) == "<execution_orders>[]</execution_orders>"
+    cache.mode = "replay"
+    assert await cache.complete(payload, model) == "<execution_orders>[]</execution_orders>"
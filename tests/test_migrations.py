@@ -0,0 +1,77 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _baseline_schema(conn: sa.Connection) -> None:
+    """historical_snapshot as ``Base.metadata.create_all`` built it before the first revision."""
+    metadata = sa.MetaData()
+    sa.Table(
+        "historical_snapshot",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("run_id", sa.String(64), index=True),
+        sa.Column("provider", sa.String(64), index=True),
+        sa.Column("provider_endpoint", sa.String(128), index=True),
+        sa.Column("symbol", sa.String(16), index=True, nullable=True),
+        sa.Column("request_params_json", sa.JSON),
+        sa.Column("response_json", sa.Text),
+        sa.Column("event_timestamp", sa.DateTime, index=True),
+        sa.Column("published_at", sa.DateTime, index=True),
+        sa.Column("ingested_at", sa.DateTime, index=True),
+        sa.Column("payload_hash", sa.String(128), index=True),
+        sa.Column("leakage_flag", sa.Boolean),
+    )
+    metadata.create_all(conn)
+    ts = datetime(2025, 1, 6)
+    row = {
+        "run_id": "r1",
+        "provider": "FINNHUB",
+        "provider_endpoint": "finnhub_quote",
+        "request_params_json": {},
+        "response_json": "{}",
+        "event_timestamp": ts,
+        "published_at": ts,
+        "ingested_at": ts,
+        "leakage_flag": False,
+    }
+    conn.execute(
+        metadata.tables["historical_snapshot"].insert(),
+        [
+            {**row, "symbol": "AAPL", "payload_hash": "h1"},
+            {**row, "symbol": "AAPL", "payload_hash": "h1"},
+            {**row, "symbol": None, "payload_hash": "h2"},
+            {**row, "symbol": None, "payload_hash": "h2"},
+            {**row, "symbol": "MSFT", "payload_hash": "h1"},
+        ],
+    )
+
+
+def test_upgrade_and_downgrade_on_sqlite(tmp_path, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from alembic import command
+    from alembic.config import Config
+
+    path = tmp_path / "baseline.db"
+    engine = sa.create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        _baseline_schema(conn)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{path}")
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+
+    command.upgrade(config, "head")
+    with engine.connect() as conn:
+        kept = conn.execute(sa.text("SELECT id FROM historical_snapshot ORDER BY id")).scalars().all()
+        ledger = conn.execute(sa.text("SELECT count(*) FROM historical_snapshot_key")).scalar_one()
+    assert kept == [1, 3, 5] and ledger == 3
+    uniques = {uc["name"] for uc in sa.inspect(engine).get_unique_constraints("historical_snapshot")}
+    assert "uq_historical_snapshot_payload" in uniques
+
+    command.downgrade(config, "base")
+    command.upgrade(config, "head")
+    engine.dispose()
@@ -1,6 +1,7 @@
 import pytest
 pytest.importorskip("aiosqlite")
 
+import json
 from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
@@ -41,3 +42,187 @@ async def test_oracle_client_backtest_returns_historical_payload():
     client = OracleClient(cfg, tp, session_factory)
     payload = await client.fetch(OracleQuery(provider_endpoint="finnhub_quote", symbol="AAPL", params={"symbol": "AAPL"}))
     assert payload == '{"c":123.4}'
+
+
+@pytest.mark.asyncio
+async def test_oracle_client_serves_backtest_from_preloaded_index():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        for hour, price in ((7, 1.0), (9, 2.0), (11, 3.0)):
+            published = datetime(2025, 1, 6, hour, 0, tzinfo=timezone.utc)
+            session.add(
+                HistoricalSnapshot(
+                    run_id="r1",
+                    provider="FINNHUB",
+                    provider_endpoint="finnhub_quote",
+                    symbol="AAPL",
+                    request_params_json={"symbol": "AAPL"},
+                    response_json=f'{{"c":{price}}}',
+                    event_timestamp=published,
+                    published_at=published,
+                    payload_hash=f"h{hour}",
+                    leakage_flag=False,
+                )
+            )
+        await session.commit()
+
+    clock = SimulatedClock(datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc))
+    tp = TimeProvider(mode="backtest", simulated_clock=clock)
+    cfg = AppConfig(
+        raw={
+            "runtime": {"mode": "backtest"},
+            "backtest": {
+                "clock_start": "2025-01-06T08:00:00Z",
+                "clock_end": "2025-01-06T16:00:00Z",
+                "preload_index": {"enabled": True},
+            },
+        }
+    )
+    client = OracleClient(cfg, tp, session_factory)
+    query = OracleQuery(provider_endpoint="finnhub_quote", symbol="AAPL", params={"symbol": "AAPL"})
+
+    assert await client.fetch(query) == '{"c":1.0}'
+    assert client.index is not None and len(client.index) == 3
+    clock.advance_seconds(3600 * 2)
+    assert await client.fetch(query) == '{"c":2.0}'
+    missing = await client.fetch(OracleQuery(provider_endpoint="finnhub_quote", symbol="MSFT", params={}))
+    assert '"DATA_MISSING_AT_TIME"' in missing
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_backtest_resolves_universe_in_input_order():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        for symbol, hour, body in (("AAPL", 7, "a7"), ("AAPL", 8, "a8"), ("AAPL", 10, "a10"), ("MSFT", 6, "m6")):
+            published = datetime(2025, 1, 6, hour, 0, tzinfo=timezone.utc)
+            session.add(
+                HistoricalSnapshot(
+                    run_id="r1",
+                    provider="FINNHUB",
+                    provider_endpoint="finnhub_quote",
+                    symbol=symbol,
+                    request_params_json={"symbol": symbol},
+                    response_json=body,
+                    event_timestamp=published,
+                    published_at=published,
+                    payload_hash=f"{symbol}{hour}",
+                    leakage_flag=False,
+                )
+            )
+        await session.commit()
+
+    tp = TimeProvider(mode="backtest", simulated_clock=SimulatedClock(datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc)))
+    client = OracleClient(AppConfig(raw={"runtime": {"mode": "backtest"}}), tp, session_factory)
+    queries = [
+        OracleQuery(provider_endpoint="finnhub_quote", symbol=symbol, params={"symbol": symbol})
+        for symbol in ("MSFT", "TSLA", "AAPL")
+    ]
+    queries.append(OracleQuery(provider_endpoint="finnhub_quote", symbol=None, params={}))
+
+    results = await client.fetch_many(queries)
+    assert results[0] == "m6"
+    assert '"DATA_MISSING_AT_TIME"' in results[1] and '"TSLA"' in results[1]
+    assert results[2] == "a8"
+    assert results[3] == "a8"
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_live_batches_get_price(monkeypatch):
+    from trading.data import mcp_server
+
+    calls = []
+
+    def fake_get_prices(symbols):
+        calls.append(symbols)
+        return json.dumps({s: {"provider": "YAHOO", "data": {"symbol": s, "regularMarketPrice": 1.0}} for s in symbols if s != "ZZZ"})
+
+    monkeypatch.setattr(mcp_server, "get_prices", fake_get_prices)
+    monkeypatch.setattr(mcp_server, "fred_series", lambda series_id: f"fred:{series_id}")
+    client = OracleClient(AppConfig(raw={"runtime": {"mode": "live"}}), TimeProvider(), None)
+    results = await client.fetch_many(
+        [
+            OracleQuery(provider_endpoint="get_price", symbol="msft", params={"symbol": "msft"}),
+            OracleQuery(provider_endpoint="fred_series", symbol=None, params={"series_id": "DGS10"}),
+            OracleQuery(provider_endpoint="get_price", symbol="AAPL", params={"symbol": "AAPL"}),
+            OracleQuery(provider_endpoint="get_price", symbol="ZZZ", params={"symbol": "ZZZ"}),
+        ]
+    )
+    assert calls == [["MSFT", "AAPL", "ZZZ"]]
+    assert json.loads(results[0]) == {"quoteResponse": {"result": [{"symbol": "MSFT", "regularMarketPrice": 1.0}], "error": None}}
+    assert results[1] == "fred:DGS10"
+    assert client.snapshots.ingest(results[2], "AAPL")[0].last == 1.0
+    assert json.loads(results[3])["error"] == "QUOTE_UNAVAILABLE"
+
+    # A batched element reads exactly like the single get_price payload for the symbol.
+    monkeypatch.setattr(mcp_server, "get_price", lambda symbol: results[0])
+    assert await client.fetch(OracleQuery(provider_endpoint="get_price", symbol="MSFT", params={"symbol": "MSFT"})) == results[0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_live_honours_params_and_deadline(monkeypatch):
+    import time
+
+    from trading.data import mcp_server
+
+    def slow_prices(symbols):
+        time.sleep(0.3)
+        return json.dumps({})
+
+    monkeypatch.setattr(mcp_server, "get_prices", slow_prices)
+    monkeypatch.setattr(mcp_server, "get_price", lambda symbol, venue="": f"price:{symbol}:{venue}")
+    client = OracleClient(AppConfig(raw={"runtime": {"mode": "live"}}), TimeProvider(), None)
+    results = await client.fetch_many(
+        [
+            OracleQuery(provider_endpoint="get_price", symbol="AAPL", params={"symbol": "AAPL"}),
+            OracleQuery(provider_endpoint="get_price", symbol="AAPL", params={"symbol": "AAPL", "venue": "XNAS"}),
+        ],
+        deadline=0.05,
+    )
+    assert json.loads(results[0]) == {"error": "DEADLINE_EXCEEDED", "provider_endpoint": "get_price", "symbol": "AAPL"}
+    assert results[1] == "price:AAPL:XNAS"
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_live_fetch_runs_concurrently_and_honours_deadline(monkeypatch):
+    import asyncio
+    import time
+
+    from trading.data import mcp_server
+
+    def slow_quote(symbol):
+        time.sleep(0.3)
+        return f"quote:{symbol}"
+
+    monkeypatch.setattr(mcp_server, "finnhub_quote", slow_quote)
+    cfg = AppConfig(raw={"runtime": {"mode": "live"}, "mcp": {"live_fetch": {"max_workers": 4}}})
+    client = OracleClient(cfg, TimeProvider(), None)
+    queries = [OracleQuery(provider_endpoint="finnhub_quote", symbol=s, params={"symbol": s}) for s in ("A", "B", "C")]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.fetch(q) for q in queries))
+    assert results == ["quote:A", "quote:B", "quote:C"]
+    assert time.perf_counter() - started < 0.6
+
+    late = await client.fetch(OracleQuery(provider_endpoint="finnhub_quote", symbol="D", params={"symbol": "D"}), deadline=0.05)
+    assert json.loads(late)["error"] == "DEADLINE_EXCEEDED"
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_preconnects_only_when_configured(monkeypatch):
+    from trading.data import mcp_server
+
+    calls = []
+    monkeypatch.setattr(mcp_server, "warm_up", lambda preconnect=False: calls.append(preconnect))
+    await OracleClient(AppConfig(raw={"runtime": {"mode": "live"}}), TimeProvider(), None).warm_up()
+    await OracleClient(AppConfig(raw={"mcp": {"warm_up_preconnect": True}}), TimeProvider(), None).warm_up()
+    assert calls == [False, True]
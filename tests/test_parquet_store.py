@@ -0,0 +1,106 @@
+import pytest
+pytest.importorskip("aiosqlite")
+pytest.importorskip("pyarrow")
+
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from trading.config import AppConfig
+from trading.data.oracle_client import OracleClient, OracleQuery
+from trading.data.parquet_store import ParquetSnapshotStore, export_snapshots
+from trading.db.blob_store import BlobStore
+from trading.db.models import Base, HistoricalSnapshot
+from trading.utils.time_provider import SimulatedClock, TimeProvider
+
+
+async def _seed(blob_store: BlobStore) -> async_sessionmaker:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    big = blob_store.put('{"c":300.0}')
+    rows = [
+        ("r1", "finnhub_quote", "AAPL", 7, '{"c":1.0}', None),
+        ("r1", "finnhub_quote", "AAPL", 9, '{"c":2.0}', None),
+        ("r1", "finnhub_quote", "MSFT", 8, "", big.content_hash),
+        ("r1", "fred_series", None, 6, '{"v":4.5}', None),
+        ("r2", "finnhub_quote", "TSLA", 8, '{"c":9.0}', None),
+    ]
+    async with session_factory() as session:
+        for i, (run_id, endpoint, symbol, hour, payload, blob_ref) in enumerate(rows):
+            published = datetime(2025, 1, 6, hour, 0, tzinfo=timezone.utc)
+            session.add(
+                HistoricalSnapshot(
+                    run_id=run_id,
+                    provider="FINNHUB",
+                    provider_endpoint=endpoint,
+                    symbol=symbol,
+                    request_params_json={"symbol": symbol},
+                    response_json=payload,
+                    blob_ref=blob_ref,
+                    event_timestamp=published,
+                    published_at=published,
+                    payload_hash=f"h{i}",
+                    leakage_flag=False,
+                )
+            )
+        await session.commit()
+    return session_factory
+
+
+def _client(root, hour: int, max_bytes: int = 1 << 20) -> OracleClient:
+    tp = TimeProvider(mode="backtest", simulated_clock=SimulatedClock(datetime(2025, 1, 6, hour, 0, tzinfo=timezone.utc)))
+    cfg = AppConfig(
+        raw={
+            "runtime": {"mode": "backtest"},
+            "backtest": {
+                "clock_start": "2025-01-06T08:00:00Z",
+                "clock_end": "2025-01-06T16:00:00Z",
+                "snapshot_source": "parquet",
+                "snapshot_parquet": {"root": str(root)},
+                "preload_index": {"max_bytes": max_bytes},
+            },
+        }
+    )
+    return OracleClient(cfg, tp, None)
+
+
+@pytest.mark.asyncio
+async def test_export_writes_one_file_per_endpoint_and_inlines_blobs(tmp_path):
+    blob_store = BlobStore(tmp_path / "blobs", codec="gzip")
+    session_factory = await _seed(blob_store)
+    store = ParquetSnapshotStore(tmp_path / "snapshots")
+    (tmp_path / "snapshots").mkdir()
+    (tmp_path / "snapshots" / "stale_endpoint.parquet").write_bytes(b"")
+
+    counts = await export_snapshots(session_factory, store, run_id="r1", blob_store=blob_store)
+
+    assert counts == {"finnhub_quote": 3, "fred_series": 1}
+    assert store.endpoints() == ["finnhub_quote", "fred_series"]
+    assert store.manifest()["run_id"] == "r1"
+    assert not (tmp_path / "snapshots" / "stale_endpoint.parquet").exists()
+    assert store.lookup("finnhub_quote", "MSFT", datetime(2025, 1, 6, 12, tzinfo=timezone.utc)) == '{"c":300.0}'
+    assert store.lookup("finnhub_quote", "TSLA", datetime(2025, 1, 6, 12, tzinfo=timezone.utc)) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_bytes", [1 << 20, 12])
+async def test_oracle_client_serves_backtest_from_parquet_without_database(tmp_path, max_bytes):
+    blob_store = BlobStore(tmp_path / "blobs", codec="gzip")
+    await export_snapshots(await _seed(blob_store), ParquetSnapshotStore(tmp_path), blob_store=blob_store)
+
+    client = _client(tmp_path, hour=8, max_bytes=max_bytes)
+    aapl = OracleQuery(provider_endpoint="finnhub_quote", symbol="AAPL", params={})
+    msft = OracleQuery(provider_endpoint="finnhub_quote", symbol="MSFT", params={})
+    fred = OracleQuery(provider_endpoint="fred_series", symbol=None, params={})
+    nvda = OracleQuery(provider_endpoint="finnhub_quote", symbol="NVDA", params={})
+
+    assert await client.fetch(aapl) == '{"c":1.0}'
+    assert await client.fetch_many([aapl, msft, fred]) == ['{"c":1.0}', '{"c":300.0}', '{"v":4.5}']
+    assert json.loads(await client.fetch(nvda))["error"] == "DATA_MISSING_AT_TIME"
+    assert client.index is not None and client.index.truncated is (max_bytes == 12)
+
+    later = _client(tmp_path, hour=10, max_bytes=max_bytes)
+    assert await later.fetch_many([aapl]) == ['{"c":2.0}']
@@ -0,0 +1,94 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from trading.db.blob_store import BlobPointer
+from trading.db.partitions import MonthPartition, SnapshotArchive, month_floor, months_between, next_month
+
+
+def test_month_partition_naming_and_bounds():
+    partition = MonthPartition(date(2025, 12, 1))
+    assert partition.name == "historical_snapshot_y2025m12"
+    assert partition.label == "2025-12"
+    assert partition.end == date(2026, 1, 1)
+    assert partition.create_sql() == (
+        "CREATE TABLE IF NOT EXISTS historical_snapshot_y2025m12 PARTITION OF historical_snapshot "
+        "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+    )
+    assert MonthPartition.from_name(partition.name) == partition
+    assert MonthPartition.from_name("historical_snapshot_default") is None
+
+
+def test_months_between_spans_year_boundary():
+    months = months_between(datetime(2024, 11, 20, 13, 0), datetime(2025, 2, 3))
+    assert [m.label for m in months] == ["2024-11", "2024-12", "2025-01", "2025-02"]
+    assert month_floor(datetime(2025, 1, 31, 23, 59)) == date(2025, 1, 1)
+    assert next_month(date(2025, 1, 1)) == date(2025, 2, 1)
+
+
+def test_archive_without_files_has_no_months(tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    assert archive.months() == []
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 6, tzinfo=timezone.utc)) is None
+
+
+def _row(row_id, symbol, published_at, payload, blob_ref=None):
+    return {
+        "id": row_id,
+        "run_id": "r1",
+        "provider": "FINNHUB",
+        "provider_endpoint": "finnhub_quote",
+        "symbol": symbol,
+        "request_params_json": {"symbol": symbol},
+        "response_json": payload,
+        "blob_ref": blob_ref,
+        "event_timestamp": published_at,
+        "published_at": published_at,
+        "ingested_at": published_at,
+        "payload_hash": f"h{row_id}",
+        "leakage_flag": False,
+    }
+
+
+def test_archive_round_trip_serves_latest_row_at_or_before(tmp_path):
+    pytest.importorskip("pyarrow")
+    archive = SnapshotArchive(tmp_path)
+    december, january = MonthPartition(date(2024, 12, 1)), MonthPartition(date(2025, 1, 1))
+    assert archive.write(december, [_row(1, "AAPL", datetime(2024, 12, 30), '{"c":1}')]) == 1
+    archive.write(
+        january,
+        [
+            _row(2, "AAPL", datetime(2025, 1, 2), '{"c":2}'),
+            _row(3, "MSFT", datetime(2025, 1, 3), '{"c":9}'),
+            _row(4, "AAPL", datetime(2025, 1, 10), "", blob_ref="abc"),
+        ],
+    )
+
+    assert archive.months() == [december, january]
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 1, tzinfo=timezone.utc)) == '{"c":1}'
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 5, tzinfo=timezone.utc)) == '{"c":2}'
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 11)) == BlobPointer("abc")
+    assert archive.lookup("finnhub_quote", None, datetime(2025, 1, 4)) == '{"c":9}'
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2024, 12, 1)) is None
+
+    import pyarrow.parquet as pq
+
+    stored = pq.read_table(archive.paths_for(january)[0]).to_pylist()
+    assert json.loads(stored[0]["request_params_json"]) == {"symbol": "AAPL"}
+
+
+def test_archiving_a_month_again_adds_a_file_instead_of_overwriting(tmp_path):
+    pytest.importorskip("pyarrow")
+    archive = SnapshotArchive(tmp_path)
+    january = MonthPartition(date(2025, 1, 1))
+    archive.write(january, [_row(1, "AAPL", datetime(2025, 1, 2), '{"c":1}'), _row(2, "AAPL", datetime(2025, 1, 20), '{"c":2}')])
+    # A backfill recreated the partition and a later db-archive run exported it again.
+    archive.write(january, [_row(3, "AAPL", datetime(2025, 1, 10), '{"c":3}')])
+
+    assert [path.name for path in archive.paths_for(january)] == ["2025-01.parquet", "2025-01-1.parquet"]
+    assert archive.months() == [january]
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 5)) == '{"c":1}'
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 15)) == '{"c":3}'
+    assert archive.lookup("finnhub_quote", "AAPL", datetime(2025, 1, 25)) == '{"c":2}'
+    assert archive.next_path(january).name == "2025-01-2.parquet"
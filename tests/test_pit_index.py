@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from trading.data.pit_index import SnapshotIndex
+
+
+def _t(hour: int, day: int = 6) -> datetime:
+    return datetime(2025, 1, day, hour, 0, tzinfo=timezone.utc)
+
+
+def test_lookup_bisects_and_prunes_rows_before_start():
+    index = SnapshotIndex(start=_t(8), end=_t(16))
+    index.add("finnhub_quote", "AAPL", _t(1), "a1")
+    index.add("finnhub_quote", "AAPL", _t(2), "a2")
+    index.add("finnhub_quote", "AAPL", _t(9), "a9")
+    index.add("finnhub_quote", "AAPL", _t(12), "a12")
+    index.add("finnhub_quote", "MSFT", _t(10), "m10")
+    index.add("finnhub_quote", "MSFT", _t(17), "m17")
+    index.finish()
+
+    assert len(index) == 4  # a1 pruned, m17 past the end
+    assert index.lookup("finnhub_quote", "AAPL", _t(8)) == "a2"
+    assert index.lookup("finnhub_quote", "AAPL", _t(11)) == "a9"
+    assert index.lookup("finnhub_quote", "MSFT", _t(9)) is None
+    assert index.lookup("finnhub_quote", None, _t(11)) == "m10"
+    assert index.lookup("finnhub_quote", None, _t(13)) == "a12"
+    assert index.covers("finnhub_quote", "TSLA", _t(9))
+    assert index.lookup("finnhub_quote", "TSLA", _t(9)) is None
+    assert not index.covers("finnhub_quote", "AAPL", _t(17))
+    # a1 was pruned, so a query before the window start must go to SQL rather than miss.
+    assert not index.covers("finnhub_quote", "AAPL", _t(1))
+    assert index.covers("finnhub_quote", "AAPL", _t(8))
+
+
+def test_memory_cap_marks_remaining_keys_uncovered():
+    index = SnapshotIndex(start=_t(8), end=_t(16), max_bytes=4)
+    index.add("fred_series", "DGS10", _t(9), "1234")
+    index.add("gdelt_search", "AAPL", _t(9), "56789")
+    index.add("gdelt_search", "MSFT", _t(9), "0")
+    index.finish()
+
+    assert index.truncated
+    assert index.covers("fred_series", "DGS10", _t(10))
+    assert index.covers("fred_series", None, _t(10))
+    assert not index.covers("gdelt_search", "AAPL", _t(10))
+    assert not index.covers("gdelt_search", "MSFT", _t(10))
+    assert not index.covers("gdelt_search", None, _t(10))
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import pytest
+
+from trading.data.quota import FileQuotaState, QuotaManager, flush_quota_usage
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 1_700_000_040.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_per_minute_window_blocks_then_slides_open():
+    clock = _Clock()
+    quota = QuotaManager(limits={"TWELVE_DATA": 800}, per_minute={"TWELVE_DATA": 2}, clock=clock)
+    assert quota.check_and_consume("TWELVE_DATA")
+    assert quota.check_and_consume("TWELVE_DATA")
+    assert not quota.check_and_consume("TWELVE_DATA")
+    clock.t += 120
+    assert quota.check_and_consume("TWELVE_DATA")
+    assert quota.usage["TWELVE_DATA"] == 3
+    assert quota.remaining("TWELVE_DATA") == 1
+    assert quota.remaining("UNLIMITED") is None
+
+
+def test_consume_is_atomic_across_threads():
+    quota = QuotaManager(limits={"FMP": 250})
+    granted = []
+
+    def worker():
+        granted.extend(ok for ok in (quota.check_and_consume("FMP") for _ in range(100)) if ok)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(granted) == 250
+
+
+def test_file_state_shares_budget_between_managers(tmp_path):
+    path = tmp_path / "quota.bin"
+    main = QuotaManager(limits={"FMP": 3}, state=FileQuotaState(path))
+    server = QuotaManager(limits={"FMP": 3}, state=FileQuotaState(path))
+    assert main.check_and_consume("FMP", n=2)
+    assert server.check_and_consume("FMP")
+    assert not main.check_and_consume("FMP")
+    assert server.usage["FMP"] == 3
+
+
+def test_flush_writes_quota_usage_rows():
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from trading.db.models import Base, QuotaUsage
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        quota = QuotaManager(limits={"FMP": 250}, per_minute={"FMP": 10})
+        for _ in range(4):
+            quota.check_and_consume("FMP")
+        written = await flush_quota_usage(quota, session_factory)
+        async with session_factory() as session:
+            rows = (await session.execute(select(QuotaUsage))).scalars().all()
+        return written, {(r.window_type, r.used_count, r.remaining_count) for r in rows}, quota.pending_count()
+
+    written, rows, pending = asyncio.run(scenario())
+    assert written == 2
+    assert rows == {("minute", 4.0, 6.0), ("day", 4.0, 246.0)}
+    assert pending == 0
@@ -0,0 +1,75 @@
+from trading.data.cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_cached_tool_respects_ttl_and_skips_errors():
+    clock = _Clock()
+    cache = ResponseCache({"fred_series": 60}, clock=clock)
+    calls = []
+
+    @cache.cached("fred_series")
+    def fred_series(series_id: str = "GNP") -> str:
+        calls.append(series_id)
+        return "ERROR: FRED QUOTA_EXCEEDED" if series_id == "BAD" else f"v:{series_id}"
+
+    assert fred_series() == fred_series(series_id="GNP") == "v:GNP"
+    fred_series("BAD")
+    fred_series("BAD")
+    clock.t += 61
+    fred_series()
+    assert calls == ["GNP", "BAD", "BAD", "GNP"]
+    assert cache.stats.hits == 1
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache({}, max_entries=2, max_bytes=10)
+    cache.put("a", "xxxx", ttl=60)
+    cache.put("b", "yyyy", ttl=60)
+    assert cache.get("a") == "xxxx"
+    cache.put("c", "zzzz", ttl=60)
+    assert cache.get("b") is None
+    cache.put("d", "wwwwwww", ttl=60)
+    assert len(cache) == 1 and cache.size_bytes == 7
+    assert cache.stats.evictions == 3
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    ResponseCache({}, disk_path=tmp_path).put("k", "payload", ttl=60)
+    reloaded = ResponseCache({}, disk_path=tmp_path)
+    assert reloaded.get("k") == "payload"
+    assert reloaded.stats.disk_hits == 1
+
+
+def test_disk_tier_is_capped_and_skips_short_ttls(tmp_path):
+    clock = _Clock()
+    cache = ResponseCache({}, max_entries=2, disk_path=tmp_path, clock=clock)
+    cache.put("quote", "q", ttl=5)
+    assert list(tmp_path.iterdir()) == []
+
+    for key in ("a", "b", "c"):
+        cache.put(key, key, ttl=300)
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert cache.stats.disk_evictions == 1
+    cache.put("d", "d", ttl=120)
+
+    # Expired files are dropped when a new instance loads the directory.
+    clock.t += 200
+    reloaded = ResponseCache({}, disk_path=tmp_path, clock=clock)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert reloaded.get("c") == "c" and reloaded.get("d") is None
+
+
+def test_payloads_with_per_symbol_errors_are_not_cached():
+    cache = ResponseCache({})
+    cache.put("batch", '{"AAPL": {"provider": "YAHOO", "data": {}}, "ZZZ": {"error": "QUOTE_UNAVAILABLE"}}', ttl=60)
+    cache.put("envelope", '{"error": "DEADLINE_EXCEEDED", "symbol": "AAPL"}', ttl=60)
+    cache.put("quote", '{"quoteResponse": {"result": [], "error": null}}', ttl=60)
+    assert cache.get("batch") is None and cache.get("envelope") is None
+    assert cache.get("quote") is not None
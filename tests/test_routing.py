@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from trading.data.routing import ProviderRouter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_breaker_opens_on_failures_and_reorders_by_health():
+    clock = _Clock()
+    router = ProviderRouter(failure_threshold=1, cooldown_seconds=30, clock=clock)
+    calls = []
+
+    def call(provider):
+        calls.append(provider)
+        if provider == "YAHOO":
+            raise ConnectionError("down")
+        return f"{provider}:ok"
+
+    assert router.route(["YAHOO", "STOOQ"], call) == "STOOQ:ok"
+    assert router.route(["YAHOO", "STOOQ"], call) == "STOOQ:ok"
+    assert router.route(["YAHOO", "STOOQ"], call) == "STOOQ:ok"
+    assert calls == ["YAHOO", "STOOQ", "STOOQ", "STOOQ"]
+    assert router.snapshot()["providers"]["YAHOO"]["breaker"] == "open"
+    assert router.decisions["breaker_open:YAHOO"] == 1
+
+    assert router.order(["YAHOO", "STOOQ"]) == ["STOOQ"]
+    clock.t += 31
+    assert "YAHOO" in router.order(["YAHOO", "STOOQ"])
+    assert router.snapshot()["providers"]["YAHOO"]["breaker"] == "half_open"
+
+
+def test_half_open_breaker_admits_a_single_probe():
+    clock = _Clock()
+    router = ProviderRouter(failure_threshold=1, cooldown_seconds=30, clock=clock)
+    router.record("YAHOO", 0.1, ok=False)
+    clock.t += 31
+
+    # Ranking claims nothing: the provider stays listed until a call is actually made.
+    assert router.order(["YAHOO", "STOOQ"]) == router.order(["YAHOO", "STOOQ"]) == ["YAHOO", "STOOQ"]
+
+    nested = []
+
+    def call(provider):
+        if provider == "YAHOO":
+            # The probe is still in flight: a request behind it is kept off the provider.
+            nested.append(router.route(["YAHOO", "STOOQ"], lambda p: f"{p}:ok"))
+            raise ConnectionError("still down")
+        return f"{provider}:ok"
+
+    assert router.route(["YAHOO", "STOOQ"], call) == "STOOQ:ok"
+    assert nested == ["STOOQ:ok"]
+    assert router.decisions["skipped_probe:YAHOO"] == 1
+    assert router.snapshot()["providers"]["YAHOO"]["breaker"] == "open"
+    assert router.order(["YAHOO", "STOOQ"]) == ["STOOQ"]
+
+    # A probe skipped for quota hands its slot back instead of blocking the provider.
+    clock.t += 31
+    assert router.route(["YAHOO"], lambda p: None) is None
+    assert router.route(["YAHOO"], lambda p: f"{p}:ok") == "YAHOO:ok"
+    assert router.snapshot()["providers"]["YAHOO"]["breaker"] == "closed"
+    assert router.decisions["skipped_probe:YAHOO"] == 1
+
+    # A probe that never reports back frees its slot after another cooldown.
+    router.record("YAHOO", 0.1, ok=False)
+    clock.t += 31
+    breaker = router._breaker_for("YAHOO")
+    assert breaker.allow(clock()) and not breaker.allow(clock())
+    clock.t += 31
+    assert breaker.allow(clock())
+
+
+def test_all_failures_reraise_and_all_skipped_returns_none():
+    router = ProviderRouter()
+    with pytest.raises(ConnectionError):
+        router.route(["A", "B"], lambda p: (_ for _ in ()).throw(ConnectionError(p)))
+    assert router.route(["A", "B"], lambda p: None) is None
+
+
+def test_hedged_request_wins_when_primary_exceeds_p95():
+    router = ProviderRouter(hedge_enabled=True, hedge_min_samples=5, hedge_min_delay_seconds=0.02)
+    for _ in range(5):
+        router.record("YAHOO", 0.01, ok=True)
+        router.record("STOOQ", 0.05, ok=True)
+
+    def call(provider):
+        if provider == "YAHOO":
+            time.sleep(0.5)
+        return provider
+
+    started = time.monotonic()
+    assert router.route(["YAHOO", "STOOQ"], call) == "STOOQ"
+    assert time.monotonic() - started < 0.4
+    assert router.decisions["hedge_fired"] == 1
+    assert router.decisions["hedge_won"] == 1
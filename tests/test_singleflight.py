@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+from trading.config import AppConfig
+from trading.data import mcp_server
+from trading.data.oracle_client import OracleClient, OracleQuery
+from trading.utils.time_provider import TimeProvider
+
+
+def test_concurrent_identical_live_fetches_share_one_call(monkeypatch):
+    calls = []
+
+    def slow_quote(symbol: str) -> str:
+        calls.append(symbol)
+        time.sleep(0.05)
+        return f'{{"symbol":"{symbol}"}}'
+
+    monkeypatch.setattr(mcp_server, "finnhub_quote", slow_quote)
+    client = OracleClient(AppConfig(raw={"runtime": {"mode": "live"}}), TimeProvider(mode="live"), session_factory=None)
+    query = OracleQuery(provider_endpoint="finnhub_quote", symbol="AAPL", params={"symbol": "AAPL"})
+
+    async def fan_out():
+        return await asyncio.gather(
+            *(client.fetch(query) for _ in range(5)),
+            client.fetch(OracleQuery(provider_endpoint="finnhub_quote", symbol="MSFT", params={"symbol": "MSFT"})),
+        )
+
+    out = asyncio.run(fan_out())
+    assert out[:5] == ['{"symbol":"AAPL"}'] * 5
+    assert sorted(calls) == ["AAPL", "MSFT"]
+    assert client.flights.stats.saved == 4
+    assert client.flights.in_flight() == 0
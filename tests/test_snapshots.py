@@ -0,0 +1,49 @@
+import asyncio
+import json
+import math
+
+from trading.config import AppConfig
+from trading.data import mcp_server
+from trading.data.oracle_client import OracleClient, OracleQuery
+from trading.data.snapshots import SnapshotCycle, parse_quotes
+from trading.utils.time_provider import TimeProvider
+
+
+def test_parse_provider_formats_into_records():
+    yahoo = json.dumps({"quoteResponse": {"result": [{"symbol": "AAPL", "bid": 99.0, "ask": 101.0, "regularMarketPrice": 100.5, "regularMarketTime": 1736157600}]}})
+    (rec,) = parse_quotes(yahoo)
+    assert (rec.symbol, rec.mid, rec.spread, rec.last, rec.timestamp) == ("AAPL", 100.0, 2.0, 100.5, 1736157600.0)
+
+    (fin,) = parse_quotes('{"c": 50.0, "t": 1736157600}', symbol="msft")
+    assert fin.symbol == "MSFT" and fin.mid == 50.0 and math.isnan(fin.spread)
+
+    batch = json.dumps({"NVDA": {"provider": "STOOQ", "data": {"symbol": "NVDA.US", "close": 12.5, "date": "2025-01-06", "time": "16:00:00"}}, "XYZ": {"error": "QUOTE_UNAVAILABLE"}})
+    (stooq,) = parse_quotes(batch)
+    assert (stooq.symbol, stooq.provider, stooq.last) == ("NVDA", "STOOQ", 12.5)
+    assert parse_quotes("ERROR: FMP QUOTA_EXCEEDED") == []
+
+
+def test_cycle_maps_to_market_snapshot():
+    cycle = SnapshotCycle()
+    cycle.ingest('[{"symbol": "KO", "price": 61.2, "timestamp": 1736157600}]')
+    snapshot = cycle.to_market_snapshots()[0]
+    assert snapshot.symbol == "KO" and snapshot.last == 61.2 and snapshot.mid == 61.2
+
+
+def test_fetch_quote_parses_once_per_cycle(monkeypatch):
+    calls = []
+
+    def quote(symbol: str) -> str:
+        calls.append(symbol)
+        return json.dumps({"c": 10.0 + len(calls), "t": 1736157600})
+
+    monkeypatch.setattr(mcp_server, "finnhub_quote", quote)
+    client = OracleClient(AppConfig(raw={"runtime": {"mode": "live"}}), TimeProvider(mode="live"), session_factory=None)
+    query = OracleQuery(provider_endpoint="finnhub_quote", symbol="AAPL", params={"symbol": "AAPL"})
+
+    first = asyncio.run(client.fetch_quote(query))
+    again = asyncio.run(client.fetch_quote(query))
+    client.begin_cycle()
+    fresh = asyncio.run(client.fetch_quote(query))
+    assert first is again and first.last == 11.0
+    assert fresh.last == 12.0 and len(calls) == 2
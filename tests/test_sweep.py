@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+
+from trading.backtest.runner import BacktestRunner
+from trading.backtest.sweep import (
+    SweepResult,
+    TrialHarness,
+    apply_overrides,
+    format_table,
+    grid,
+    parse_param,
+    random_search,
+    rank,
+    run_sweep,
+)
+from trading.config import AppConfig
+from trading.core.trade_gate import TradeGate
+
+
+def gate_harness(config: AppConfig, run_id: str, runner: BacktestRunner) -> TrialHarness:
+    """Counts windows where a fixed 0.6-probability, 1%-edge trade would clear the risk gate."""
+    gate = TradeGate(config=config)
+    state = {"windows": 0, "passed": 0, "on_clock": 0}
+
+    async def hook(name: str, ts: datetime) -> None:
+        state["windows"] += 1
+        state["passed"] += gate.passes_thresholds(edge_after_cost_pct=1.0, win_prob=0.6)
+        # The harness reads the replay's own clock, not one it built itself.
+        state["on_clock"] += runner.time_provider.now() == ts
+
+    return TrialHarness(run_hook=hook, metrics=lambda: dict(state))
+
+
+def failing_harness(config: AppConfig, run_id: str, runner: BacktestRunner) -> TrialHarness:
+    raise RuntimeError(f"boom in {run_id}")
+
+
+def test_grid_random_search_and_overrides():
+    space = {"risk.min_win_prob": [0.5, 0.55], "backtest.daily_notional_max": [8000, 10000, 12000]}
+    trials = grid(space)
+    assert len(trials) == 6
+    assert trials[0] == {"risk.min_win_prob": 0.5, "backtest.daily_notional_max": 8000}
+
+    draws = random_search({"risk.min_win_prob": (0.5, 0.6), "risk.min_edge_after_cost_pct": [0.5, 1.0]}, 20, seed=7)
+    assert draws == random_search({"risk.min_win_prob": (0.5, 0.6), "risk.min_edge_after_cost_pct": [0.5, 1.0]}, 20, seed=7)
+    assert all(0.5 <= d["risk.min_win_prob"] <= 0.6 and d["risk.min_edge_after_cost_pct"] in (0.5, 1.0) for d in draws)
+
+    base = {"risk": {"min_win_prob": 0.52, "min_edge_after_cost_pct": 0.75}}
+    merged = apply_overrides(base, {"risk.min_win_prob": 0.58, "backtest.fast_forward": True})
+    assert merged == {"risk": {"min_win_prob": 0.58, "min_edge_after_cost_pct": 0.75}, "backtest": {"fast_forward": True}}
+    assert base["risk"]["min_win_prob"] == 0.52
+
+
+def test_parse_param_values_and_ranges():
+    assert parse_param("risk.min_win_prob=0.5,0.55") == ("risk.min_win_prob", [0.5, 0.55])
+    assert parse_param("risk.min_win_prob=0.5:0.6") == ("risk.min_win_prob", (0.5, 0.6))
+    assert parse_param("backtest.snapshot_source=parquet") == ("backtest.snapshot_source", ["parquet"])
+    with pytest.raises(ValueError):
+        parse_param("risk.min_win_prob")
+
+
+def test_rank_puts_failures_last_and_formats_table():
+    results = [
+        SweepResult(0, "s-0000", {"risk.min_win_prob": 0.5}, {"pnl": 1.5}),
+        SweepResult(1, "s-0001", {"risk.min_win_prob": 0.55}, error="Traceback"),
+        SweepResult(2, "s-0002", {"risk.min_win_prob": 0.6}, {"pnl": 4.0}),
+    ]
+    ranked = rank(results, "pnl")
+    assert [r.run_id for r in ranked] == ["s-0002", "s-0000", "s-0001"]
+    lines = format_table(ranked, "pnl").splitlines()
+    assert lines[0].split() == ["rank", "run_id", "risk.min_win_prob", "pnl", "seconds"]
+    assert lines[1].split()[:4] == ["1", "s-0002", "0.6", "4"]
+    assert lines[3].split()[3] == "error"
+
+
+def test_run_sweep_fans_out_to_worker_processes():
+    base = AppConfig(
+        raw={
+            "runtime": {"mode": "backtest"},
+            "backtest": {
+                "clock_start": "2025-01-06T08:00:00Z",
+                "clock_end": "2025-01-07T16:30:00Z",
+                "simulated_wait_seconds": 60,
+                "fast_forward": True,
+            },
+        }
+    )
+    trials = grid({"risk.min_win_prob": [0.5, 0.7]}) + [{"risk.min_win_prob": 0.5}]
+    results = run_sweep(base, f"{__name__}:gate_harness", trials, sweep_id="t", workers=2)
+
+    assert [r.run_id for r in results] == ["t-0000", "t-0001", "t-0002"]
+    assert [r.metrics for r in results] == [
+        {"passed": 8.0, "windows": 8.0, "on_clock": 8.0},
+        {"passed": 0.0, "windows": 8.0, "on_clock": 8.0},
+        {"passed": 8.0, "windows": 8.0, "on_clock": 8.0},
+    ]
+
+    failed = run_sweep(base, f"{__name__}:failing_harness", [{}], sweep_id="f", workers=1)
+    assert "boom in f-0000" in failed[0].error
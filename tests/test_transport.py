@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import time
+
+from trading.data import mcp_server
+from trading.data.transport import HttpTransport, ProviderLimits, transport_from_config
+
+
+class _FakeResponse:
+    content = b'{"ok":true}'
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+def test_transport_limits_loaded_per_provider():
+    t = transport_from_config(
+        {"transport": {"timeouts": {"default": 10, "fmp": 3}, "max_concurrency": {"fmp": 2}}},
+        {"FMP": "fmp", "FRED": "fred"},
+    )
+    assert t.limits_for("FMP") == ProviderLimits(timeout_seconds=3.0, max_concurrency=2)
+    assert t.limits_for("FRED").timeout_seconds == 10.0
+
+
+def test_transport_caps_in_flight_requests_per_provider(monkeypatch):
+    t = HttpTransport(limits={"FMP": ProviderLimits(timeout_seconds=1, max_concurrency=2)})
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_get(url, params, timeout):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return _FakeResponse()
+
+    monkeypatch.setattr(t._session, "get", fake_get)
+
+    async def fan_out():
+        return await asyncio.gather(*(t.aget("FMP", "https://x", {}) for _ in range(6)))
+
+    assert asyncio.run(fan_out()) == ['{"ok":true}'] * 6
+    assert peak == 2
+
+
+def test_async_tool_variant_wraps_sync_tool(monkeypatch):
+    monkeypatch.setattr(mcp_server, "_get", lambda provider, url, params: f"{provider}:{params['series_id']}")
+    assert asyncio.run(mcp_server.fred_series_async("GDP")) == "FRED:GDP"